@@ -0,0 +1,263 @@
+"""
+Time spent scoring all the CVs of a job description.
+
+Compares the `/scores/process/{job_description_id}` flow, which loads the
+matches in one query, scores them with `rank_candidates` and saves the
+scores in one INSERT, with scoring the CVs one at a time as the
+`/scores/process/{pdf_id}/{job_description_id}` endpoint does. The
+evaluations are synthetic, with the same skills for every CV as when they
+are evaluated against the same job description.
+
+It runs against a scratch database ("<db_base>_benchmark") created and
+dropped on the Postgres server configured in the settings:
+
+    python benchmarks/batch_scoring.py
+"""
+import asyncio
+import random
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from cv_copilot.settings import settings
+
+settings.db_base = f"{settings.db_base}_benchmark"
+
+from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO  # noqa: E402
+from cv_copilot.db.dao.scores import ScoreDAO  # noqa: E402
+from cv_copilot.db.dao.texts import ParsedTextDAO  # noqa: E402
+from cv_copilot.db.meta import meta  # noqa: E402
+from cv_copilot.db.models import load_all_models  # noqa: E402
+from cv_copilot.db.models.job_descriptions import (  # noqa: E402
+    JobDescriptionModel,
+    ParsedJobDescriptionModel,
+)
+from cv_copilot.db.models.pdfs import PDFModel  # noqa: E402
+from cv_copilot.db.models.texts import ParsedTextModel, TextModel  # noqa: E402
+from cv_copilot.db.utils import create_database, drop_database  # noqa: E402
+from cv_copilot.services.scorer.batch import (  # noqa: E402
+    SKILL_GROUPS,
+    rank_candidates,
+    score_batch,
+)
+from cv_copilot.services.scorer.score_calculation import score_calculation  # noqa: E402
+
+CANDIDATE_COUNTS = (10, 100, 1000, 10000)
+SKILLS_PER_GROUP = 8
+ROUNDS = 3
+
+
+def make_evaluation(rng: random.Random) -> Dict[str, Any]:
+    """Create the evaluation of a CV against the benchmark job description.
+
+    :param rng: the random generator.
+    :return: the parsed skills of the CV.
+    """
+    parsed_skills: Dict[str, Any] = {}
+    for importance, skill_type in SKILL_GROUPS:
+        parsed_skills.setdefault(importance, {})[skill_type] = {
+            f"skill {skill}": {"match": rng.choice(["YES", "PARTIAL", "NO"])}
+            for skill in range(SKILLS_PER_GROUP)
+        }
+    return parsed_skills
+
+
+async def create_job_description(
+    session_factory: async_sessionmaker,
+    candidate_count: int,
+) -> List[int]:
+    """Create a parsed job description with evaluated CVs.
+
+    :param session_factory: factory of database sessions.
+    :param candidate_count: number of CVs.
+    :return: IDs of the job description and of its PDFs.
+    """
+    rng = random.Random(candidate_count)
+    async with session_factory() as session:
+        job_description = JobDescriptionModel(title="benchmark", description="")
+        session.add(job_description)
+        await session.flush()
+        session.add(
+            ParsedJobDescriptionModel(
+                job_description_id=job_description.id,
+                parsed_skills={},
+            ),
+        )
+        pdf_ids = list(
+            (
+                await session.scalars(
+                    insert(PDFModel).returning(PDFModel.id),
+                    [
+                        {"name": f"cv {pdf}.pdf", "job_id": job_description.id}
+                        for pdf in range(candidate_count)
+                    ],
+                )
+            ).all(),
+        )
+        text_ids = list(
+            (
+                await session.scalars(
+                    insert(TextModel).returning(
+                        TextModel.id,
+                        sort_by_parameter_order=True,
+                    ),
+                    [{"pdf_id": pdf_id, "text": ""} for pdf_id in pdf_ids],
+                )
+            ).all(),
+        )
+        await session.execute(
+            insert(ParsedTextModel),
+            [
+                {
+                    "job_description_id": job_description.id,
+                    "text_id": text_id,
+                    "pdf_id": pdf_id,
+                    "parsed_skills": make_evaluation(rng),
+                }
+                for pdf_id, text_id in zip(pdf_ids, text_ids)
+            ],
+        )
+        await session.commit()
+        return [job_description.id, *pdf_ids]
+
+
+async def score_one_by_one(
+    session_factory: async_sessionmaker,
+    job_id: int,
+    pdf_ids: List[int],
+) -> None:
+    """Score the CVs one at a time, as `/scores/process/{pdf_id}/{job_id}`.
+
+    :param session_factory: factory of database sessions.
+    :param job_id: ID of the job description.
+    :param pdf_ids: IDs of the PDFs to score.
+    """
+    for pdf_id in pdf_ids:
+        async with session_factory() as session:
+            parsed_text = await ParsedTextDAO(
+                session,
+            ).get_parsed_text_by_pdf_id_and_job_id(pdf_id, job_id)
+            parsed_job_description = await ParsedJobDescriptionDAO(
+                session,
+            ).get_parsed_job_description_by_id(job_id)
+            result = await score_calculation(parsed_text=parsed_text)
+            await ScoreDAO(session).save_score(
+                pdf_id=pdf_id,
+                job_description_id=job_id,
+                parsed_job_description_id=parsed_job_description.id,
+                score=result["score"],
+            )
+
+
+async def score_all(session_factory: async_sessionmaker, job_id: int) -> None:
+    """Score the CVs at once, as `/scores/process/{job_id}`.
+
+    :param session_factory: factory of database sessions.
+    :param job_id: ID of the job description.
+    """
+    async with session_factory() as session:
+        parsed_job_description = await ParsedJobDescriptionDAO(
+            session,
+        ).get_parsed_job_description_by_id(job_id)
+        candidates = await ParsedTextDAO(session).get_latest_matches(job_id)
+        await ScoreDAO(session).save_scores(
+            job_description_id=job_id,
+            parsed_job_description_id=parsed_job_description.id,
+            scores=dict(rank_candidates(candidates)),
+        )
+
+
+async def rerank(session_factory: async_sessionmaker, job_id: int) -> None:
+    """Rank the CVs without saving, as `/scores/rerank/{job_id}`.
+
+    :param session_factory: factory of database sessions.
+    :param job_id: ID of the job description.
+    """
+    async with session_factory() as session:
+        candidates = await ParsedTextDAO(session).get_latest_matches(job_id)
+        rank_candidates(candidates)
+
+
+async def measure(func: Callable[[], Awaitable[Any]]) -> float:
+    """Time a coroutine function.
+
+    :param func: the coroutine function to time.
+    :return: the median duration in milliseconds.
+    """
+    durations = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        await func()
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(durations)
+
+
+async def score_evaluations_one_by_one(
+    evaluations: List[Dict[str, Any]],
+) -> List[float]:
+    """Score evaluations with `score_calculation`, without the database.
+
+    :param evaluations: the parsed skills of each CV.
+    :return: the scores.
+    """
+    scores = []
+    for evaluation in evaluations:
+        result = await score_calculation(SimpleNamespace(parsed_skills=evaluation))
+        scores.append(result["score"])
+    return scores
+
+
+async def score_evaluations_batch(evaluations: List[Dict[str, Any]]) -> List[float]:
+    """Score evaluations with `score_batch`, without the database.
+
+    :param evaluations: the parsed skills of each CV.
+    :return: the scores.
+    """
+    return score_batch(evaluations)
+
+
+async def main() -> None:
+    """Run the benchmark and print the results."""
+    load_all_models()
+    await create_database()
+    engine = create_async_engine(str(settings.db_url))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(meta.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        print(  # noqa: WPS421
+            "CVs | scoring only: one by one, batch ms "
+            "| with database: one by one, batch, rerank ms",
+        )
+        for candidate_count in CANDIDATE_COUNTS:
+            job_id, *pdf_ids = await create_job_description(
+                session_factory,
+                candidate_count,
+            )
+            rng = random.Random(candidate_count)
+            evaluations = [make_evaluation(rng) for _ in range(candidate_count)]
+            cpu_one_by_one = await measure(
+                lambda: score_evaluations_one_by_one(evaluations),
+            )
+            cpu_batch = await measure(lambda: score_evaluations_batch(evaluations))
+            db_one_by_one = await measure(
+                lambda: score_one_by_one(session_factory, job_id, pdf_ids),
+            )
+            db_batch = await measure(lambda: score_all(session_factory, job_id))
+            db_rerank = await measure(lambda: rerank(session_factory, job_id))
+            print(  # noqa: WPS421
+                f"{candidate_count:>5} | {cpu_one_by_one:>9.2f} {cpu_batch:>9.2f} "
+                f"| {db_one_by_one:>9.2f} {db_batch:>9.2f} {db_rerank:>9.2f}",
+            )
+    finally:
+        await engine.dispose()
+        await drop_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
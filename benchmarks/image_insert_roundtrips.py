@@ -0,0 +1,189 @@
+"""
+Round trips and latency of saving the page images of a document.
+
+Runs `ocr_pdf_pages` on a document with a real `ImageDAO`, and counts the
+statements it sends and the INSERTs into the images table. The pages are
+saved in one INSERT per window of `settings.parallel_tasks` pages; a window
+of one page is what saving each page as soon as it is rendered cost. The
+rasterization and the vision model are replaced by functions returning
+canned pages, so that only the database work is measured.
+
+It runs against a scratch database ("<db_base>_benchmark") created and
+dropped on the Postgres server configured in the settings:
+
+    python benchmarks/image_insert_roundtrips.py
+"""
+import asyncio
+import os
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from cv_copilot.settings import settings
+
+settings.db_base = f"{settings.db_base}_benchmark"
+
+from cv_copilot.db.dao.images import ImageDAO  # noqa: E402
+from cv_copilot.db.meta import meta  # noqa: E402
+from cv_copilot.db.models import load_all_models  # noqa: E402
+from cv_copilot.db.models.job_descriptions import JobDescriptionModel  # noqa: E402
+from cv_copilot.db.models.pdfs import PDFBlobModel, PDFModel  # noqa: E402
+from cv_copilot.db.utils import create_database, drop_database  # noqa: E402
+from cv_copilot.services.pdf import workflow  # noqa: E402
+
+PAGE_COUNTS = (1, 5, 20, 50)
+PAGE_SIZE = 200_000
+ROUNDS = 10
+
+
+class InlineExecutor:
+    """CPU executor running functions inline."""
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a function in the event loop.
+
+        :param func: the function to run.
+        :param args: the arguments of the function.
+        :return: the result of the function.
+        """
+        return func(*args)
+
+
+async def get_text_from_image(client: Any, image: bytes, cache: Any = None) -> Any:
+    """Answer as the vision model would, without calling it.
+
+    :param client: unused OpenAI client.
+    :param image: the JPEG image of the page.
+    :param cache: unused LLM cache.
+    :return: a chat completion with the text of the page.
+    """
+    message = SimpleNamespace(content="text of the page")
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+async def create_pdf(session_factory: async_sessionmaker) -> PDFModel:
+    """Create a job description with a PDF to attach the images to.
+
+    :param session_factory: factory of database sessions.
+    :return: the PDF.
+    """
+    async with session_factory() as session:
+        job_description = JobDescriptionModel(title="benchmark", description="")
+        session.add(job_description)
+        content_hash = os.urandom(16).hex()
+        session.add(PDFBlobModel(content_hash=content_hash, file=b"", size=0))
+        await session.flush()
+        pdf = PDFModel(
+            name="benchmark.pdf",
+            job_id=job_description.id,
+            content_hash=content_hash,
+        )
+        session.add(pdf)
+        await session.commit()
+        return pdf
+
+
+async def measure(
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker,
+    page_count: int,
+    window: int,
+) -> Tuple[int, int, float]:
+    """Measure the statements sent and the median latency of a document.
+
+    :param engine: the database engine.
+    :param session_factory: factory of database sessions.
+    :param page_count: the pages of the document.
+    :param window: the pages saved by each INSERT, `settings.parallel_tasks`.
+    :return: statements and image INSERTs sent for one document, and
+        median latency, in milliseconds.
+    """
+    statements: List[str] = []
+
+    def count_statement(*args: Any) -> None:
+        statements.append(args[2])
+
+    settings.parallel_tasks = window
+    latencies: List[float] = []
+    for _ in range(ROUNDS):
+        # A new PDF for each round, so that no page is read back.
+        pdf = await create_pdf(session_factory)
+        async with session_factory() as session:
+            event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+            try:
+                started_at = time.perf_counter()
+                await workflow.ocr_pdf_pages(
+                    pdf,
+                    b"%PDF-1.4",
+                    None,
+                    ImageDAO(session),
+                    InlineExecutor(),
+                    None,
+                )
+                await session.commit()
+                latencies.append((time.perf_counter() - started_at) * 1000)
+            finally:
+                event.remove(
+                    engine.sync_engine,
+                    "before_cursor_execute",
+                    count_statement,
+                )
+    image_inserts = [
+        statement
+        for statement in statements
+        if statement.startswith("INSERT INTO images")
+    ]
+    return (
+        len(statements) // ROUNDS,
+        len(image_inserts) // ROUNDS,
+        statistics.median(latencies),
+    )
+
+
+async def main() -> None:
+    """Run the benchmark and print the results."""
+    load_all_models()
+    await create_database()
+    engine = create_async_engine(str(settings.db_url))
+    parallel_tasks = settings.parallel_tasks
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(meta.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        workflow.get_text_from_image = get_text_from_image
+
+        print(  # noqa: WPS421
+            "pages | window: statements, inserts, ms per document",
+        )
+        for page_count in PAGE_COUNTS:
+            pages = [os.urandom(PAGE_SIZE) for _ in range(page_count)]
+            workflow.count_pdf_pages = lambda pdf_file, pdf_id: page_count
+            workflow.render_pdf_pages = (
+                lambda pdf_file, pdf_id, profile, page_numbers: [
+                    pages[page_number - 1] for page_number in page_numbers
+                ]
+            )
+            results = []
+            for window in sorted({1, parallel_tasks}):
+                statements, inserts, latency = await measure(
+                    engine,
+                    session_factory,
+                    page_count,
+                    window,
+                )
+                results.append(
+                    f"{window:>3}: {statements:>4} {inserts:>4} {latency:>9.2f}",
+                )
+            print(f"{page_count:>5} | " + " | ".join(results))  # noqa: WPS421
+    finally:
+        settings.parallel_tasks = parallel_tasks
+        await engine.dispose()
+        await drop_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Latency of listing PDFs depending on the size of their content.
+
+Compares `PDFDAO.get_all_pdfs`, which only loads the metadata of the PDFs,
+with the same query also loading their content, as the list endpoint did
+when the content was a column of the 'pdfs' table.
+
+It runs against a scratch database ("<db_base>_benchmark") created and
+dropped on the Postgres server configured in the settings:
+
+    python benchmarks/pdf_list_latency.py
+"""
+import asyncio
+import hashlib
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import undefer
+
+from cv_copilot.settings import settings
+
+settings.db_base = f"{settings.db_base}_benchmark"
+
+from cv_copilot.db.dao.pdfs import PDFDAO  # noqa: E402
+from cv_copilot.db.meta import meta  # noqa: E402
+from cv_copilot.db.models import load_all_models  # noqa: E402
+from cv_copilot.db.models.job_descriptions import JobDescriptionModel  # noqa: E402
+from cv_copilot.db.models.pdfs import PDFBlobModel, PDFModel  # noqa: E402
+from cv_copilot.db.utils import create_database, drop_database  # noqa: E402
+
+BLOB_SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+PAGE_SIZE = 10
+ROUNDS = 20
+
+
+async def create_pdfs(session: AsyncSession, blob_size: int) -> int:
+    """Create a job description with PAGE_SIZE PDFs of the given size.
+
+    :param session: database session.
+    :param blob_size: size of the content of each PDF, in bytes.
+    :return: ID of the job description.
+    """
+    job_description = JobDescriptionModel(title="benchmark", description="benchmark")
+    session.add(job_description)
+    await session.flush()
+    for _ in range(PAGE_SIZE):
+        content = os.urandom(blob_size)
+        content_hash = hashlib.sha256(content).hexdigest()
+        session.add(
+            PDFBlobModel(content_hash=content_hash, file=content, size=blob_size),
+        )
+        await session.flush()
+        session.add(
+            PDFModel(
+                name="benchmark.pdf",
+                job_id=job_description.id,
+                content_hash=content_hash,
+                created_date=datetime.utcnow(),
+            ),
+        )
+    await session.commit()
+    return job_description.id
+
+
+async def list_with_content(session: AsyncSession, job_id: int) -> None:
+    """List the PDFs of a job description, loading their content.
+
+    :param session: database session.
+    :param job_id: ID of the job description.
+    """
+    rows = await session.execute(
+        select(PDFModel, PDFBlobModel)
+        .join(PDFBlobModel, PDFModel.content_hash == PDFBlobModel.content_hash)
+        .options(undefer(PDFBlobModel.file))
+        .where(PDFModel.job_id == job_id)
+        .order_by(desc(PDFModel.created_date))
+        .limit(PAGE_SIZE),
+    )
+    rows.all()
+
+
+async def measure(query: Callable[[], Awaitable[object]]) -> float:
+    """Measure the median latency of a query.
+
+    :param query: the query to run.
+    :return: median latency, in milliseconds.
+    """
+    latencies: List[float] = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        await query()
+        latencies.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(latencies)
+
+
+async def main() -> None:
+    """Run the benchmark and print the results."""
+    load_all_models()
+    await create_database()
+    engine = create_async_engine(str(settings.db_url))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(meta.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        print("blob size | metadata only (ms) | with content (ms)")  # noqa: WPS421
+        for blob_size in BLOB_SIZES:
+            async with session_factory() as session:
+                job_id = await create_pdfs(session, blob_size)
+                dao = PDFDAO(session)
+                metadata_ms = await measure(
+                    lambda: dao.get_all_pdfs(job_id=job_id, limit=PAGE_SIZE, offset=0),
+                )
+                content_ms = await measure(lambda: list_with_content(session, job_id))
+            print(  # noqa: WPS421
+                f"{blob_size:>9} | {metadata_ms:>18.2f} | {content_ms:>17.2f}",
+            )
+    finally:
+        await engine.dispose()
+        await drop_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
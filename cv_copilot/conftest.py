@@ -20,7 +20,11 @@ from cv_copilot.db.dao.job_descriptions import JobDescriptionDAO
 from cv_copilot.db.dao.pdfs import PDFDAO
 from cv_copilot.db.dependencies import get_db_session
 from cv_copilot.db.utils import create_database, drop_database
+from cv_copilot.services.pdf.upload import spool_pdf_upload
+from cv_copilot.services.progress.dependency import get_progress_publisher
+from cv_copilot.services.progress.publisher import ProgressPublisher
 from cv_copilot.services.redis.dependency import get_redis_pool
+from cv_copilot.services.storage.dependency import get_blob_storage
 from cv_copilot.settings import settings
 from cv_copilot.web.application import get_app
 from cv_copilot.web.dto.job_description.schema import (
@@ -125,6 +129,14 @@ def fastapi_app(
     application = get_app()
     application.dependency_overrides[get_db_session] = lambda: dbsession
     application.dependency_overrides[get_redis_pool] = lambda: fake_redis_pool
+    application.dependency_overrides[get_progress_publisher] = lambda: (
+        ProgressPublisher(
+            fake_redis_pool,
+            ttl=settings.progress_event_ttl,
+            keepalive_interval=settings.progress_keepalive_interval,
+        )
+    )
+    application.dependency_overrides[get_blob_storage] = lambda: None
     return application  # noqa: WPS331
 
 
@@ -162,10 +174,14 @@ async def create_job_description(dbsession: AsyncSession) -> JobDescriptionDTO:
 
 
 @pytest.fixture
-async def create_pdf(dbsession: AsyncSession) -> PDFModelDTO:
+async def create_pdf(
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+) -> PDFModelDTO:
     """Create a fixture to create a job pdf.
 
     :param dbsession: AsyncSession instance.
+    :param create_job_description: JobDescriptionDTO of the PDF.
     :return: PDFModelDTO instance.
     """
     date = datetime(2023, 1, 1).isoformat()
@@ -182,7 +198,12 @@ async def create_pdf(dbsession: AsyncSession) -> PDFModelDTO:
     )
 
     # Create a PDFModelInputDTO without the file attribute
-    pdf_input = PDFModelInputDTO(name="test.pdf", job_id=1, created_date=date)
+    pdf_input = PDFModelInputDTO(
+        name="test.pdf",
+        job_id=create_job_description.id,
+        created_date=date,
+    )
 
-    # Pass the UploadFile object and the PDFModelInputDTO to the upload_pdf method
-    return await pdf_dao.upload_pdf(pdf_input, upload_file)
+    # Pass the spooled file and the PDFModelInputDTO to the upload_pdf method
+    async with spool_pdf_upload(upload_file) as spooled_pdf:
+        return await pdf_dao.upload_pdf(pdf_input, spooled_pdf)
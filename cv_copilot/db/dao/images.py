@@ -1,19 +1,27 @@
 import logging
-from typing import List, Optional, Sequence
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
 
 from fastapi import Depends
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from cv_copilot.db.dependencies import get_db_session
 from cv_copilot.db.models.images import ImageModel
+from cv_copilot.services.storage.base import BlobStorage
 
 
 class ImageDAO:
     """Class for accessing the 'images' table."""
 
-    def __init__(self, session: AsyncSession = Depends(get_db_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_db_session),
+        blob_storage: Optional[BlobStorage] = None,
+    ):
         self.session = session
+        self.blob_storage = blob_storage
 
     async def get_images_by_pdf_id(self, pdf_id: int) -> Sequence[ImageModel]:
         """
@@ -30,16 +38,45 @@ class ImageDAO:
         logging.info(f"Retrieved {images} images for PDF {pdf_id}")
         return images
 
+    async def get_page_images(self, pdf_id: int) -> Sequence[ImageModel]:
+        """
+        Retrieve the pages saved for a PDF, without the JPEG bytes.
+
+        Only the page number, the storage key and the text of the images are
+        loaded: the bytes of a page are read with `get_image_file` when the
+        page is converted.
+
+        :param pdf_id: ID of the PDF to retrieve the pages of.
+        :return: List of ImageModel instances, without their 'file'.
+        """
+        result = await self.session.execute(
+            select(ImageModel)
+            .options(
+                load_only(
+                    ImageModel.id,
+                    ImageModel.page_number,
+                    ImageModel.storage_key,
+                    ImageModel.text,
+                ),
+            )
+            .where(ImageModel.pdf_id == pdf_id),
+        )
+        return result.scalars().all()
+
     async def get_images_by_ids(self, image_ids: List[int]) -> Sequence[ImageModel]:
         """
         Retrieve all the parsed images given a pdf_id.
 
+        The images are returned in insertion order, which is the page order.
+
         :param image_ids: IDs of the images to retrieve.
         :return: List of ImageModel instances associated with the PDF.
         """
         await self.session.commit()
         result = await self.session.execute(
-            select(ImageModel).where(ImageModel.id.in_(image_ids)),
+            select(ImageModel)
+            .where(ImageModel.id.in_(image_ids))
+            .order_by(ImageModel.id),
         )
         images = result.scalars().all()
         logging.info(f"Retrieved {len(images)} images for image IDs {image_ids}")
@@ -58,38 +95,74 @@ class ImageDAO:
         await self.session.commit()
         return image
 
-    async def save_encoded_images(
+    async def save_images(
         self,
         pdf_id: int,
         job_id: int,
-        encoded_images: list[str],
+        images: List[bytes],
+        page_numbers: Optional[List[int]] = None,
     ) -> List[int]:
         """
-        Save encoded images to the database, each separately.
+        Save images to the database in a single INSERT ... RETURNING.
+
+        When a blob storage is configured, the images are written to it and
+        only their key is saved in the database.
 
         :param pdf_id: ID of the PDF related to the images.
         :param job_id: ID of the job description related to the images.
-        :param encoded_images: List of base64 encoded images.
+        :param images: List of JPEG images.
+        :param page_numbers: The page of the PDF of each image, if known.
         :return: List of IDs of the added images.
         """
-        # Create a list of ImageModel instances
-        encoded_image_models = [
-            ImageModel(pdf_id=pdf_id, job_id=job_id, encoded_image=image)
-            for image in encoded_images
-        ]
-
-        # Add all instances to the session and commit
-        self.session.add_all(encoded_image_models)
+        if not images:
+            return []
+        pages: List[Optional[int]] = [None] * len(images)
+        if page_numbers is not None:
+            pages = list(page_numbers)
+        rows = []
+        for image, page_number in zip(images, pages):
+            row: Dict[str, Any] = {
+                "pdf_id": pdf_id,
+                "job_id": job_id,
+                "page_number": page_number,
+            }
+            if self.blob_storage is None:
+                row["file"] = image
+            else:
+                storage_key = f"images/{pdf_id}/{uuid.uuid4().hex}.jpg"
+                await self.blob_storage.put(storage_key, image)
+                row["storage_key"] = storage_key
+            rows.append(row)
+
+        # The IDs are returned in the order of the rows
+        result = await self.session.execute(
+            insert(ImageModel).returning(ImageModel.id, sort_by_parameter_order=True),
+            rows,
+        )
+        image_ids = list(result.scalars().all())
         await self.session.commit()
 
-        image_ids = []
-        for image in encoded_image_models:
-            await self.session.refresh(image)
-            image_ids.append(image.id)
-
         logging.info(f"Saved {len(image_ids)} images with id {image_ids}")
         return image_ids
 
+    async def save_pages_text(self, pages_text: Dict[int, str]) -> None:
+        """
+        Save the text of the pages of some images, in a single UPDATE.
+
+        :param pages_text: The text of the page of each image, by image ID.
+        """
+        if not pages_text:
+            return
+        await self.session.execute(
+            update(ImageModel),
+            [
+                {"id": image_id, "text": page_text}
+                for image_id, page_text in pages_text.items()
+            ],
+        )
+        await self.session.commit()
+        logging.info(f"Saved the text of {len(pages_text)} pages")
+
     async def get_image_by_id(self, image_id: int) -> Optional[ImageModel]:
         """
         Retrieve a single image by its ID.
@@ -102,13 +175,39 @@ class ImageDAO:
         )
         return result.scalars().first()
 
+    async def get_image_file(self, image: ImageModel) -> bytes:
+        """
+        Read the JPEG bytes of an image, from the database or the blob storage.
+
+        The bytes are queried by the ID of the image, so the image may come
+        from `get_page_images`, without its 'file'.
+
+        :param image: ImageModel instance to read.
+        :return: the JPEG image.
+        :raises ValueError: If the image is in a blob storage that is not
+            configured.
+        """
+        if image.storage_key is None:
+            result = await self.session.execute(
+                select(ImageModel.file).where(ImageModel.id == image.id),
+            )
+            return result.scalar_one()
+        if self.blob_storage is None:
+            raise ValueError(f"No blob storage configured to read {image.storage_key}")
+        return await self.blob_storage.get(image.storage_key)
+
     async def delete_image_by_id(self, image_id: int) -> None:
         """
-        Delete a single image by its ID.
+        Delete a single image by its ID, and its blob if it is in the storage.
 
         :param image_id: ID of the image to delete.
         """
-        await self.session.execute(
-            delete(ImageModel).where(ImageModel.id == image_id),
+        result = await self.session.execute(
+            delete(ImageModel)
+            .where(ImageModel.id == image_id)
+            .returning(ImageModel.storage_key),
         )
+        storage_key = result.scalars().first()
         await self.session.commit()
+        if storage_key is not None and self.blob_storage is not None:
+            await self.blob_storage.delete(storage_key)
@@ -1,16 +1,22 @@
 import logging
-from typing import List, Optional, cast
+from typing import List, Optional, Tuple, cast
 
 import pendulum
-from sqlalchemy import delete, desc, select, update
+from sqlalchemy import and_, delete, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql.sqltypes import Text
 
 from cv_copilot.db.models.job_descriptions import (
     JobDescriptionModel,
     ParsedJobDescriptionModel,
 )
+from cv_copilot.db.models.leaderboard import LeaderboardEntryModel
+from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.db.models.texts import ParsedTextModel
+from cv_copilot.db.pagination import Cursor, paginate
 from cv_copilot.services.llm.models.skills import SkillsExtract
+from cv_copilot.services.text.content_hash import job_description_content_hash
 from cv_copilot.web.dto.job_description.schema import (
     JobDescriptionDTO,
     JobDescriptionInputDTO,
@@ -36,6 +42,7 @@ class JobDescriptionDAO:
         new_job_description = JobDescriptionModel(
             title=job_description_dto.title,
             description=job_description_dto.description,
+            content_hash=job_description_content_hash(job_description_dto.description),
         )
         self.session.add(new_job_description)
         await self.session.commit()
@@ -68,20 +75,28 @@ class JobDescriptionDAO:
     async def get_all_job_descriptions(
         self,
         limit: int,
-        offset: int,
+        offset: int = 0,
+        cursor: Optional[Cursor] = None,
     ) -> List[JobDescriptionDTO]:
         """
-        Get all job descriptions with limit/offset pagination.
+        Get all job descriptions with cursor pagination, most recent first.
 
         :param limit: The maximum number of job descriptions to return.
-        :param offset: The offset from where to start the query.
+        :param offset: Deprecated, the offset from where to start the query
+            when there is no cursor.
+        :param cursor: The position of the last job description of the
+            previous page.
         :return: A list of JobDescriptionDTO instances.
         """
         raw_job_descriptions = await self.session.execute(
-            select(JobDescriptionModel)
-            .limit(limit)
-            .offset(offset)
-            .order_by(desc(JobDescriptionModel.created_date)),
+            paginate(
+                select(JobDescriptionModel),
+                JobDescriptionModel.created_date,
+                JobDescriptionModel.id,
+                limit=limit,
+                cursor=cursor,
+                offset=offset,
+            ),
         )
         job_descriptions = raw_job_descriptions.scalars().fetchall()
         logging.info(
@@ -121,6 +136,9 @@ class JobDescriptionDAO:
         """
         Update a job description by its ID.
 
+        The hash of the description is updated with it, so that the job
+        description is parsed again only if its description changed.
+
         :param job_description_id: ID of the job description to update.
         :param job_description_dto: DTO containing the updated data.
         :return: The updated JobDescriptionDTO instance if found, else None.
@@ -134,6 +152,9 @@ class JobDescriptionDAO:
             job_description.title = job_description_dto.title
             # To improve types
             job_description.description = cast(Text, job_description_dto.description)
+            job_description.content_hash = job_description_content_hash(
+                job_description_dto.description,
+            )
             job_description.updated_date = pendulum.now("UTC").naive()
             await self.session.commit()
             await self.session.refresh(job_description)
@@ -142,6 +163,73 @@ class JobDescriptionDAO:
         logging.warning(f"Job description with ID {job_description_id} not found")
         return None
 
+    async def get_dashboard(  # noqa: WPS210
+        self,
+        job_description_id: int,
+        limit: int,
+        cursor: Optional[Cursor] = None,
+        with_scores: bool = True,
+        with_evaluations: bool = True,
+    ) -> List[
+        Tuple[PDFModel, Optional[LeaderboardEntryModel], Optional[ParsedTextModel]]
+    ]:
+        """
+        Get the PDFs of a job description with their last score and evaluation.
+
+        A page of PDFs is read in a single query, joined to the leaderboard
+        for the last score and to the last evaluation of each PDF.
+
+        :param job_description_id: ID of the job description.
+        :param limit: maximum number of PDFs to return.
+        :param cursor: position of the last PDF of the previous page.
+        :param with_scores: whether to join the last scores.
+        :param with_evaluations: whether to join the last evaluations, the
+            largest part of the result.
+        :return: each PDF, most recent first, with its leaderboard entry and
+            its last ParsedTextModel, None when missing or not requested.
+        """
+        query = select(PDFModel).where(PDFModel.job_id == job_description_id)
+        if with_scores:
+            query = query.add_columns(LeaderboardEntryModel).outerjoin(
+                LeaderboardEntryModel,
+                and_(
+                    LeaderboardEntryModel.pdf_id == PDFModel.id,
+                    LeaderboardEntryModel.job_description_id == job_description_id,
+                ),
+            )
+        if with_evaluations:
+            last_evaluation = aliased(
+                ParsedTextModel,
+                select(ParsedTextModel)
+                .where(
+                    ParsedTextModel.pdf_id == PDFModel.id,
+                    ParsedTextModel.job_description_id == job_description_id,
+                )
+                .order_by(ParsedTextModel.id.desc())
+                .limit(1)
+                .lateral(),
+            )
+            query = query.add_columns(last_evaluation).outerjoin(
+                last_evaluation,
+                true(),
+            )
+        result = await self.session.execute(
+            paginate(
+                query,
+                PDFModel.created_date,
+                PDFModel.id,
+                limit=limit,
+                cursor=cursor,
+            ),
+        )
+        dashboard = []
+        for row in result.all():
+            pdf, *joined = row
+            entry = joined.pop(0) if with_scores else None
+            evaluation = joined.pop(0) if with_evaluations else None
+            dashboard.append((pdf, entry, evaluation))
+        return dashboard
+
 
 class ParsedJobDescriptionDAO:
     """Class for accessing the 'parsed_job_descriptions' table."""
@@ -153,34 +241,41 @@ class ParsedJobDescriptionDAO:
         self,
         job_description_id: int,
     ) -> Optional[ParsedJobDescriptionModel]:
-        """Get a single parsed job description by its ID.
+        """Get the last parsed job description of a job description.
 
-        :param job_description_id: ID of the parsed job description to retrieve.
+        :param job_description_id: ID of the job description.
         :return: ParsedJobDescriptionModel if found, else None.
         """
         result = await self.session.execute(
-            select(ParsedJobDescriptionModel).where(
+            select(ParsedJobDescriptionModel)
+            .where(
                 ParsedJobDescriptionModel.job_description_id == job_description_id,
-            ),
+            )
+            .order_by(ParsedJobDescriptionModel.id.desc())
+            .limit(1),
         )
         logging.info(
             f"Retrieved parsed job description with ID: {job_description_id}",
         )
-        return result.scalar_one_or_none()
+        return result.scalars().first()
 
     async def save_parsed_job_description(
         self,
         job_description_id: int,
         job_extract: SkillsExtract,
+        content_hash: Optional[str] = None,
     ) -> ParsedJobDescriptionModel:
         """Save a parsed job description to the database.
 
         :param job_description_id: ID of the job description to save.
-        :param parsed_text: Parsed text to save.
+        :param job_extract: The skills parsed from the job description.
+        :param content_hash: Hash of the description that was parsed.
+        :return: The saved parsed job description.
         """
         new_parsed_job_description = ParsedJobDescriptionModel(
             job_description_id=job_description_id,
             parsed_skills=job_extract.model_dump(),
+            content_hash=content_hash,
         )
         self.session.add(new_parsed_job_description)
         await self.session.commit()
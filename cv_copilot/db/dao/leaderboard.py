@@ -0,0 +1,93 @@
+from typing import Dict, List
+
+import pendulum
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.models.leaderboard import LeaderboardEntryModel
+
+
+class LeaderboardDAO:
+    """Class for accessing the 'leaderboard' table."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_top(
+        self,
+        job_description_id: int,
+        k: int,
+    ) -> List[LeaderboardEntryModel]:
+        """
+        Get the best PDFs of a job description by their last score.
+
+        :param job_description_id: ID of the job description.
+        :param k: maximum number of PDFs to return.
+        :return: list of LeaderboardEntryModel, best first.
+        """
+        result = await self.session.execute(
+            select(LeaderboardEntryModel)
+            .where(LeaderboardEntryModel.job_description_id == job_description_id)
+            .order_by(
+                LeaderboardEntryModel.score.desc(),
+                LeaderboardEntryModel.pdf_id.desc(),
+            )
+            .limit(k),
+        )
+        return list(result.scalars().all())
+
+    async def clear(self, job_description_id: int) -> None:
+        """
+        Remove all the PDFs from the leaderboard of a job description.
+
+        It does not commit: it is called by `WeightProfileDAO` before
+        committing the new weights, as the scores are outdated.
+
+        :param job_description_id: ID of the job description.
+        """
+        await self.session.execute(
+            delete(LeaderboardEntryModel).where(
+                LeaderboardEntryModel.job_description_id == job_description_id,
+            ),
+        )
+
+    async def update_scores(
+        self,
+        job_description_id: int,
+        scores: Dict[int, float],
+    ) -> None:
+        """
+        Record the new scores of PDFs in the leaderboard of a job description.
+
+        It does not commit: it is called by `ScoreDAO` before committing the
+        scores, so the leaderboard is updated in the same transaction.
+
+        :param job_description_id: ID of the job description.
+        :param scores: the new score of each PDF, by PDF ID.
+        """
+        if not scores:
+            return
+        updated_date = pendulum.now("UTC").naive()
+        statement = insert(LeaderboardEntryModel)
+        # The rows are sent as parameters of an executemany, in pages of
+        # multi-row inserts, so the number of PDFs is not limited by the
+        # number of parameters of a single statement.
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_leaderboard_pdf_id_job_description_id",
+                set_={
+                    "score": statement.excluded.score,
+                    "updated_date": statement.excluded.updated_date,
+                },
+            ),
+            [
+                {
+                    "pdf_id": pdf_id,
+                    "job_description_id": job_description_id,
+                    "score": score,
+                    "updated_date": updated_date,
+                }
+                for pdf_id, score in scores.items()
+            ],
+        )
@@ -1,53 +1,67 @@
 import logging
 from typing import List, Optional
 
-from fastapi import Depends, HTTPException, UploadFile
-from sqlalchemy import desc, select
+import aiofiles
+from fastapi import Depends, HTTPException
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cv_copilot.db.dependencies import get_db_session
-from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.db.models.images import ImageModel
+from cv_copilot.db.models.pdfs import PDFBlobModel, PDFModel
+from cv_copilot.db.pagination import Cursor, paginate
+from cv_copilot.services.pdf.upload import SpooledPDF
+from cv_copilot.services.storage.base import BlobStorage
 from cv_copilot.web.dto.pdfs.schema import PDFModelDTO, PDFModelInputDTO
 
 
 class PDFDAO:
     """Class for accessing the 'pdfs' table."""
 
-    def __init__(self, session: AsyncSession = Depends(get_db_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_db_session),
+        blob_storage: Optional[BlobStorage] = None,
+    ):
         self.session = session
+        self.blob_storage = blob_storage
 
     async def upload_pdf(
         self,
         pdf_input: PDFModelInputDTO,
-        pdf_file: UploadFile,
+        pdf_file: SpooledPDF,
     ) -> PDFModelDTO:
         """
         Add single pdf to session.
 
+        The content of the file is stored once per SHA-256 hash, in the
+        'pdf_blobs' table or in the blob storage when one is configured:
+        uploading a file that is already stored only adds a row to the
+        'pdfs' table. The blob storage receives the file in chunks.
+
         :param pdf_input: DTO for creating a PDF model.
-        :param pdf_file: PDF file to upload.
+        :param pdf_file: PDF file to upload, see `spool_pdf_upload`.
         :return: DTO of the created PDF model.
         :raises HTTPException: If the PDF cannot be uploaded.
         """
         try:
-            file_contents = await pdf_file.read()
+            await self.store_blob(pdf_file)
             new_pdf = PDFModel(
                 name=pdf_input.name,
                 job_id=pdf_input.job_id,
-                file=file_contents,
+                content_hash=pdf_file.content_hash,
                 s3_url=pdf_input.s3_url,
                 created_date=pdf_input.created_date,
             )
             self.session.add(new_pdf)
             await self.session.commit()
             await self.session.refresh(new_pdf)
-            logging.info(f"PDF file weight: {len(file_contents)}")
+            logging.info(f"PDF file weight: {pdf_file.size}")
             return PDFModelDTO.from_orm(new_pdf)
         except Exception as e:
             logging.error(f"Error uploading PDF: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
-        finally:
-            await pdf_file.close()
 
     async def get_pdf_by_id(
         self,
@@ -66,28 +80,125 @@ class PDFDAO:
         logging.info(f"Get pdf by id: {pdf_id}")
         return pdf
 
+    async def store_blob(self, pdf_file: SpooledPDF) -> Optional[str]:
+        """
+        Store the content of a PDF, unless a PDF with the same hash is stored.
+
+        It does not commit: the content is committed with the PDFs using it,
+        see `upload_pdf` and `UploadBatchDAO.create_batch`.
+
+        :param pdf_file: PDF file to store, see `spool_pdf_upload`.
+        :return: the key of the file added to the blob storage, None if
+            nothing was added to it.
+        """
+        if await self.get_blob_by_hash(pdf_file.content_hash) is None:
+            return await self._store_blob(pdf_file)
+        return None
+
+    async def delete_stored_files(self, storage_keys: List[str]) -> None:
+        """
+        Delete files added to the blob storage by `store_blob`.
+
+        It is used when the transaction the content was stored in is rolled
+        back, so that the files are not left in the storage.
+
+        :param storage_keys: the keys returned by `store_blob`.
+        """
+        if self.blob_storage is None:
+            return
+        for storage_key in storage_keys:
+            await self.blob_storage.delete(storage_key)
+
+    async def _store_blob(self, pdf_file: SpooledPDF) -> Optional[str]:
+        storage_key = None
+        if self.blob_storage is None:
+            async with aiofiles.open(pdf_file.path, "rb") as source_file:
+                blob_values = {"file": await source_file.read(), "storage_key": None}
+        else:
+            storage_key = f"pdfs/{pdf_file.content_hash}.pdf"
+            await self.blob_storage.put_file(storage_key, pdf_file.path)
+            blob_values = {"file": None, "storage_key": storage_key}
+        await self.session.execute(
+            insert(PDFBlobModel)
+            .values(
+                content_hash=pdf_file.content_hash,
+                size=pdf_file.size,
+                **blob_values,
+            )
+            .on_conflict_do_nothing(index_elements=[PDFBlobModel.content_hash]),
+        )
+        return storage_key
+
+    async def get_blob_by_hash(
+        self,
+        content_hash: str,
+    ) -> Optional[PDFBlobModel]:
+        """
+        Get the metadata of the content of a PDF by its SHA-256 hash.
+
+        The content itself is not loaded, see `get_pdf_file`.
+
+        :param content_hash: hex digest of the SHA-256 hash of the PDF.
+        :return: PDFBlobModel if found, else None.
+        """
+        result = await self.session.execute(
+            select(PDFBlobModel).where(PDFBlobModel.content_hash == content_hash),
+        )
+        return result.scalars().first()
+
+    async def get_pdf_file(self, pdf_id: int) -> Optional[bytes]:
+        """
+        Get the content of a PDF.
+
+        This is the only query loading the content of PDFs, which is only
+        needed to convert them to text.
+
+        :param pdf_id: ID of the PDF.
+        :return: content of the PDF, None if the PDF or its content is not found.
+        :raises ValueError: If the content is in a blob storage that is not
+            configured.
+        """
+        result = await self.session.execute(
+            select(PDFBlobModel.file, PDFBlobModel.storage_key)
+            .join(PDFModel, PDFModel.content_hash == PDFBlobModel.content_hash)
+            .where(PDFModel.id == pdf_id),
+        )
+        blob = result.first()
+        if blob is None:
+            return None
+        if blob.storage_key is None:
+            return blob.file
+        if self.blob_storage is None:
+            raise ValueError(f"No blob storage configured to read {blob.storage_key}")
+        return await self.blob_storage.get(blob.storage_key)
+
     async def get_all_pdfs(
         self,
         job_id: int,
         limit: int,
-        offset: int,
+        offset: int = 0,
+        cursor: Optional[Cursor] = None,
     ) -> List[PDFModelDTO]:
         """
-        Get all PDFs for a job description (job_id) with limit/offset pagination.
+        Get all PDFs for a job description (job_id) with cursor pagination.
 
         The PDFs are ordered in order by recency.
 
         :param job_id: job_id of the job description of the PDF.
         :param limit: limit of PDF.
-        :param offset: offset of PDF.
+        :param offset: deprecated, offset of PDF when there is no cursor.
+        :param cursor: position of the last PDF of the previous page.
         :return: stream of PDF.
         """
         raw_pdfs = await self.session.execute(
-            select(PDFModel)
-            .where(PDFModel.job_id == job_id)
-            .order_by(desc(PDFModel.created_date))
-            .limit(limit)
-            .offset(offset),
+            paginate(
+                select(PDFModel).where(PDFModel.job_id == job_id),
+                PDFModel.created_date,
+                PDFModel.id,
+                limit=limit,
+                cursor=cursor,
+                offset=offset,
+            ),
         )
         return [PDFModelDTO.from_orm(pdf) for pdf in raw_pdfs.scalars().fetchall()]
 
@@ -113,19 +224,49 @@ class PDFDAO:
 
     async def delete_pdf_by_id(self, pdf_id: int) -> bool:
         """
-        Delete a PDF by its ID.
+        Delete a PDF by its ID, with its content and its page images.
+
+        The content is deleted in the same transaction as the PDF, unless
+        another PDF has the same content. The files in the blob storage are
+        deleted once the transaction is committed.
 
         :param pdf_id: ID of the PDF to delete.
         :return: True if deletion was successful, False otherwise.
         """
         try:
             pdf_to_delete = await self.get_pdf_by_id(pdf_id)
-            if pdf_to_delete:
-                await self.session.delete(pdf_to_delete)
-                await self.session.commit()
-                return True
-            return False
+            if not pdf_to_delete:
+                return False
+            # Read before the images are deleted with the PDF
+            image_keys = await self.session.execute(
+                select(ImageModel.storage_key).where(
+                    ImageModel.pdf_id == pdf_id,
+                    ImageModel.storage_key.is_not(None),
+                ),
+            )
+            storage_keys = list(image_keys.scalars().all())
+            content_hash = pdf_to_delete.content_hash
+            await self.session.delete(pdf_to_delete)
+            await self.session.flush()
+            if content_hash is not None:
+                storage_keys.extend(await self._delete_unused_blob(content_hash))
+            await self.session.commit()
         except Exception as e:
             logging.error(f"Error deleting PDF ID {pdf_id}: {e}")
             await self.session.rollback()
             return False
+        if self.blob_storage is not None:
+            for storage_key in storage_keys:
+                await self.blob_storage.delete(storage_key)
+        return True
+
+    async def _delete_unused_blob(self, content_hash: str) -> List[str]:
+        result = await self.session.execute(
+            delete(PDFBlobModel)
+            .where(
+                PDFBlobModel.content_hash == content_hash,
+                ~exists().where(PDFModel.content_hash == content_hash),
+            )
+            .returning(PDFBlobModel.storage_key),
+        )
+        return [storage_key for storage_key in result.scalars() if storage_key]
@@ -0,0 +1,140 @@
+import logging
+from typing import Any, List, Optional
+
+import pendulum
+from sqlalchemy import Integer, any_, cast, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.models.pipeline_runs import PipelineRunModel, PipelineStage
+
+
+class PipelineRunDAO:
+    """Class for accessing the 'pipeline_runs' table."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_run(
+        self,
+        pdf_id: int,
+        job_description_id: int,
+    ) -> Optional[PipelineRunModel]:
+        """
+        Get the run of a PDF for a job description.
+
+        :param pdf_id: ID of the PDF.
+        :param job_description_id: ID of the job description.
+        :return: PipelineRunModel if the PDF was ever processed, else None.
+        """
+        result = await self.session.execute(
+            select(PipelineRunModel).where(
+                PipelineRunModel.pdf_id == pdf_id,
+                PipelineRunModel.job_description_id == job_description_id,
+            ),
+        )
+        return result.scalar_one_or_none()
+
+    async def get_or_create_run(
+        self,
+        pdf_id: int,
+        job_description_id: int,
+    ) -> PipelineRunModel:
+        """
+        Get the run of a PDF for a job description, creating it if needed.
+
+        Concurrent calls for the same PDF and job description get the same
+        run.
+
+        :param pdf_id: ID of the PDF.
+        :param job_description_id: ID of the job description.
+        :return: the PipelineRunModel.
+        """
+        await self.session.execute(
+            insert(PipelineRunModel)
+            .values(
+                pdf_id=pdf_id,
+                job_description_id=job_description_id,
+                stage=PipelineStage.PENDING.value,
+            )
+            .on_conflict_do_nothing(
+                constraint="uq_pipeline_runs_pdf_id_job_description_id",
+            ),
+        )
+        await self.session.commit()
+        run = await self.get_run(pdf_id, job_description_id)
+        if run is None:
+            raise ValueError(f"Pipeline run of PDF with id {pdf_id} not found.")
+        return run
+
+    async def update_run(
+        self,
+        run: PipelineRunModel,
+        stage: PipelineStage,
+        **values: Any,
+    ) -> PipelineRunModel:
+        """
+        Record the progress of a run.
+
+        :param run: the PipelineRunModel to update.
+        :param stage: the last completed stage.
+        :param values: the other columns to update, e.g. text_id.
+        :return: the updated PipelineRunModel.
+        """
+        await self.session.execute(
+            update(PipelineRunModel)
+            .where(PipelineRunModel.id == run.id)
+            .values(
+                stage=stage.value,
+                updated_date=pendulum.now("UTC").naive(),
+                **values,
+            ),
+        )
+        await self.session.commit()
+        await self.session.refresh(run)
+        logging.info(f"Pipeline run {run.id} of PDF ID {run.pdf_id} is {stage.value}")
+        return run
+
+    async def reset_scored(self, job_description_id: int) -> None:
+        """
+        Record that the scores of the runs of a job description are outdated.
+
+        The scored runs are evaluated again, so that their PDFs are scored
+        again. It does not commit: it is called by `WeightProfileDAO` before
+        committing the new weights.
+
+        :param job_description_id: ID of the job description.
+        """
+        await self.session.execute(
+            update(PipelineRunModel)
+            .where(
+                PipelineRunModel.job_description_id == job_description_id,
+                PipelineRunModel.stage == PipelineStage.SCORED.value,
+            )
+            .values(
+                stage=PipelineStage.EVALUATED.value,
+                updated_date=pendulum.now("UTC").naive(),
+            ),
+        )
+
+    async def mark_scored(self, job_description_id: int, pdf_ids: List[int]) -> None:
+        """
+        Record that the evaluated runs of some PDFs are scored.
+
+        :param job_description_id: ID of the job description.
+        :param pdf_ids: IDs of the scored PDFs.
+        """
+        await self.session.execute(
+            update(PipelineRunModel)
+            .where(
+                PipelineRunModel.job_description_id == job_description_id,
+                # A single array parameter, whatever the number of PDFs
+                PipelineRunModel.pdf_id == any_(cast(pdf_ids, ARRAY(Integer))),
+                PipelineRunModel.stage == PipelineStage.EVALUATED.value,
+            )
+            .values(
+                stage=PipelineStage.SCORED.value,
+                updated_date=pendulum.now("UTC").naive(),
+            ),
+        )
+        await self.session.commit()
@@ -1,11 +1,13 @@
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cv_copilot.db.dao.leaderboard import LeaderboardDAO
 from cv_copilot.db.models.scores import ScoreModel
+from cv_copilot.db.pagination import Cursor, paginate
 
 
 class ScoreDAO:
@@ -38,6 +40,37 @@ class ScoreDAO:
         )
         return result.scalar()
 
+    async def get_scores_by_job_description_id(
+        self,
+        job_description_id: int,
+        limit: int,
+        cursor: Optional[Cursor] = None,
+    ) -> List[ScoreModel]:
+        """
+        Get the scores of a job description with cursor pagination.
+
+        The scores are ordered by recency.
+
+        :param job_description_id: ID of the job description.
+        :param limit: maximum number of scores to return.
+        :param cursor: position of the last score of the previous page.
+
+        :return: list of ScoreModel.
+        """
+
+        result = await self.session.execute(
+            paginate(
+                select(ScoreModel).where(
+                    ScoreModel.job_description_id == job_description_id,
+                ),
+                ScoreModel.created_date,
+                ScoreModel.id,
+                limit=limit,
+                cursor=cursor,
+            ),
+        )
+        return list(result.scalars().all())
+
     async def save_score(
         self,
         pdf_id: int,
@@ -46,7 +79,7 @@ class ScoreDAO:
         score: float,
     ) -> Optional[ScoreModel]:
         """
-        Save a new score.
+        Save a new score, and update the leaderboard of the job description.
 
         :param pdf_id: ID of the pdf.
         :param job_description_id: ID of the job description.
@@ -64,6 +97,10 @@ class ScoreDAO:
             )
 
             self.session.add(new_score)
+            await LeaderboardDAO(self.session).update_scores(
+                job_description_id,
+                {pdf_id: score},
+            )
             await self.session.commit()
             await self.session.refresh(new_score)
             logging.info(f"Score saved with id {new_score.id}")
@@ -73,3 +110,43 @@ class ScoreDAO:
         except Exception as e:
             logging.error(f"Error uploading PDF: {e}")
             raise HTTPException(status_code=500, detail=str(e)) from e
+
+    async def save_scores(
+        self,
+        job_description_id: int,
+        parsed_job_description_id: int,
+        scores: Dict[int, float],
+    ) -> List[ScoreModel]:
+        """
+        Save the scores of many PDFs in a single INSERT ... RETURNING.
+
+        The leaderboard of the job description is updated in the same
+        transaction.
+
+        :param job_description_id: ID of the job description.
+        :param parsed_job_description_id: ID of the parsed job description.
+        :param scores: the score of each PDF, by PDF ID.
+
+        :return: list of the saved ScoreModel, in the order of the scores.
+        """
+        if not scores:
+            return []
+        result = await self.session.execute(
+            insert(ScoreModel).returning(ScoreModel, sort_by_parameter_order=True),
+            [
+                {
+                    "pdf_id": pdf_id,
+                    "job_description_id": job_description_id,
+                    "parsed_job_description_id": parsed_job_description_id,
+                    "score": score,
+                }
+                for pdf_id, score in scores.items()
+            ],
+        )
+        new_scores = list(result.scalars().all())
+        await LeaderboardDAO(self.session).update_scores(job_description_id, scores)
+        await self.session.commit()
+        logging.info(
+            f"Saved {len(new_scores)} scores for job description {job_description_id}",
+        )
+        return new_scores
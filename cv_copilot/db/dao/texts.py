@@ -1,11 +1,15 @@
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import String, column, func, select, true, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import NullType
 
+from cv_copilot.db.models.pdfs import PDFModel
 from cv_copilot.db.models.texts import ParsedTextModel, TextModel
 from cv_copilot.services.llm.models.skills import SkillsExtract
+from cv_copilot.services.scorer.batch import SKILL_GROUPS, GroupMatches
 
 
 class TextDAO:
@@ -30,16 +34,56 @@ class TextDAO:
             logging.error(f"Text for PDF with ID {pdf_id} not found.")
         return image_text
 
-    async def save_text(self, pdf_id: int, text: str) -> TextModel:
+    async def get_text(self, text_id: int) -> Optional[TextModel]:
+        """
+        Retrieve a text by its ID.
+
+        :param text_id: ID of the text.
+        :return: TextModel if found, else None.
+        """
+        result = await self.session.execute(
+            select(TextModel).where(TextModel.id == text_id),
+        )
+        return result.scalar_one_or_none()
+
+    async def get_text_by_content_hash(self, content_hash: str) -> Optional[TextModel]:
+        """
+        Retrieve the latest complete text of any PDF with the given content.
+
+        Texts with pages that failed OCR are skipped, see `TextModel.complete`.
+
+        :param content_hash: hex digest of the SHA-256 hash of the PDF.
+        :return: TextModel if a PDF with that content was processed, else None.
+        """
+        result = await self.session.execute(
+            select(TextModel)
+            .join(PDFModel, PDFModel.id == TextModel.pdf_id)
+            .where(
+                PDFModel.content_hash == content_hash,
+                TextModel.complete.is_(True),
+            )
+            .order_by(TextModel.id.desc())
+            .limit(1),
+        )
+        return result.scalars().first()
+
+    async def save_text(
+        self,
+        pdf_id: int,
+        text: str,
+        complete: bool = True,
+    ) -> TextModel:
         """
         Save text for a PDF.
 
         :param pdf_id: ID of the PDF to save text for.
         :param text: The text to save.
+        :param complete: False if some pages of the PDF are missing.
         """
         new_text = TextModel(
             pdf_id=pdf_id,
             text=text,
+            complete=complete,
         )
         self.session.add(new_text)
         await self.session.commit()
@@ -47,6 +91,34 @@ class TextDAO:
         logging.info(f"Text created with ID: {new_text.id}")
         return new_text
 
+    async def update_text(
+        self,
+        text_id: int,
+        text: str,
+        complete: bool = True,
+    ) -> TextModel:
+        """
+        Replace the text of a PDF, e.g. once its failed pages are converted.
+
+        :param text_id: ID of the text to update.
+        :param text: The new text.
+        :param complete: False if some pages of the PDF are still missing.
+        :return: The updated TextModel.
+        :raises ValueError: If the text is not found.
+        """
+        result = await self.session.execute(
+            update(TextModel)
+            .where(TextModel.id == text_id)
+            .values(text=text, complete=complete)
+            .returning(TextModel),
+        )
+        updated_text = result.scalar_one_or_none()
+        await self.session.commit()
+        if updated_text is None:
+            raise ValueError(f"Text with id {text_id} not found.")
+        logging.info(f"Text updated with ID: {text_id}")
+        return updated_text
+
 
 class ParsedTextDAO:
     """Class for accessing the 'parsed_texts' table."""
@@ -70,6 +142,20 @@ class ParsedTextDAO:
         )
         return result.scalar()
 
+    async def get_parsed_text(
+        self,
+        parsed_text_id: int,
+    ) -> Optional[ParsedTextModel]:
+        """Get a single parsed text by its primary key.
+
+        :param parsed_text_id: ID of the parsed text.
+        :return: ParsedTextModel if found, else None.
+        """
+        result = await self.session.execute(
+            select(ParsedTextModel).where(ParsedTextModel.id == parsed_text_id),
+        )
+        return result.scalar_one_or_none()
+
     async def get_parsed_text_by_pdf_id_and_job_id(
         self,
         pdf_id: int,
@@ -89,6 +175,66 @@ class ParsedTextDAO:
         )
         return result.scalar()
 
+    async def get_latest_matches(
+        self,
+        job_description_id: int,
+    ) -> List[Tuple[int, List[GroupMatches]]]:
+        """Get the matches of the last evaluation of each PDF of a job description.
+
+        Only the names of the skills and their matches are read from the
+        evaluations, the database leaves out the rest of the parsed skills,
+        like the reasoning of each match.
+
+        :param job_description_id: ID of the job description.
+        :return: the ID of each PDF with the matches of each group of skills,
+            see `SKILL_GROUPS`.
+        """
+        latest_evaluations = (
+            select(ParsedTextModel.id)
+            .where(ParsedTextModel.job_description_id == job_description_id)
+            .distinct(ParsedTextModel.pdf_id)
+            .order_by(ParsedTextModel.pdf_id, ParsedTextModel.id.desc())
+        )
+        groups_matches = []
+        for importance, skill_type in SKILL_GROUPS:
+            skills = func.jsonb_each(
+                ParsedTextModel.parsed_skills[importance][skill_type],
+            ).table_valued(column("key", String), column("value", JSONB))
+            # Text arrays, which the driver decodes much faster than JSON, and
+            # already as lists: NullType skips the processing of ARRAY results.
+            groups_matches.append(
+                select(
+                    func.array_agg(skills.c.key, type_=NullType()),
+                    func.array_agg(skills.c.value["match"].astext, type_=NullType()),
+                ).lateral(),
+            )
+        statement = select(
+            ParsedTextModel.pdf_id,
+            *[
+                match_column
+                for group_matches in groups_matches
+                for match_column in group_matches.c
+            ],
+        ).select_from(ParsedTextModel)
+        for group_matches in groups_matches:
+            statement = statement.join(group_matches, true())
+        result = await self.session.execute(
+            statement.where(ParsedTextModel.id.in_(latest_evaluations)).order_by(
+                ParsedTextModel.pdf_id,
+            ),
+        )
+        return [
+            (
+                pdf_id,
+                # Groups of skills that are missing or empty have NULL arrays
+                [
+                    (skill_names or [], matches or [])
+                    for skill_names, matches in zip(arrays[::2], arrays[1::2])
+                ],
+            )
+            for pdf_id, *arrays in result.all()
+        ]
+
     async def save_parsed_text(
         self,
         text: TextModel,
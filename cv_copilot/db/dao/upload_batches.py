@@ -0,0 +1,95 @@
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.db.models.pipeline_runs import PipelineRunModel, PipelineStage
+from cv_copilot.db.models.upload_batches import UploadBatchModel
+
+
+class UploadBatchDAO:
+    """Class for accessing the 'upload_batches' table."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_batch(
+        self,
+        job_id: int,
+        pdfs: Sequence[Tuple[str, str]],
+    ) -> Tuple[UploadBatchModel, List[int]]:
+        """
+        Add a batch and its PDFs, in one transaction.
+
+        The content of the PDFs must already be stored, see
+        `PDFDAO.store_blob`: it is committed with the batch.
+
+        :param job_id: ID of the job description of the PDFs.
+        :param pdfs: the name and the content hash of each PDF.
+        :return: the batch, and the IDs of its PDFs in the same order.
+        """
+        batch = UploadBatchModel(job_id=job_id, pdf_count=len(pdfs))
+        self.session.add(batch)
+        await self.session.flush()
+        pdf_ids: List[int] = []
+        if pdfs:
+            pdf_ids = list(
+                (
+                    await self.session.scalars(
+                        insert(PDFModel).returning(
+                            PDFModel.id,
+                            sort_by_parameter_order=True,
+                        ),
+                        [
+                            {
+                                "name": name,
+                                "job_id": job_id,
+                                "content_hash": content_hash,
+                                "batch_id": batch.id,
+                                "created_date": batch.created_date,
+                            }
+                            for name, content_hash in pdfs
+                        ],
+                    )
+                ).all(),
+            )
+        await self.session.commit()
+        return batch, pdf_ids
+
+    async def get_batch(self, batch_id: int) -> Optional[UploadBatchModel]:
+        """
+        Get a batch by its ID.
+
+        :param batch_id: ID of the batch.
+        :return: UploadBatchModel if found, else None.
+        """
+        return await self.session.get(UploadBatchModel, batch_id)
+
+    async def get_pdf_stages(self, batch_id: int) -> List[Tuple[int, str, bool]]:
+        """
+        Get the stage of the pipeline run of each PDF of a batch.
+
+        :param batch_id: ID of the batch.
+        :return: the ID of each PDF with the last stage it completed for its
+            job description, PENDING if it was not processed yet, and whether
+            it is evaluated. A PDF with pages that failed OCR is evaluated
+            but stays RASTERIZED.
+        """
+        result = await self.session.execute(
+            select(
+                PDFModel.id,
+                func.coalesce(PipelineRunModel.stage, PipelineStage.PENDING.value),
+                PipelineRunModel.parsed_text_id.is_not(None),
+            )
+            .outerjoin(
+                PipelineRunModel,
+                and_(
+                    PipelineRunModel.pdf_id == PDFModel.id,
+                    PipelineRunModel.job_description_id == PDFModel.job_id,
+                ),
+            )
+            .where(PDFModel.batch_id == batch_id)
+            .order_by(PDFModel.id),
+        )
+        return [(pdf_id, stage, evaluated) for pdf_id, stage, evaluated in result.all()]
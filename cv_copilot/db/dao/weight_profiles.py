@@ -0,0 +1,86 @@
+import logging
+from typing import Optional
+
+import pendulum
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.dao.leaderboard import LeaderboardDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.models.weight_profiles import WeightProfileModel
+from cv_copilot.services.scorer.weights import ScoringWeights
+
+
+class WeightProfileDAO:
+    """Class for accessing the 'weight_profiles' table."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_weight_profile(
+        self,
+        job_description_id: int,
+    ) -> Optional[WeightProfileModel]:
+        """
+        Get the weight profile of a job description.
+
+        :param job_description_id: ID of the job description.
+        :return: WeightProfileModel if the job description has one, else None.
+        """
+        result = await self.session.execute(
+            select(WeightProfileModel).where(
+                WeightProfileModel.job_description_id == job_description_id,
+            ),
+        )
+        return result.scalar_one_or_none()
+
+    async def get_weights(self, job_description_id: int) -> ScoringWeights:
+        """
+        Get the weights to score the CVs of a job description with.
+
+        :param job_description_id: ID of the job description.
+        :return: the weights of its profile, the default ones if it has none.
+        """
+        weight_profile = await self.get_weight_profile(job_description_id)
+        if weight_profile is None:
+            return ScoringWeights()
+        return ScoringWeights.model_validate(weight_profile.weights)
+
+    async def save_weight_profile(
+        self,
+        job_description_id: int,
+        weights: ScoringWeights,
+    ) -> WeightProfileModel:
+        """
+        Create or replace the weight profile of a job description.
+
+        The scores computed with the previous weights are outdated: in the
+        same transaction, the scored pipeline runs of the job description
+        go back to evaluated, and its leaderboard is cleared.
+
+        :param job_description_id: ID of the job description.
+        :param weights: the new weights.
+        :return: the saved WeightProfileModel.
+        """
+        statement = insert(WeightProfileModel).values(
+            job_description_id=job_description_id,
+            weights=weights.model_dump(),
+        )
+        result = await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[WeightProfileModel.job_description_id],
+                set_={
+                    "weights": statement.excluded.weights,
+                    "updated_date": pendulum.now("UTC").naive(),
+                },
+            )
+            .returning(WeightProfileModel)
+            .execution_options(populate_existing=True),
+        )
+        weight_profile = result.scalar_one()
+        await PipelineRunDAO(self.session).reset_scored(job_description_id)
+        await LeaderboardDAO(self.session).clear(job_description_id)
+        await self.session.commit()
+        logging.info(f"Saved weight profile of job description {job_description_id}")
+        return weight_profile
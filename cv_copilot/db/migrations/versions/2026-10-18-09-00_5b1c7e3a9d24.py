@@ -0,0 +1,66 @@
+"""Store the content of PDFs once per SHA-256 hash
+
+Revision ID: 5b1c7e3a9d24
+Revises: 2410a61e112e
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, DateTime, Integer, String, text
+from sqlalchemy.dialects.postgresql import BYTEA
+
+# revision identifiers, used by Alembic.
+revision = "5b1c7e3a9d24"
+down_revision = "2410a61e112e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pdf_blobs",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("content_hash", String(length=64), nullable=False, unique=True),
+        Column("file", BYTEA, nullable=True),
+        Column("size", Integer, nullable=False),
+        Column(
+            "created_date",
+            DateTime,
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.add_column("pdfs", Column("content_hash", String(length=64), nullable=True))
+
+    # Move the content of the existing PDFs to the blob store.
+    op.execute(
+        "UPDATE pdfs SET content_hash = encode(sha256(file), 'hex') "
+        "WHERE file IS NOT NULL",
+    )
+    op.execute(
+        "INSERT INTO pdf_blobs (content_hash, file, size) "
+        "SELECT DISTINCT ON (content_hash) content_hash, file, length(file) "
+        "FROM pdfs WHERE content_hash IS NOT NULL",
+    )
+
+    op.create_foreign_key(
+        "pdfs_content_hash_fkey",
+        "pdfs",
+        "pdf_blobs",
+        ["content_hash"],
+        ["content_hash"],
+    )
+    op.create_index("ix_pdfs_content_hash", "pdfs", ["content_hash"])
+    op.drop_column("pdfs", "file")
+
+
+def downgrade() -> None:
+    op.add_column("pdfs", Column("file", BYTEA, nullable=True))
+    op.execute(
+        "UPDATE pdfs SET file = pdf_blobs.file FROM pdf_blobs "
+        "WHERE pdfs.content_hash = pdf_blobs.content_hash",
+    )
+    op.drop_index("ix_pdfs_content_hash", table_name="pdfs")
+    op.drop_constraint("pdfs_content_hash_fkey", "pdfs", type_="foreignkey")
+    op.drop_column("pdfs", "content_hash")
+    op.drop_table("pdf_blobs")
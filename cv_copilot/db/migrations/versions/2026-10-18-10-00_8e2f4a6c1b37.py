@@ -0,0 +1,38 @@
+"""Store page images as raw JPEG bytes instead of base64 text
+
+Revision ID: 8e2f4a6c1b37
+Revises: 5b1c7e3a9d24
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, Text
+from sqlalchemy.dialects.postgresql import BYTEA
+
+# revision identifiers, used by Alembic.
+revision = "8e2f4a6c1b37"
+down_revision = "5b1c7e3a9d24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("images", Column("file", BYTEA, nullable=True))
+    # Strip the optional "data:image/jpeg;base64," prefix before decoding.
+    op.execute(
+        "UPDATE images SET file = "
+        "decode(regexp_replace(encoded_image, '^data:[^,]*,', ''), 'base64')",
+    )
+    op.alter_column("images", "file", nullable=False)
+    op.drop_column("images", "encoded_image")
+
+
+def downgrade() -> None:
+    op.add_column("images", Column("encoded_image", Text, nullable=True))
+    # encode() wraps its output every 76 characters.
+    op.execute(
+        "UPDATE images SET encoded_image = "
+        "replace(encode(file, 'base64'), E'\\n', '')",
+    )
+    op.alter_column("images", "encoded_image", nullable=False)
+    op.drop_column("images", "file")
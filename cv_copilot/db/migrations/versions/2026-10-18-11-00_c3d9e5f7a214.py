@@ -0,0 +1,29 @@
+"""Store PDFs and page images in a blob storage
+
+Revision ID: c3d9e5f7a214
+Revises: 8e2f4a6c1b37
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, String
+
+# revision identifiers, used by Alembic.
+revision = "c3d9e5f7a214"
+down_revision = "8e2f4a6c1b37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("pdf_blobs", Column("storage_key", String(length=200), nullable=True))
+    op.add_column("images", Column("storage_key", String(length=200), nullable=True))
+    op.alter_column("images", "file", nullable=True)
+
+
+def downgrade() -> None:
+    # Images in the blob storage have no content in the database anymore.
+    op.execute("DELETE FROM images WHERE file IS NULL")
+    op.alter_column("images", "file", nullable=False)
+    op.drop_column("images", "storage_key")
+    op.drop_column("pdf_blobs", "storage_key")
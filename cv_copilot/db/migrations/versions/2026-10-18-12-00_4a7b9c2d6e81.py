@@ -0,0 +1,38 @@
+"""Add indexes for keyset pagination of PDFs, job descriptions and scores
+
+Revision ID: 4a7b9c2d6e81
+Revises: c3d9e5f7a214
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4a7b9c2d6e81"
+down_revision = "c3d9e5f7a214"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_pdfs_job_id_created_date_id",
+        "pdfs",
+        ["job_id", "created_date", "id"],
+    )
+    op.create_index(
+        "ix_job_descriptions_created_date_id",
+        "job_descriptions",
+        ["created_date", "id"],
+    )
+    op.create_index(
+        "ix_scores_job_description_id_created_date_id",
+        "scores",
+        ["job_description_id", "created_date", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scores_job_description_id_created_date_id", table_name="scores")
+    op.drop_index("ix_job_descriptions_created_date_id", table_name="job_descriptions")
+    op.drop_index("ix_pdfs_job_id_created_date_id", table_name="pdfs")
@@ -0,0 +1,56 @@
+"""Add indexes for foreign keys and DAO lookups
+
+Revision ID: e6f1a3b5c7d9
+Revises: 4a7b9c2d6e81
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e6f1a3b5c7d9"
+down_revision = "4a7b9c2d6e81"
+branch_labels = None
+depends_on = None
+
+# (index, table, columns); foreign keys that are the leading column of
+# another index (pdfs.job_id, scores.pdf_id, scores.job_description_id) are
+# already covered.
+INDEXES = (
+    ("ix_images_pdf_id", "images", ["pdf_id"]),
+    ("ix_images_job_id", "images", ["job_id"]),
+    ("ix_texts_pdf_id", "texts", ["pdf_id"]),
+    (
+        "ix_parsed_texts_pdf_id_job_description_id",
+        "parsed_texts",
+        ["pdf_id", "job_description_id"],
+    ),
+    ("ix_parsed_texts_job_description_id", "parsed_texts", ["job_description_id"]),
+    ("ix_parsed_texts_text_id", "parsed_texts", ["text_id"]),
+    (
+        "ix_parsed_job_descriptions_job_description_id",
+        "parsed_job_descriptions",
+        ["job_description_id"],
+    ),
+    (
+        "ix_scores_pdf_id_job_description_id_id",
+        "scores",
+        ["pdf_id", "job_description_id", "id"],
+    ),
+    (
+        "ix_scores_parsed_job_description_id",
+        "scores",
+        ["parsed_job_description_id"],
+    ),
+    ("ix_pdfs_name", "pdfs", ["name"]),
+)
+
+
+def upgrade() -> None:
+    for index_name, table_name, columns in INDEXES:
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,72 @@
+"""Add pipeline runs and the text of each page image
+
+Revision ID: 7d2e8f4a1c63
+Revises: e6f1a3b5c7d9
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+
+# revision identifiers, used by Alembic.
+revision = "7d2e8f4a1c63"
+down_revision = "e6f1a3b5c7d9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("images", Column("page_number", Integer, nullable=True))
+    op.add_column("images", Column("text", Text, nullable=True))
+
+    op.create_table(
+        "pipeline_runs",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("pdf_id", Integer, ForeignKey("pdfs.id"), nullable=False),
+        Column(
+            "job_description_id",
+            Integer,
+            ForeignKey("job_descriptions.id"),
+            nullable=False,
+        ),
+        Column("stage", String(length=20), nullable=False),
+        Column("text_id", Integer, ForeignKey("texts.id"), nullable=True),
+        Column(
+            "parsed_text_id",
+            Integer,
+            ForeignKey("parsed_texts.id"),
+            nullable=True,
+        ),
+        Column("created_date", DateTime, nullable=False),
+        Column("updated_date", DateTime, nullable=True),
+        UniqueConstraint(
+            "pdf_id",
+            "job_description_id",
+            name="uq_pipeline_runs_pdf_id_job_description_id",
+        ),
+    )
+    op.create_index(
+        "ix_pipeline_runs_job_description_id",
+        "pipeline_runs",
+        ["job_description_id"],
+    )
+    op.create_index("ix_pipeline_runs_text_id", "pipeline_runs", ["text_id"])
+    op.create_index(
+        "ix_pipeline_runs_parsed_text_id",
+        "pipeline_runs",
+        ["parsed_text_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pipeline_runs")
+    op.drop_column("images", "text")
+    op.drop_column("images", "page_number")
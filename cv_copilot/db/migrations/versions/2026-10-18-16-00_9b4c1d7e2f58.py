@@ -0,0 +1,37 @@
+"""Add the weight profiles of the job descriptions
+
+Revision ID: 9b4c1d7e2f58
+Revises: 7d2e8f4a1c63
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = "9b4c1d7e2f58"
+down_revision = "7d2e8f4a1c63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "weight_profiles",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column(
+            "job_description_id",
+            Integer,
+            ForeignKey("job_descriptions.id"),
+            nullable=False,
+            unique=True,
+        ),
+        Column("weights", JSONB, nullable=False),
+        Column("created_date", DateTime, nullable=False),
+        Column("updated_date", DateTime, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("weight_profiles")
@@ -0,0 +1,52 @@
+"""Add the leaderboard of the job descriptions
+
+Revision ID: 3f8a2c6d9e14
+Revises: 9b4c1d7e2f58
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, UniqueConstraint
+
+# revision identifiers, used by Alembic.
+revision = "3f8a2c6d9e14"
+down_revision = "9b4c1d7e2f58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leaderboard",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("pdf_id", Integer, ForeignKey("pdfs.id"), nullable=False),
+        Column(
+            "job_description_id",
+            Integer,
+            ForeignKey("job_descriptions.id"),
+            nullable=False,
+        ),
+        Column("score", Float, nullable=False),
+        Column("updated_date", DateTime, nullable=False),
+        UniqueConstraint(
+            "pdf_id",
+            "job_description_id",
+            name="uq_leaderboard_pdf_id_job_description_id",
+        ),
+    )
+    op.create_index(
+        "ix_leaderboard_job_description_id_score_pdf_id",
+        "leaderboard",
+        ["job_description_id", "score", "pdf_id"],
+    )
+    # The last score of each PDF
+    op.execute(
+        "INSERT INTO leaderboard (pdf_id, job_description_id, score, updated_date) "
+        "SELECT DISTINCT ON (pdf_id, job_description_id) "
+        "pdf_id, job_description_id, score, created_date FROM scores "
+        "ORDER BY pdf_id, job_description_id, id DESC",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("leaderboard")
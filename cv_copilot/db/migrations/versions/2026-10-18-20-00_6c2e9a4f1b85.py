@@ -0,0 +1,42 @@
+"""Add the batches of uploaded PDFs
+
+Revision ID: 6c2e9a4f1b85
+Revises: 3f8a2c6d9e14
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+
+# revision identifiers, used by Alembic.
+revision = "6c2e9a4f1b85"
+down_revision = "3f8a2c6d9e14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_batches",
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("job_id", Integer, ForeignKey("job_descriptions.id"), nullable=False),
+        Column("pdf_count", Integer, nullable=False),
+        Column("created_date", DateTime, nullable=False),
+    )
+    op.create_index("ix_upload_batches_job_id", "upload_batches", ["job_id"])
+    op.add_column(
+        "pdfs",
+        Column(
+            "batch_id",
+            Integer,
+            ForeignKey("upload_batches.id"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_pdfs_batch_id", "pdfs", ["batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pdfs_batch_id", table_name="pdfs")
+    op.drop_column("pdfs", "batch_id")
+    op.drop_table("upload_batches")
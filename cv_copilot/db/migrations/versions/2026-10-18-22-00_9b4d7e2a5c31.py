@@ -0,0 +1,52 @@
+"""Add the content hash of the job descriptions
+
+Revision ID: 9b4d7e2a5c31
+Revises: 6c2e9a4f1b85
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, String
+
+# revision identifiers, used by Alembic.
+revision = "9b4d7e2a5c31"
+down_revision = "6c2e9a4f1b85"
+branch_labels = None
+depends_on = None
+
+# Same as `job_description_content_hash`: NFC, whitespace runs collapsed.
+# A description hashed differently is only parsed once more.
+CONTENT_HASH = (
+    "encode(sha256(convert_to(btrim(regexp_replace("
+    "normalize(description, NFC), '\\s+', ' ', 'g')), 'UTF8')), 'hex')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "job_descriptions",
+        Column("content_hash", String(length=64), nullable=True),
+    )
+    op.add_column(
+        "parsed_job_descriptions",
+        Column("content_hash", String(length=64), nullable=True),
+    )
+    op.execute(f"UPDATE job_descriptions SET content_hash = {CONTENT_HASH}")
+    # Only parses done after the last edit are known to match the description
+    op.execute(
+        """
+        UPDATE parsed_job_descriptions
+        SET content_hash = job_descriptions.content_hash
+        FROM job_descriptions
+        WHERE job_descriptions.id = parsed_job_descriptions.job_description_id
+        AND parsed_job_descriptions.created_date >= coalesce(
+            job_descriptions.updated_date,
+            job_descriptions.created_date
+        )
+        """,
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("parsed_job_descriptions", "content_hash")
+    op.drop_column("job_descriptions", "content_hash")
@@ -0,0 +1,59 @@
+"""Add the parsed job description of the pipeline runs
+
+Revision ID: 2e7c5a9d4b16
+Revises: 9b4d7e2a5c31
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Column, ForeignKey, Integer
+
+# revision identifiers, used by Alembic.
+revision = "2e7c5a9d4b16"
+down_revision = "9b4d7e2a5c31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "pipeline_runs",
+        Column(
+            "parsed_job_description_id",
+            Integer,
+            ForeignKey("parsed_job_descriptions.id"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_pipeline_runs_parsed_job_description_id",
+        "pipeline_runs",
+        ["parsed_job_description_id"],
+    )
+    # The last parse saved before the PDF was evaluated
+    op.execute(
+        """
+        UPDATE pipeline_runs
+        SET parsed_job_description_id = (
+            SELECT parsed_job_descriptions.id
+            FROM parsed_job_descriptions
+            WHERE parsed_job_descriptions.job_description_id
+                = pipeline_runs.job_description_id
+            AND parsed_job_descriptions.created_date <= coalesce(
+                pipeline_runs.updated_date,
+                pipeline_runs.created_date
+            )
+            ORDER BY parsed_job_descriptions.id DESC
+            LIMIT 1
+        )
+        WHERE pipeline_runs.parsed_text_id IS NOT NULL
+        """,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_pipeline_runs_parsed_job_description_id",
+        table_name="pipeline_runs",
+    )
+    op.drop_column("pipeline_runs", "parsed_job_description_id")
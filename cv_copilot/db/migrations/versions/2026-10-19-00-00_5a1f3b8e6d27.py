@@ -0,0 +1,35 @@
+"""Add the completeness of the texts
+
+Revision ID: 5a1f3b8e6d27
+Revises: 2e7c5a9d4b16
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import Boolean, Column, true
+
+# revision identifiers, used by Alembic.
+revision = "5a1f3b8e6d27"
+down_revision = "2e7c5a9d4b16"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "texts",
+        Column("complete", Boolean, nullable=False, server_default=true()),
+    )
+    # Texts of runs whose failed pages are not converted yet
+    op.execute(
+        """
+        UPDATE texts SET complete = false
+        WHERE id IN (
+            SELECT text_id FROM pipeline_runs WHERE stage = 'rasterized'
+        )
+        """,
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("texts", "complete")
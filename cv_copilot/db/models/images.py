@@ -1,8 +1,9 @@
 from datetime import datetime
 
 from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import BYTEA
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql.sqltypes import Integer, Text
+from sqlalchemy.sql.sqltypes import Integer, String, Text
 
 from cv_copilot.db.base import Base
 
@@ -10,22 +11,36 @@ from cv_copilot.db.base import Base
 class ImageModel(Base):
     """Model for storage of Images.
 
-    The images are single pages of a PDF that have been extracted and encoded as base64 strings.
+    The images are single pages of a PDF that have been rendered as JPEG.
+    They are stored as raw bytes and only encoded in base64 when they are
+    sent to the vision model. The bytes are either in the 'file' column or,
+    when a blob storage is configured, in the storage under 'storage_key'.
+    The text of the page is saved once it is converted, so that a page whose
+    conversion failed can be retried alone.
     """
 
     __tablename__ = "images"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    pdf_id: Mapped[int] = mapped_column(Integer, ForeignKey("pdfs.id"), nullable=False)
+    pdf_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("pdfs.id"),
+        nullable=False,
+        index=True,
+    )
     job_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("job_descriptions.id"),
         nullable=False,
+        index=True,
     )
-    encoded_image: Mapped[str] = mapped_column(
-        Text,  # Using Text type for base64 encoded image
-        nullable=False,
+    file: Mapped[bytes] = mapped_column(BYTEA, nullable=True)
+    storage_key: Mapped[str] = mapped_column(
+        String(length=200),  # noqa: WPS432
+        nullable=True,
     )
+    page_number: Mapped[int] = mapped_column(Integer, nullable=True)
+    text: Mapped[str] = mapped_column(Text, nullable=True)
     created_date: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
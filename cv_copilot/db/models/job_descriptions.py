@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.sqltypes import DateTime, String, Text
@@ -12,6 +12,10 @@ class JobDescriptionModel(Base):
     """Model for Job Descriptions."""
 
     __tablename__ = "job_descriptions"
+    # Keyset pagination of the job descriptions, see `paginate`
+    __table_args__ = (
+        Index("ix_job_descriptions_created_date_id", "created_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(
@@ -19,6 +23,11 @@ class JobDescriptionModel(Base):
         nullable=False,
     )
     description: Mapped[Text] = mapped_column(Text, nullable=False)
+    # Hash of the normalized description, see `job_description_content_hash`
+    content_hash: Mapped[str] = mapped_column(
+        String(length=64),  # noqa: WPS432
+        nullable=True,
+    )
     created_date: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
@@ -34,10 +43,18 @@ class JobDescriptionModel(Base):
     )
     parsed_text = relationship("ParsedTextModel", cascade="all, delete-orphan")
     scores = relationship("ScoreModel", cascade="all, delete-orphan")
+    pipeline_runs = relationship("PipelineRunModel", cascade="all, delete-orphan")
+    weight_profile = relationship("WeightProfileModel", cascade="all, delete-orphan")
+    leaderboard = relationship("LeaderboardEntryModel", cascade="all, delete-orphan")
+    upload_batches = relationship("UploadBatchModel", cascade="all, delete-orphan")
 
 
 class ParsedJobDescriptionModel(Base):
-    """Model for parsed job descriptions."""
+    """Model for parsed job descriptions.
+
+    A job description is parsed again only when its description changes:
+    the hash of the description that was parsed is kept with the skills.
+    """
 
     __tablename__ = "parsed_job_descriptions"
 
@@ -46,8 +63,14 @@ class ParsedJobDescriptionModel(Base):
         Integer,
         ForeignKey("job_descriptions.id"),
         nullable=False,
+        index=True,
     )
     parsed_skills: Mapped[JSONB] = mapped_column(JSONB, nullable=False)
+    # Hash of the description that was parsed, None if it is not known
+    content_hash: Mapped[str] = mapped_column(
+        String(length=64),  # noqa: WPS432
+        nullable=True,
+    )
     created_date: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cv_copilot.db.base import Base
+
+
+class LeaderboardEntryModel(Base):
+    """Model for the last score of a PDF in the ranking of a job description.
+
+    The entries are written with the scores, in the same transaction, so the
+    best PDFs of a job description are read from the index instead of
+    looking for the last score of each PDF.
+    """
+
+    __tablename__ = "leaderboard"
+    __table_args__ = (
+        UniqueConstraint(
+            "pdf_id",
+            "job_description_id",
+            name="uq_leaderboard_pdf_id_job_description_id",
+        ),
+        # Top-K of a job description, see `LeaderboardDAO.get_top`
+        Index(
+            "ix_leaderboard_job_description_id_score_pdf_id",
+            "job_description_id",
+            "score",
+            "pdf_id",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pdf_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("pdfs.id"),
+        nullable=False,
+    )
+    job_description_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("job_descriptions.id"),
+        nullable=False,
+    )
+    score: Mapped[float] = mapped_column(nullable=False)
+    updated_date: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from pydantic.networks import HttpUrl
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.dialects.postgresql import BYTEA
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.sqltypes import DateTime, Integer, String
@@ -9,26 +9,75 @@ from sqlalchemy.sql.sqltypes import DateTime, Integer, String
 from cv_copilot.db.base import Base
 
 
+class PDFBlobModel(Base):
+    """Model for the content of PDFs.
+
+    The content is stored once per distinct file, keyed by its SHA-256 hash,
+    so the same CV uploaded for several job descriptions is stored only once.
+    The content is either in the 'file' column or, when a blob storage is
+    configured, in the storage under 'storage_key'. The column is deferred:
+    it is only loaded when it is accessed, use `PDFDAO.get_pdf_file` to
+    fetch the content.
+    """
+
+    __tablename__ = "pdf_blobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(
+        String(length=64),  # noqa: WPS432
+        nullable=False,
+        unique=True,
+    )
+    file: Mapped[bytes] = mapped_column(BYTEA, nullable=True, deferred=True)
+    storage_key: Mapped[str] = mapped_column(
+        String(length=200),  # noqa: WPS432
+        nullable=True,
+    )
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_date: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+
 class PDFModel(Base):
     """Model for PDFs."""
 
     __tablename__ = "pdfs"
+    # Keyset pagination of the PDFs of a job description, see `paginate`
+    __table_args__ = (
+        Index("ix_pdfs_job_id_created_date_id", "job_id", "created_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(
         String(length=200),  # noqa: WPS432
         nullable=False,
+        index=True,
     )
     job_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("job_descriptions.id"),
         nullable=False,
     )
-    file: Mapped[bytes] = mapped_column(BYTEA, nullable=True)
+    content_hash: Mapped[str] = mapped_column(
+        String(length=64),  # noqa: WPS432
+        ForeignKey("pdf_blobs.content_hash"),
+        nullable=True,
+        index=True,
+    )
     s3_url: Mapped[HttpUrl] = mapped_column(
         String(length=2000),  # noqa: WPS432
         nullable=True,
     )
+    # The batch the PDF was uploaded with, None when uploaded alone
+    batch_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("upload_batches.id"),
+        nullable=True,
+        index=True,
+    )
     created_date: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
@@ -42,3 +91,5 @@ class PDFModel(Base):
     images = relationship("ImageModel", cascade="all, delete-orphan")
     scores = relationship("ScoreModel", cascade="all, delete-orphan")
     text = relationship("TextModel")
+    pipeline_runs = relationship("PipelineRunModel", cascade="all, delete-orphan")
+    leaderboard = relationship("LeaderboardEntryModel", cascade="all, delete-orphan")
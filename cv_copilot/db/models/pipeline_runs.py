@@ -0,0 +1,95 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cv_copilot.db.base import Base
+
+
+class PipelineStage(str, enum.Enum):  # noqa: WPS600
+    """Stages of the processing of a PDF for a job description, in order."""
+
+    PENDING = "pending"
+    # Every page that needs OCR is rendered and saved as an image
+    RASTERIZED = "rasterized"
+    # Every page has its text, the text of the PDF is saved
+    OCRD = "ocrd"
+    # The CV is evaluated against the job description
+    EVALUATED = "evaluated"
+    # The evaluation is scored
+    SCORED = "scored"
+
+
+PIPELINE_STAGES = list(PipelineStage)
+
+
+class PipelineRunModel(Base):
+    """Model for the progress of the processing of a PDF for a job description.
+
+    There is one run per PDF and job description. It records the last stage
+    that completed and the rows it produced, so that processing the PDF again
+    resumes from the first incomplete stage instead of starting over.
+    """
+
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        UniqueConstraint(
+            "pdf_id",
+            "job_description_id",
+            name="uq_pipeline_runs_pdf_id_job_description_id",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pdf_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("pdfs.id"),
+        nullable=False,
+    )
+    job_description_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("job_descriptions.id"),
+        nullable=False,
+        index=True,
+    )
+    stage: Mapped[str] = mapped_column(
+        String(length=20),
+        nullable=False,
+        default=PipelineStage.PENDING.value,
+    )
+    text_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("texts.id"),
+        nullable=True,
+        index=True,
+    )
+    parsed_text_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("parsed_texts.id"),
+        nullable=True,
+        index=True,
+    )
+    # The parse of the job description the PDF was evaluated against
+    parsed_job_description_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("parsed_job_descriptions.id"),
+        nullable=True,
+        index=True,
+    )
+    created_date: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+    updated_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+    def has_reached(self, stage: PipelineStage) -> bool:
+        """
+        Check whether a stage of the run is completed.
+
+        :param stage: the stage to check.
+        :return: True if the run completed the stage, or a later one.
+        """
+        current_stage = PIPELINE_STAGES.index(PipelineStage(self.stage))
+        return current_stage >= PIPELINE_STAGES.index(stage)
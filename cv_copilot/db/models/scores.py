@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.sqltypes import DateTime
 
@@ -12,6 +12,21 @@ class ScoreModel(Base):
     """Model for Scores."""
 
     __tablename__ = "scores"
+    # Keyset pagination of the scores of a job description, see `paginate`
+    __table_args__ = (
+        Index(
+            "ix_scores_job_description_id_created_date_id",
+            "job_description_id",
+            "created_date",
+            "id",
+        ),
+        Index(
+            "ix_scores_pdf_id_job_description_id_id",
+            "pdf_id",
+            "job_description_id",
+            "id",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     pdf_id: Mapped[int] = mapped_column(Integer, ForeignKey("pdfs.id"), nullable=False)
@@ -24,6 +39,7 @@ class ScoreModel(Base):
         Integer,
         ForeignKey("parsed_job_descriptions.id"),
         nullable=False,
+        index=True,
     )
     score: Mapped[float] = mapped_column(nullable=False)
     created_date: Mapped[datetime] = mapped_column(
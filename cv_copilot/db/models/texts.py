@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,8 +13,15 @@ class TextModel(Base):
     __tablename__ = "texts"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    pdf_id: Mapped[int] = mapped_column(ForeignKey("pdfs.id"), nullable=False)
+    pdf_id: Mapped[int] = mapped_column(
+        ForeignKey("pdfs.id"),
+        nullable=False,
+        index=True,
+    )
     text: Mapped[str] = mapped_column(Text, nullable=True)
+    # False while some pages of the PDF failed OCR and are missing from the
+    # text, such a text is not reused for other PDFs with the same content
+    complete: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     created_date = mapped_column(
         DateTime,
         nullable=False,
@@ -29,17 +36,26 @@ class ParsedTextModel(Base):
     """Model for the match between the Job description and the CV."""
 
     __tablename__ = "parsed_texts"
+    __table_args__ = (
+        Index(
+            "ix_parsed_texts_pdf_id_job_description_id",
+            "pdf_id",
+            "job_description_id",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     job_description_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("job_descriptions.id"),
         nullable=False,
+        index=True,
     )
     text_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("texts.id"),
         nullable=False,
+        index=True,
     )
     pdf_id: Mapped[int] = mapped_column(
         Integer,
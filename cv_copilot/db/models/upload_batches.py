@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cv_copilot.db.base import Base
+
+
+class UploadBatchModel(Base):
+    """Model for PDFs uploaded together for a job description.
+
+    The PDFs of a batch reference it, so that the progress of their
+    processing is followed as a whole, see `UploadBatchDAO.get_pdf_stages`.
+    """
+
+    __tablename__ = "upload_batches"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("job_descriptions.id"),
+        nullable=False,
+        index=True,
+    )
+    pdf_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_date: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cv_copilot.db.base import Base
+
+
+class WeightProfileModel(Base):
+    """Model for the weights of the scores of a job description.
+
+    The weights are the fields of `ScoringWeights`. A job description
+    without a profile is scored with the default weights.
+    """
+
+    __tablename__ = "weight_profiles"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_description_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("job_descriptions.id"),
+        nullable=False,
+        unique=True,
+    )
+    weights: Mapped[JSONB] = mapped_column(JSONB, nullable=False)
+    created_date: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+    updated_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
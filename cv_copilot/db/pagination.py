@@ -0,0 +1,78 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Select, desc, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidCursorError(ValueError):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+
+class Cursor(NamedTuple):
+    """
+    Position in a list ordered by recency, most recent first.
+
+    Lists are ordered by (created_date, id), so the position is the key of
+    the last item of a page. Unlike an offset, it stays valid when items are
+    inserted, and the next page is read from the index instead of scanning
+    and skipping the previous ones.
+    """
+
+    created_date: datetime
+    row_id: int
+
+    def encode(self) -> str:
+        """
+        Encode the cursor as an opaque string for the API.
+
+        :return: the encoded cursor.
+        """
+        position = json.dumps([self.created_date.isoformat(), self.row_id])
+        return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        """
+        Decode a cursor given to the API.
+
+        :param cursor: the encoded cursor.
+        :return: the cursor.
+        :raises InvalidCursorError: If the cursor is not one of ours.
+        """
+        try:
+            created_date, row_id = json.loads(base64.urlsafe_b64decode(cursor))
+            return cls(datetime.fromisoformat(created_date), int(row_id))
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(  # noqa: WPS211
+    query: Select,
+    created_date: InstrumentedAttribute[datetime],
+    row_id: InstrumentedAttribute[int],
+    limit: int,
+    cursor: Optional[Cursor] = None,
+    offset: int = 0,
+) -> Select:
+    """
+    Order a query by recency and select a page of it.
+
+    :param query: the query to paginate.
+    :param created_date: the creation date column of the listed model.
+    :param row_id: the primary key column of the listed model.
+    :param limit: the size of the page.
+    :param cursor: the position after which the page starts.
+    :param offset: deprecated, the number of items skipped when there is no
+        cursor.
+    :return: the query of the page.
+    """
+    query = query.order_by(desc(created_date), desc(row_id)).limit(limit)
+    if cursor is not None:
+        return query.where(
+            tuple_(created_date, row_id) < tuple_(cursor.created_date, cursor.row_id),
+        )
+    return query.offset(offset)
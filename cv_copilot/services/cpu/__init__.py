@@ -0,0 +1 @@
+"""Executor for CPU-bound work."""
@@ -0,0 +1,16 @@
+from starlette.requests import Request
+from taskiq import TaskiqDepends
+
+from cv_copilot.services.cpu.executor import CPUExecutor
+
+
+async def get_cpu_executor(
+    request: Request = TaskiqDepends(),
+) -> CPUExecutor:  # pragma: no cover
+    """
+    Returns the process pool used for CPU-bound work.
+
+    :param request: current request.
+    :returns: CPU executor.
+    """
+    return request.app.state.cpu_executor
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+T = TypeVar("T")
+
+CPU_TASKS_PENDING = Gauge(
+    "cpu_executor_pending_tasks",
+    "Tasks submitted to the CPU executor that have not completed yet.",
+    multiprocess_mode="livesum",
+)
+CPU_TASKS_REJECTED = Counter(
+    "cpu_executor_rejected_tasks",
+    "Tasks rejected because the CPU executor queue was full.",
+    ["task"],
+)
+CPU_TASK_WAIT_SECONDS = Histogram(
+    "cpu_executor_queue_wait_seconds",
+    "Time spent waiting for a free slot in the CPU executor.",
+    ["task"],
+)
+CPU_TASK_DURATION_SECONDS = Histogram(
+    "cpu_executor_task_duration_seconds",
+    "Time spent running a task in the CPU executor.",
+    ["task"],
+)
+
+
+class CPUExecutorBusyError(Exception):
+    """Exception raised when the CPU executor queue is full."""
+
+
+class CPUExecutor:
+    """
+    Process pool for CPU-bound work such as rasterizing PDFs.
+
+    Running this kind of work inside an ``async def`` freezes the event loop,
+    so it is shipped to worker processes instead. The number of tasks that can
+    be submitted at the same time is bounded: callers wait for a free slot
+    for at most ``queue_timeout`` seconds before the task is rejected.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        queue_timeout: Optional[float] = None,
+    ):
+        # "spawn" avoids forking a process that holds the event loop,
+        # open sockets and the database connection pool.
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._slots = asyncio.Semaphore(max_pending)
+        self.queue_timeout = queue_timeout
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a function in the process pool without blocking the event loop.
+
+        :param func: picklable, module-level function to run.
+        :param args: positional arguments for the function.
+        :return: the value returned by the function.
+        :raises CPUExecutorBusyError: if no slot frees up within the queue timeout.
+        """
+        task_name = getattr(func, "__name__", "unknown")
+        CPU_TASKS_PENDING.inc()
+        try:
+            queued_at = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError as e:
+                CPU_TASKS_REJECTED.labels(task=task_name).inc()
+                raise CPUExecutorBusyError(
+                    f"CPU executor is busy, could not schedule {task_name}",
+                ) from e
+            started_at = time.perf_counter()
+            CPU_TASK_WAIT_SECONDS.labels(task=task_name).observe(started_at - queued_at)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, func, *args)
+            finally:
+                self._slots.release()
+                duration = time.perf_counter() - started_at
+                CPU_TASK_DURATION_SECONDS.labels(task=task_name).observe(duration)
+                logging.info(f"CPU task {task_name} finished in {duration:.3f}s")
+        finally:
+            CPU_TASKS_PENDING.dec()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling tasks that did not start yet."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
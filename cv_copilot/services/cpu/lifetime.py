@@ -0,0 +1,26 @@
+from fastapi import FastAPI
+
+from cv_copilot.services.cpu.executor import CPUExecutor
+from cv_copilot.settings import settings
+
+
+def init_cpu_executor(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the process pool for CPU-bound work.
+
+    :param app: current fastapi application.
+    """
+    app.state.cpu_executor = CPUExecutor(
+        max_workers=settings.cpu_workers_count,
+        max_pending=settings.cpu_max_pending_tasks,
+        queue_timeout=settings.cpu_queue_timeout,
+    )
+
+
+def shutdown_cpu_executor(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops the process pool for CPU-bound work.
+
+    :param app: current FastAPI app.
+    """
+    app.state.cpu_executor.shutdown()
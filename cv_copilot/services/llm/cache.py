@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
+
+LLM_CACHE_REQUESTS = Counter(
+    "llm_cache_requests",
+    "Lookups in the LLM response cache, by tier and result.",
+    ["tier", "result"],
+)
+LLM_CACHE_EVICTIONS = Counter(
+    "llm_cache_evictions",
+    "Entries evicted from the in-process LLM response cache to make room.",
+)
+
+
+class LLMCache:
+    """
+    Two-tier cache of LLM responses.
+
+    Requests are sent with a fixed seed and temperature, so the same request
+    gives the same answer: re-processing a job description or a CV does not
+    need to call OpenAI again. Responses are kept in an in-process LRU,
+    bounded in entries and in size, backed by Redis so that they are shared
+    between workers and survive restarts. Both tiers expire entries after
+    ``ttl`` seconds.
+
+    Redis errors are logged and treated as a miss: the cache never fails
+    a request.
+    """
+
+    key_prefix = "llm-cache:"
+
+    def __init__(
+        self,
+        redis_pool: Optional[ConnectionPool],
+        ttl: int,
+        max_entries: int,
+        max_bytes: int,
+    ):
+        self.redis_pool = redis_pool
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (expiry time, value, size of the value in bytes)
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a request.
+
+        :param request: everything that determines the response: model,
+            messages, response model schema and sampling parameters.
+        :return: the cache key.
+        """
+        serialized = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response, from the in-process tier first.
+
+        :param key: the cache key of the request.
+        :return: the cached response, None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            LLM_CACHE_REQUESTS.labels(tier="local", result="hit").inc()
+            return entry[1]
+        if entry is not None:
+            self._remove(key)
+        LLM_CACHE_REQUESTS.labels(tier="local", result="miss").inc()
+
+        if self.redis_pool is None:
+            return None
+        try:
+            async with Redis(connection_pool=self.redis_pool) as redis:
+                cached = await redis.get(f"{self.key_prefix}{key}")
+        except RedisError as e:
+            logging.warning(f"Could not read LLM cache entry {key}: {e}")
+            return None
+        if cached is None:
+            LLM_CACHE_REQUESTS.labels(tier="redis", result="miss").inc()
+            return None
+        LLM_CACHE_REQUESTS.labels(tier="redis", result="hit").inc()
+        value = cached.decode("utf-8")
+        self._store(key, value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Cache a response in both tiers.
+
+        :param key: the cache key of the request.
+        :param value: the serialized response.
+        """
+        self._store(key, value)
+        if self.redis_pool is None:
+            return
+        try:
+            async with Redis(connection_pool=self.redis_pool) as redis:
+                await redis.set(f"{self.key_prefix}{key}", value, ex=self.ttl)
+        except RedisError as e:
+            logging.warning(f"Could not write LLM cache entry {key}: {e}")
+
+    def _store(self, key: str, value: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value, size)
+        self._size += size
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            LLM_CACHE_EVICTIONS.inc()
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from openai import AsyncOpenAI
+from starlette.requests import Request
+from taskiq import TaskiqDepends
+
+from cv_copilot.services.llm.cache import LLMCache
+
+
+async def get_openai_client(
+    request: Request = TaskiqDepends(),
+) -> AsyncOpenAI:  # pragma: no cover
+    """
+    Returns the OpenAI client shared by all LLM calls.
+
+    The client keeps a pool of HTTP connections alive, so it must
+    not be closed by the handlers using it.
+
+    :param request: current request.
+    :returns: OpenAI client patched with instructor.
+    """
+    return request.app.state.openai_client
+
+
+async def get_llm_cache(
+    request: Request = TaskiqDepends(),
+) -> Optional[LLMCache]:  # pragma: no cover
+    """
+    Returns the cache of LLM responses.
+
+    :param request: current request.
+    :returns: LLM response cache, None if it is disabled.
+    """
+    return request.app.state.llm_cache
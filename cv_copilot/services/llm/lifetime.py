@@ -0,0 +1,41 @@
+from fastapi import FastAPI
+
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.llm.utils import create_openai_client
+from cv_copilot.settings import settings
+
+
+def init_openai(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the OpenAI client shared by all LLM calls.
+
+    :param app: current fastapi application.
+    """
+    app.state.openai_client = create_openai_client()
+
+
+def init_llm_cache(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the cache of LLM responses.
+
+    It must be called after `init_redis`, as it uses the redis pool.
+
+    :param app: current fastapi application.
+    """
+    app.state.llm_cache = None
+    if settings.llm_cache_enabled:
+        app.state.llm_cache = LLMCache(
+            redis_pool=app.state.redis_pool,
+            ttl=settings.llm_cache_ttl,
+            max_entries=settings.llm_cache_local_max_entries,
+            max_bytes=settings.llm_cache_local_max_bytes,
+        )
+
+
+async def shutdown_openai(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Closes the OpenAI client and its connection pool.
+
+    :param app: current FastAPI app.
+    """
+    await app.state.openai_client.close()
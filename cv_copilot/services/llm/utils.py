@@ -1,20 +1,59 @@
+import base64
 import logging
-from typing import Union
+from typing import Any, Dict, Optional, Union
 
+import httpx
 import instructor
-from openai import OpenAI
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
+from cv_copilot.services.llm.cache import LLMCache
 from cv_copilot.services.llm.models.skills import EvaluationExtract, SkillsExtract
 from cv_copilot.settings import settings
 
 
-async def get_text_from_image(image: str) -> ChatCompletion:
+def create_openai_client() -> AsyncOpenAI:
+    """Create the OpenAI client shared by all LLM calls.
+
+    The client owns a pool of keep-alive HTTP connections, so it should be
+    created once per process (see `cv_copilot.services.llm.lifetime`) and
+    not once per request. It is patched with 'instructor' so that it accepts
+    a `response_model`; without it, the raw completion is returned.
+
+    :return: The OpenAI client.
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.openai_timeout,
+            connect=settings.openai_connect_timeout,
+        ),
+    )
+    client = AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        max_retries=settings.openai_max_retries,
+        http_client=http_client,
+    )
+    return instructor.patch(client)
+
+
+async def get_text_from_image(
+    client: AsyncOpenAI,
+    image: bytes,
+    cache: Optional[LLMCache] = None,
+) -> ChatCompletion:
     """Get text from an image using OpenAI's API.
 
-    :param image: The image file encoded in base64.
+    :param client: The shared OpenAI client.
+    :param image: The JPEG image, encoded in base64 only for the request.
+    :param cache: The LLM response cache, None to always call OpenAI.
     :return: The full response from the API.
     """
+    encoded_image = base64.b64encode(image).decode("utf-8")
     payload = {
         "model": settings.vision_model_name,
         "messages": [
@@ -27,7 +66,7 @@ async def get_text_from_image(image: str) -> ChatCompletion:
                     },
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{image}"},
+                        "image_url": {"url": f"data:image/jpeg;base64,{encoded_image}"},
                     },
                 ],
             },
@@ -35,52 +74,68 @@ async def get_text_from_image(image: str) -> ChatCompletion:
         "max_tokens": settings.max_tokens,
     }
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    return client.chat.completions.create(**payload)
+    if cache is None:
+        return await client.chat.completions.create(**payload)
+
+    key = cache.make_key(payload)
+    cached = await cache.get(key)
+    if cached is not None:
+        return ChatCompletion.model_validate_json(cached)
+    response = await client.chat.completions.create(**payload)
+    await cache.set(key, response.model_dump_json())
+    return response
 
 
 async def oa_async_request(
+    client: AsyncOpenAI,
     system_prompt: str,
     user_prompt: str,
     response_model: Union[SkillsExtract, EvaluationExtract],
+    cache: Optional[LLMCache] = None,
 ) -> Union[SkillsExtract, EvaluationExtract]:
     """Send a request to OpenAI asynchronously.
 
+    :param client: The shared OpenAI client.
     :param system_prompt: The system prompt to send to OpenAI.
     :param user_prompt: The user prompt to send to OpenAI.
     :param response_model: The response model to use.
-    :param is_async: Whether to use the async client or not.
+    :param cache: The LLM response cache, None to always call OpenAI.
     :return: The parsed skills formatted following the pydantic class.
+    :raises ValueError: If the response is empty.
     """
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
+    request: Dict[str, Any] = {
+        "model": settings.gpt4_model_name,
+        "messages": messages,
+        "max_tokens": settings.max_tokens,
+        "temperature": settings.temperature,
+    }
+    if settings.gpt4_model_name != "gpt-3.5-turbo-16k-0613":
+        request["response_format"] = settings.response_format
+        request["seed"] = settings.seed
 
-    if settings.gpt4_model_name == "gpt-3.5-turbo-16k-0613":
-        client = instructor.patch(OpenAI(api_key=settings.openai_api_key))
-        logging.info(f"Sending Job description messages to OpenAI: {messages}")
-        model = client.chat.completions.create(
-            model=settings.gpt4_model_name,
-            messages=messages,
-            response_model=response_model,  # instructor injection
-            max_tokens=settings.max_tokens,
-            temperature=settings.temperature,
-        )
-    else:
-        client = instructor.patch(OpenAI(api_key=settings.openai_api_key))
-        logging.info(f"Sending Job description messages to OpenAI: {messages}")
-        model = client.chat.completions.create(
-            model=settings.gpt4_model_name,
-            messages=messages,
-            response_model=response_model,  # instructor injection
-            response_format=settings.response_format,
-            seed=settings.seed,
-            max_tokens=settings.max_tokens,
-            temperature=settings.temperature,
+    key = None
+    if cache is not None:
+        key = cache.make_key(
+            {**request, "response_model": response_model.model_json_schema()},
         )
+        cached = await cache.get(key)
+        if cached is not None:
+            logging.info(f"Using cached response from OpenAI for {key}")
+            return response_model.model_validate_json(cached)
+
+    logging.info(f"Sending Job description messages to OpenAI: {messages}")
+    model = await client.chat.completions.create(
+        **request,
+        response_model=response_model,  # instructor injection
+    )
 
     logging.info(f"Received response from OpenAI: {model}")
     if not model:
         raise ValueError("No content received from OpenAI response")
+    if cache is not None and key is not None:
+        await cache.set(key, model.model_dump_json())
     return model
@@ -0,0 +1,279 @@
+import asyncio
+import functools
+import logging
+import zipfile
+import zlib
+from collections import Counter
+from pathlib import PurePosixPath
+from typing import (
+    IO,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from fastapi import UploadFile
+
+from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.upload_batches import UploadBatchDAO
+from cv_copilot.db.models.pipeline_runs import PipelineStage
+from cv_copilot.db.models.upload_batches import UploadBatchModel
+from cv_copilot.services.cpu.executor import CPUExecutor, CPUExecutorBusyError
+from cv_copilot.services.pdf.processing import PDFConversionError, count_pdf_file_pages
+from cv_copilot.services.pdf.upload import UploadTooLargeError, spool_pdf
+from cv_copilot.services.progress.publisher import ProgressEvent, ProgressStage
+from cv_copilot.settings import settings
+
+# Progress events ending the processing of a PDF
+DONE_EVENT_STAGES = (ProgressStage.EVALUATED, ProgressStage.FAILED)
+
+
+# Errors of the files of a ZIP archive that cannot be read: corrupt,
+# encrypted, or compressed with an unsupported method
+ARCHIVE_MEMBER_ERRORS = (
+    zipfile.BadZipFile,
+    RuntimeError,
+    NotImplementedError,
+    zlib.error,
+)
+
+
+class BatchTooLargeError(Exception):
+    """Exception raised when a batch upload has too many PDFs."""
+
+
+class UnreadableMemberError(Exception):
+    """Exception raised when a file of a ZIP archive cannot be read."""
+
+
+class BatchFile(NamedTuple):
+    """A PDF of a batch upload: an uploaded file or a file of a ZIP archive."""
+
+    name: str
+    # Reads the next chunk of the PDF, see `spool_pdf`
+    read_chunk: Callable[[int], Awaitable[bytes]]
+    size: Optional[int]
+
+
+class RejectedFile(NamedTuple):
+    """A file of a batch upload that was not added, with the reason."""
+
+    name: str
+    reason: str
+
+
+def is_zip_upload(upload: UploadFile) -> bool:
+    """
+    Check whether an uploaded file is a ZIP archive.
+
+    :param upload: the uploaded file.
+    :return: True for a ZIP archive.
+    """
+    return upload.content_type in {
+        "application/zip",
+        "application/x-zip-compressed",
+    } or (upload.filename or "").lower().endswith(".zip")
+
+
+def _is_batch_member(member: zipfile.ZipInfo) -> bool:
+    path = PurePosixPath(member.filename)
+    if member.is_dir() or path.suffix.lower() != ".pdf":
+        return False
+    return path.parts[0] != "__MACOSX"
+
+
+def count_batch_files(uploads: Sequence[UploadFile]) -> int:
+    """
+    Count the PDFs of a batch upload, from the directories of the archives.
+
+    :param uploads: the uploaded files.
+    :return: the number of PDFs, the archives that cannot be read count for
+        none.
+    """
+    file_count = 0
+    for upload in uploads:
+        if not is_zip_upload(upload):
+            file_count += 1
+            continue
+        try:
+            with zipfile.ZipFile(upload.file) as archive:
+                file_count += sum(map(_is_batch_member, archive.infolist()))
+        except zipfile.BadZipFile:
+            continue
+        finally:
+            upload.file.seek(0)
+    return file_count
+
+
+async def _read_member(member_file: IO[bytes], size: int) -> bytes:
+    try:
+        return await asyncio.to_thread(member_file.read, size)
+    except ARCHIVE_MEMBER_ERRORS as e:
+        raise UnreadableMemberError(str(e)) from e
+
+
+async def iter_batch_files(
+    uploads: Sequence[UploadFile],
+    rejected_files: List[RejectedFile],
+) -> AsyncIterator[BatchFile]:
+    """
+    List the PDFs of a batch upload, expanding the ZIP archives.
+
+    The files of a ZIP archive are decompressed in chunks, in a thread, as
+    they are read. Other files of an archive than PDFs are skipped, and an
+    archive or a file of an archive that cannot be opened is rejected. A
+    file that turns out to be corrupt while it is read raises
+    `UnreadableMemberError`.
+
+    :param uploads: the uploaded files.
+    :param rejected_files: the list the unreadable archives and files are
+        added to.
+    :yields: each PDF, to be read before the next one is yielded.
+    """
+    for upload in uploads:
+        try:
+            if not is_zip_upload(upload):
+                yield BatchFile(upload.filename or "", upload.read, upload.size)
+                continue
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile as e:
+                rejected_files.append(RejectedFile(upload.filename or "", str(e)))
+                continue
+            with archive:
+                for member in filter(_is_batch_member, archive.infolist()):
+                    name = PurePosixPath(member.filename).name
+                    try:
+                        member_file = archive.open(member)
+                    except ARCHIVE_MEMBER_ERRORS as e:
+                        rejected_files.append(RejectedFile(name, str(e)))
+                        continue
+                    with member_file:
+                        yield BatchFile(
+                            name,
+                            functools.partial(_read_member, member_file),
+                            member.file_size,
+                        )
+        finally:
+            await upload.close()
+
+
+async def ingest_pdf_batch(
+    uploads: Sequence[UploadFile],
+    job_id: int,
+    pdf_dao: PDFDAO,
+    upload_batch_dao: UploadBatchDAO,
+    cpu_executor: CPUExecutor,
+) -> Tuple[UploadBatchModel, List[int], List[RejectedFile]]:
+    """
+    Store the PDFs of a batch upload, and add the batch.
+
+    The PDFs are counted before anything is stored, then copied and stored
+    one at a time, like single uploads, see `spool_pdf_upload`: a PDF that
+    is too large, has too many pages, cannot be read, or cannot be counted
+    because the process pool is busy is rejected without failing the batch.
+    The stored PDFs are then added with the batch in one transaction, see
+    `UploadBatchDAO.create_batch`; if the batch fails before it is
+    committed, the files already added to the blob storage are deleted.
+
+    :param uploads: the uploaded PDFs and ZIP archives of PDFs.
+    :param job_id: ID of the job description of the PDFs.
+    :param pdf_dao: DAO for PDFs models.
+    :param upload_batch_dao: DAO for UploadBatch models.
+    :param cpu_executor: Process pool used to count the pages of the PDFs.
+    :return: the batch, the IDs of its PDFs, and the rejected files.
+    :raises BatchTooLargeError: If the batch has more than
+        `settings.max_batch_files` PDFs.
+    """
+    if count_batch_files(uploads) > settings.max_batch_files:
+        raise BatchTooLargeError(
+            f"The batch has more than {settings.max_batch_files} PDFs",
+        )
+    storage_keys: List[str] = []
+    try:
+        stored_files, rejected_files = await _ingest_pdf_batch(
+            uploads,
+            pdf_dao,
+            cpu_executor,
+            storage_keys,
+        )
+        batch, pdf_ids = await upload_batch_dao.create_batch(job_id, stored_files)
+    except Exception:
+        await pdf_dao.delete_stored_files(storage_keys)
+        raise
+    return batch, pdf_ids, rejected_files
+
+
+async def _ingest_pdf_batch(
+    uploads: Sequence[UploadFile],
+    pdf_dao: PDFDAO,
+    cpu_executor: CPUExecutor,
+    storage_keys: List[str],
+) -> Tuple[List[Tuple[str, str]], List[RejectedFile]]:
+    stored_files: List[Tuple[str, str]] = []
+    rejected_files: List[RejectedFile] = []
+    async for batch_file in iter_batch_files(uploads, rejected_files):
+        try:
+            async with spool_pdf(batch_file.read_chunk, batch_file.size) as spooled:
+                page_count = await cpu_executor.run(
+                    count_pdf_file_pages,
+                    str(spooled.path),
+                )
+                if page_count > settings.max_upload_pages:
+                    raise UploadTooLargeError(
+                        f"PDF has {page_count} pages, "
+                        f"the limit is {settings.max_upload_pages}",
+                    )
+                storage_key = await pdf_dao.store_blob(spooled)
+                if storage_key is not None:
+                    storage_keys.append(storage_key)
+        except (
+            UploadTooLargeError,
+            PDFConversionError,
+            UnreadableMemberError,
+            CPUExecutorBusyError,
+        ) as e:
+            logging.warning(f"Rejected {batch_file.name} of a batch upload: {e}")
+            rejected_files.append(RejectedFile(batch_file.name, str(e)))
+            continue
+        stored_files.append((batch_file.name, spooled.content_hash))
+    return stored_files, rejected_files
+
+
+def summarize_batch_progress(
+    pdf_stages: Sequence[Tuple[int, str]],
+    last_events: Sequence[Optional[ProgressEvent]],
+) -> Tuple[Dict[str, int], int]:
+    """
+    Count the PDFs of a batch by stage.
+
+    The last progress event of a PDF is more recent than the stage of its
+    pipeline run, which is only updated once a stage completes, except for
+    the scores, which are not reported as progress. A PDF is done once its
+    run has an evaluation, whatever its stage, or once its last event ends
+    the processing: the events expire, and a PDF with pages that failed OCR
+    is evaluated without leaving the RASTERIZED stage.
+
+    :param pdf_stages: the ID of each PDF with the stage of its pipeline
+        run and whether it is evaluated, see `UploadBatchDAO.get_pdf_stages`.
+    :param last_events: the last progress event of each PDF, None if it is
+        not known.
+    :return: the number of PDFs at each stage, and the number of PDFs whose
+        processing is done.
+    """
+    stages: Counter[str] = Counter()
+    done = 0
+    for (_, run_stage, evaluated), event in zip(pdf_stages, last_events):
+        if event is None or run_stage == PipelineStage.SCORED.value:
+            stages[run_stage] += 1
+        else:
+            stages[event.stage.value] += 1
+        if evaluated or (event is not None and event.stage in DONE_EVENT_STAGES):
+            done += 1
+    return dict(stages), done
@@ -1,48 +1,236 @@
-import base64
 import logging
+import subprocess  # noqa: S404
+import tempfile
+import unicodedata
 from io import BytesIO
-from typing import List
+from typing import List, Optional
 
 import pdf2image
+from PIL import Image
 
-from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.settings import RenderProfile
+
+# Unicode categories of characters that are never part of readable text:
+# control, private use, surrogate and unassigned code points.
+GARBAGE_CATEGORIES = frozenset(("Cc", "Co", "Cs", "Cn"))
+
+# Steps used to fit a page in the byte budget of adaptive render profiles:
+# the JPEG quality is lowered first, then the page is downscaled.
+MIN_JPEG_QUALITY = 40
+JPEG_QUALITY_STEP = 10
+DOWNSCALE_FACTOR = 0.8
+MIN_DIMENSION = 512
 
 
 class PDFConversionError(Exception):
     """Exception raised when a PDF cannot be converted to JPG."""
 
 
-def encode_pdf_pages(pdf: PDFModel, pdf_id: int) -> List[str]:
+def count_pdf_pages(pdf_file: bytes, pdf_id: int) -> int:
+    """
+    Counts the pages of a PDF file.
+
+    Like `render_pdf_pages`, it is meant to run in the CPU executor.
+
+    :param pdf_file: The content of the PDF file.
+    :param pdf_id: The ID of the PDF.
+    :return: The number of pages.
+    :raises PDFConversionError: If the PDF cannot be read.
+    """
+    try:
+        page_count = pdf2image.pdfinfo_from_bytes(pdf_file)["Pages"]
+    except Exception as e:
+        logging.error(f"Error in counting pages of PDF ID {pdf_id}: {e}")
+        raise PDFConversionError(f"Error in counting pages: {e}") from e
+    logging.info(f"PDF with ID {pdf_id} has {page_count} pages")
+    return page_count
+
+
+def count_pdf_file_pages(pdf_path: str) -> int:
+    """
+    Counts the pages of a PDF file on disk.
+
+    Used to check uploads without loading them in memory. Like
+    `count_pdf_pages`, it is meant to run in the CPU executor.
+
+    :param pdf_path: The path of the PDF file.
+    :return: The number of pages.
+    :raises PDFConversionError: If the PDF cannot be read.
     """
-    Converts each page of a PDF file to JPG images and encodes them in base64.
+    try:
+        return pdf2image.pdfinfo_from_path(pdf_path)["Pages"]
+    except Exception as e:
+        logging.error(f"Error in counting pages of PDF {pdf_path}: {e}")
+        raise PDFConversionError(f"Error in counting pages: {e}") from e
+
 
-    TODO: currently this function fetches the entire PDF
-    from the database. This is not necessary, we should only need the PDF file path
-    from the database and get the PDF file from storage (e.g. S3)
+def render_pdf_pages(
+    pdf_file: bytes,
+    pdf_id: int,
+    profile: RenderProfile,
+    page_numbers: Optional[List[int]] = None,
+) -> List[bytes]:
+    """
+    Converts each page of a PDF file to a JPG image.
 
-    :param pdf: The PDF file to convert to JPG.
+    The images are returned as raw JPEG bytes: base64 is only needed for the
+    vision model payload, and would make every page ~33% larger in memory
+    and in the database.
+
+    When `page_numbers` is given, only those pages (1-based) are converted,
+    in the given order.
+
+    This function is CPU-bound and blocking: it is meant to be run in the
+    CPU executor (see `cv_copilot.services.cpu`), not on the event loop.
+
+    The caller reads the content with `PDFDAO.get_pdf_file`, from the blob
+    storage when one is configured, or from the 'pdf_blobs' table.
+
+    :param pdf_file: The content of the PDF file to convert to JPG.
     :param pdf_id: The ID of the PDF to convert to JPG.
-    :return: encoded_images: List of base64 encoded images.
-    :raises ValueError: If the PDF file is None.
+    :param profile: The DPI, colour mode, size and quality of the images.
+    :param page_numbers: The pages to convert, all of them if None.
+    :return: rendered_images: List of JPEG images.
     :raises PDFConversionError: If the PDF cannot be converted to JPG.
     """
-    encoded_images = []
+    rendered_images = []
     try:
         logging.info(f"Converting PDF with ID {pdf_id} to JPG")
-        if pdf.file is None:
-            raise ValueError("PDF file is None")
-        logging.info(f"PDF file length: {len(pdf.file)}")
-        images = pdf2image.pdf2image.convert_from_bytes(pdf.file)
+        logging.info(f"PDF file length: {len(pdf_file)}")
+        if page_numbers is None:
+            images = pdf2image.pdf2image.convert_from_bytes(
+                pdf_file,
+                dpi=profile["dpi"],
+                grayscale=profile["grayscale"],
+            )
+        else:
+            images = [
+                image
+                for page_number in page_numbers
+                for image in pdf2image.pdf2image.convert_from_bytes(
+                    pdf_file,
+                    dpi=profile["dpi"],
+                    grayscale=profile["grayscale"],
+                    first_page=page_number,
+                    last_page=page_number,
+                )
+            ]
 
         for image in images:
-            buffer = BytesIO()
-            image.save(buffer, format="JPEG")
-            img_str = base64.b64encode(buffer.getvalue()).decode("utf-8")
-            encoded_images.append(img_str)
+            image.thumbnail((profile["max_dimension"], profile["max_dimension"]))
+            rendered_images.append(
+                encode_jpeg(image, profile["quality"], profile["max_page_bytes"]),
+            )
 
     except Exception as e:
         logging.error(f"Error in converting PDF to JPG: {e}")
         raise PDFConversionError(f"Error in converting PDF to JPG: {e}") from e
 
     logging.info(f"Converted PDF with ID {pdf_id} to JPG")
-    return encoded_images
+    return rendered_images
+
+
+def _save_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def encode_jpeg(
+    image: Image.Image,
+    quality: int,
+    max_bytes: Optional[int] = None,
+) -> bytes:
+    """
+    Saves an image as JPEG, optionally fitting it in a byte budget.
+
+    When `max_bytes` is given and the image is too large, the quality is
+    lowered down to `MIN_JPEG_QUALITY`, then the image is downscaled until
+    it fits or its shorter side reaches `MIN_DIMENSION`.
+
+    :param image: The image to save.
+    :param quality: The JPEG quality to start from.
+    :param max_bytes: The maximum size of the JPEG, unbounded if None.
+    :return: The JPEG image.
+    """
+    if image.mode not in {"RGB", "L"}:
+        image = image.convert("RGB")
+
+    jpeg = _save_jpeg(image, quality)
+    while max_bytes is not None and len(jpeg) > max_bytes:
+        if quality > MIN_JPEG_QUALITY:
+            quality = max(quality - JPEG_QUALITY_STEP, MIN_JPEG_QUALITY)
+        elif min(image.size) * DOWNSCALE_FACTOR >= MIN_DIMENSION:
+            image = image.resize(
+                (
+                    int(image.width * DOWNSCALE_FACTOR),
+                    int(image.height * DOWNSCALE_FACTOR),
+                ),
+            )
+        else:
+            logging.warning(f"Could not fit page in {max_bytes} bytes")
+            break
+        jpeg = _save_jpeg(image, quality)
+    return jpeg
+
+
+def extract_text_layer(pdf_file: bytes, pdf_id: int) -> List[str]:
+    """
+    Extracts the embedded text layer of each page of a PDF file.
+
+    PDFs exported from a word processor already contain their text, which
+    can be read locally in milliseconds instead of going through the vision
+    model. It uses `pdftotext` from poppler, which is already required by
+    pdf2image. Like `render_pdf_pages`, it is meant to run in the CPU executor.
+
+    :param pdf_file: The content of the PDF file.
+    :param pdf_id: The ID of the PDF.
+    :return: The text of each page, in page order.
+    :raises PDFConversionError: If the text layer cannot be extracted.
+    """
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_path:
+            pdf_path.write(pdf_file)
+            pdf_path.flush()
+            completed = subprocess.run(  # noqa: S603, S607
+                ["pdftotext", "-layout", "-enc", "UTF-8", pdf_path.name, "-"],
+                capture_output=True,
+                check=True,
+            )
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.error(f"Error in extracting text layer of PDF ID {pdf_id}: {e}")
+        raise PDFConversionError(f"Error in extracting text layer: {e}") from e
+
+    # pdftotext ends every page with a form feed.
+    pages = completed.stdout.decode("utf-8", errors="replace").split("\f")
+    if pages and not pages[-1].strip():
+        pages.pop()
+    logging.info(f"Extracted text layer of {len(pages)} pages for PDF ID {pdf_id}")
+    return pages
+
+
+def is_text_layer_usable(
+    page_text: str,
+    min_chars: int,
+    max_garbage_ratio: float,
+) -> bool:
+    """
+    Checks whether the text layer of a page can be used instead of OCR.
+
+    Scanned pages have no text layer at all, and PDFs with broken font
+    encodings produce replacement or control characters instead of text.
+
+    :param page_text: The text layer of the page.
+    :param min_chars: Minimum number of non-whitespace characters.
+    :param max_garbage_ratio: Maximum share of unreadable characters.
+    :return: True if the text layer can be used.
+    """
+    chars = [char for char in page_text if not char.isspace()]
+    if len(chars) < min_chars:
+        return False
+    garbage = sum(
+        1
+        for char in chars
+        if char == "\ufffd" or unicodedata.category(char) in GARBAGE_CATEGORIES
+    )
+    return garbage / len(chars) <= max_garbage_ratio
@@ -0,0 +1,87 @@
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple, Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+from cv_copilot.settings import settings
+
+
+class UploadTooLargeError(Exception):
+    """Exception raised when an uploaded PDF exceeds the size limit."""
+
+
+class SpooledPDF(NamedTuple):
+    """An uploaded PDF copied to a local file, with its hash and size."""
+
+    path: Path
+    content_hash: str
+    size: int
+
+
+@asynccontextmanager
+async def spool_pdf_upload(pdf_file: UploadFile) -> AsyncIterator[SpooledPDF]:
+    """
+    Copy an uploaded PDF to a temporary file, in chunks.
+
+    The SHA-256 hash of the file is computed while it is copied, and the copy
+    stops as soon as the file exceeds `settings.max_upload_bytes`, so that
+    a request only holds one chunk of the upload in memory. The temporary
+    file is deleted when the context exits.
+
+    :param pdf_file: the uploaded PDF.
+    :yields: the temporary copy of the PDF.
+    """
+    try:
+        async with spool_pdf(pdf_file.read, pdf_file.size) as spooled_pdf:
+            yield spooled_pdf
+    finally:
+        await pdf_file.close()
+
+
+@asynccontextmanager
+async def spool_pdf(
+    read_chunk: Callable[[int], Awaitable[bytes]],
+    size: Optional[int] = None,
+) -> AsyncIterator[SpooledPDF]:
+    """
+    Copy a PDF to a temporary file, in chunks, see `spool_pdf_upload`.
+
+    :param read_chunk: reads the next chunk of the PDF, of at most the given
+        size, empty at the end of the PDF.
+    :param size: the size of the PDF if it is known, to reject it early.
+    :yields: the temporary copy of the PDF.
+    :raises UploadTooLargeError: If the PDF exceeds the size limit.
+    """
+    if size is not None and size > settings.max_upload_bytes:
+        raise UploadTooLargeError(
+            f"PDF of {size} bytes exceeds the limit of "
+            f"{settings.max_upload_bytes} bytes",
+        )
+    file_descriptor, tmp_name = tempfile.mkstemp(suffix=".pdf")
+    os.close(file_descriptor)
+    tmp_path = Path(tmp_name)
+    try:
+        content_hash = hashlib.sha256()
+        size = 0
+        async with aiofiles.open(tmp_path, "wb") as tmp_file:
+            while True:
+                chunk = await read_chunk(settings.upload_chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > settings.max_upload_bytes:
+                    raise UploadTooLargeError(
+                        f"PDF exceeds the limit of {settings.max_upload_bytes} bytes",
+                    )
+                content_hash.update(chunk)
+                await tmp_file.write(chunk)
+        logging.info(f"Spooled uploaded PDF of {size} bytes to {tmp_path}")
+        yield SpooledPDF(tmp_path, content_hash.hexdigest(), size)
+    finally:
+        tmp_path.unlink(missing_ok=True)
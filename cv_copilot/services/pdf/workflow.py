@@ -1,101 +1,481 @@
+import asyncio
 import logging
-from typing import List
+import time
+from typing import AsyncIterator, Awaitable, Dict, List, NamedTuple, Optional, Tuple
+
+from openai import AsyncOpenAI
+from prometheus_client import Counter, Histogram
 
 from cv_copilot.db.dao.images import ImageDAO
 from cv_copilot.db.dao.pdfs import PDFDAO
 from cv_copilot.db.dao.texts import TextDAO
+from cv_copilot.db.models.images import ImageModel
+from cv_copilot.db.models.pdfs import PDFModel
 from cv_copilot.db.models.texts import TextModel
+from cv_copilot.services.cpu.executor import CPUExecutor
+from cv_copilot.services.llm.cache import LLMCache
 from cv_copilot.services.llm.utils import get_text_from_image
-from cv_copilot.services.pdf.processing import encode_pdf_pages
+from cv_copilot.services.pdf.processing import (
+    PDFConversionError,
+    count_pdf_pages,
+    extract_text_layer,
+    is_text_layer_usable,
+    render_pdf_pages,
+)
+from cv_copilot.services.progress.publisher import (
+    ProgressCallback,
+    ProgressEvent,
+    ProgressStage,
+)
+from cv_copilot.settings import settings
+
+OCR_PAGE_DURATION_SECONDS = Histogram(
+    "ocr_page_duration_seconds",
+    "Time spent converting a single PDF page to text.",
+)
+PDF_DEDUPLICATED = Counter(
+    "pdf_deduplicated",
+    "PDFs whose text was reused from an already processed PDF with the same content.",
+)
+PDF_PAGES_PROCESSED = Counter(
+    "pdf_pages_processed",
+    "PDF pages converted to text, by source of the text.",
+    ["source"],
+)
+
+
+class ProcessedPDF(NamedTuple):
+    """Text of a PDF, with the pages that could not be converted."""
 
+    text: TextModel
+    failed_pages: List[int]
 
-async def process_pdf_workflow(
+
+async def process_pdf_workflow(  # noqa: WPS211
     pdf_id: int,
     pdf_dao: PDFDAO,
     image_dao: ImageDAO,
     text_dao: TextDAO,
-) -> TextModel:
+    cpu_executor: CPUExecutor,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
+    text_id: Optional[int] = None,
+    report_progress: Optional[ProgressCallback] = None,
+) -> ProcessedPDF:
     """
     Process the PDF workflow which includes converting PDF to JPG and then to text.
 
-    TODO: verify whether the pdf was already processed and return the text if it was.
+    If a PDF with the same content was already processed, e.g. the same CV
+    uploaded for another job description, its text is reused as is, unless
+    some of its pages failed OCR.
+    Otherwise, pages with a usable text layer are read directly from the PDF;
+    only the other pages (e.g. scanned ones) are converted to JPG and sent to
+    the vision model. Pages converted by a previous run are not converted
+    again, see `ocr_pdf_pages`.
 
     :param pdf_id: The ID of the PDF to process.
     :param text_dao: The TextDAO object to use for database operations.
-    :return: The text of the PDF.
+    :param cpu_executor: The process pool used to rasterize the PDF.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
+    :param text_id: The ID of the text saved by a previous run that had
+        failed pages, updated instead of saving a new text.
+    :param report_progress: Called with each page converted by the vision
+        model, see `ocr_pdf_pages`.
+    :return: The text of the PDF and the pages that failed.
+    :raises ValueError: If the PDF or its content is not found.
     """
     try:
-        image_ids = await convert_pdf_to_jpg(pdf_id, pdf_dao, image_dao)
-        text = await convert_jpg_to_text(pdf_id, image_dao, image_ids)
-        return await text_dao.save_text(pdf_id=pdf_id, text=text)
+        pdf = await pdf_dao.get_pdf_by_id(pdf_id=pdf_id)
+        if pdf is None:
+            raise ValueError(f"PDF with id {pdf_id} not found.")
+
+        processed_text = None
+        if text_id is None:
+            processed_text = await text_dao.get_text_by_content_hash(pdf.content_hash)
+        if processed_text is not None:
+            PDF_DEDUPLICATED.inc()
+            logging.info(
+                f"Reusing text of PDF ID {processed_text.pdf_id} for PDF ID {pdf_id}",
+            )
+            if processed_text.pdf_id != pdf_id:
+                processed_text = await text_dao.save_text(
+                    pdf_id=pdf_id,
+                    text=processed_text.text,
+                )
+            return ProcessedPDF(processed_text, [])
+
+        pdf_file = await pdf_dao.get_pdf_file(pdf_id)
+        if pdf_file is None:
+            raise ValueError(f"Content of PDF with id {pdf_id} not found.")
+
+        pages_text = await extract_pages_text(pdf, pdf_file, cpu_executor)
+        ocr_page_numbers = [
+            page_number
+            for page_number, page_text in enumerate(pages_text, start=1)
+            if page_text is None
+        ]
+        PDF_PAGES_PROCESSED.labels(source="text_layer").inc(
+            len(pages_text) - len(ocr_page_numbers),
+        )
+        if not pages_text:
+            # The text layer could not be read, rasterize the whole document.
+            pages_text = await ocr_pdf_pages(
+                pdf,
+                pdf_file,
+                None,
+                image_dao,
+                cpu_executor,
+                openai_client,
+                llm_cache,
+                report_progress,
+            )
+        elif ocr_page_numbers:
+            ocr_pages_text = await ocr_pdf_pages(
+                pdf,
+                pdf_file,
+                ocr_page_numbers,
+                image_dao,
+                cpu_executor,
+                openai_client,
+                llm_cache,
+                report_progress,
+            )
+            for page_number, page_text in zip(ocr_page_numbers, ocr_pages_text):
+                pages_text[page_number - 1] = page_text
+
+        failed_pages = [
+            page_number
+            for page_number, page_text in enumerate(pages_text, start=1)
+            if page_text is None
+        ]
+        text = "\n".join(page_text or "" for page_text in pages_text)
+        complete = not failed_pages
+        if text_id is None:
+            saved_text = await text_dao.save_text(
+                pdf_id=pdf_id,
+                text=text,
+                complete=complete,
+            )
+        else:
+            saved_text = await text_dao.update_text(
+                text_id=text_id,
+                text=text,
+                complete=complete,
+            )
+        return ProcessedPDF(saved_text, failed_pages)
     except Exception as e:
         logging.error(f"Error processing PDF workflow for PDF ID {pdf_id}: {e}")
         raise
 
 
-async def convert_pdf_to_jpg(
-    pdf_id: int,
-    pdf_dao: PDFDAO,
+async def extract_pages_text(
+    pdf: PDFModel,
+    pdf_file: bytes,
+    cpu_executor: CPUExecutor,
+) -> List[Optional[str]]:
+    """Read the text layer of each page of a PDF.
+
+    :param pdf: The PDF to read.
+    :param pdf_file: The content of the PDF.
+    :param cpu_executor: The process pool used to read the PDF.
+    :return: The text of each page, None for the pages that need OCR. The list
+        is empty when the text layer cannot be read at all.
+    """
+    if not settings.text_layer_enabled:
+        return []
+    try:
+        pages_text = await cpu_executor.run(extract_text_layer, pdf_file, pdf.id)
+    except PDFConversionError:
+        logging.warning(f"Falling back to OCR for all pages of PDF ID {pdf.id}")
+        return []
+
+    usable_pages_text: List[Optional[str]] = [
+        page_text
+        if is_text_layer_usable(
+            page_text,
+            min_chars=settings.text_layer_min_chars,
+            max_garbage_ratio=settings.text_layer_max_garbage_ratio,
+        )
+        else None
+        for page_text in pages_text
+    ]
+    logging.info(
+        f"{usable_pages_text.count(None)} of {len(pages_text)} pages "
+        f"of PDF ID {pdf.id} need OCR",
+    )
+    return usable_pages_text
+
+
+async def ocr_pdf_pages(
+    pdf: PDFModel,
+    pdf_file: bytes,
+    page_numbers: Optional[List[int]],
     image_dao: ImageDAO,
-) -> List[int]:
-    """Convert a PDF to a list of JPG images.
+    cpu_executor: CPUExecutor,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
+    report_progress: Optional[ProgressCallback] = None,
+) -> List[Optional[str]]:
+    """Convert pages of a PDF to JPG and then to text with the vision model.
 
-    :param pdf_id: The ID of the PDF to convert to JPG.
-    :param pdf_dao: The PDFDAO object to use for database operations.
+    Pages are streamed through the pipeline: each page is sent to the vision
+    model as soon as it is rendered, while the next page renders.
+    At most `settings.parallel_tasks` pages are in flight for the document,
+    so rendering waits for the vision model instead of piling up images.
+    A page that fails OCR is logged and left without text instead of failing
+    the whole document.
+
+    The images and the text of the pages are saved as checkpoints: pages
+    converted by a previous run are not converted again, and pages rendered
+    by a previous run but not converted are read back instead of rendered.
+    The rendered images are saved in a single INSERT per window of
+    `settings.parallel_tasks` pages, see `save_page_images`, so a document
+    costs one round trip per window instead of one per page, and at most a
+    window of rendered pages is kept in memory until it is saved.
+
+    :param pdf: The PDF to convert to text.
+    :param pdf_file: The content of the PDF.
+    :param page_numbers: The pages to convert, all of them if None.
     :param image_dao: The ImageDAO object to use for database operations.
-    :return: None
+    :param cpu_executor: The process pool used to rasterize the PDF.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
+    :param report_progress: Called with each page converted by the vision
+        model, as soon as it is converted.
+    :return: The text of each converted page, in page order, None for the
+        pages that failed.
     """
-    # Get PDF from database using ID
-    pdf = await pdf_dao.get_pdf_by_id(pdf_id=pdf_id)
+    if page_numbers is None:
+        page_count = await cpu_executor.run(count_pdf_pages, pdf_file, pdf.id)
+        page_numbers = list(range(1, page_count + 1))
 
-    # Check if the PDF was found
-    if pdf is None:
-        logging.error(f"PDF with id {pdf_id} not found.")
-        return []
+    saved_images = {
+        image.page_number: image
+        for image in await image_dao.get_page_images(pdf.id)
+        if image.page_number is not None
+    }
+    pages_text: Dict[int, Optional[str]] = {
+        page_number: saved_images[page_number].text
+        for page_number in page_numbers
+        if page_number in saved_images and saved_images[page_number].text is not None
+    }
+    pending_page_numbers = [
+        page_number for page_number in page_numbers if page_number not in pages_text
+    ]
+    PDF_PAGES_PROCESSED.labels(source="checkpoint").inc(len(pages_text))
+
+    image_ids = {
+        page_number: image.id
+        for page_number, image in saved_images.items()
+        if page_number in pending_page_numbers
+    }
+    unsaved_images: Dict[int, bytes] = {}
+    slots = asyncio.Semaphore(settings.parallel_tasks)
+    ocr_tasks: Dict[int, "asyncio.Task[Optional[str]]"] = {}
+    try:
+        async for page_number, image in stream_pdf_pages(
+            pdf,
+            pdf_file,
+            pending_page_numbers,
+            saved_images,
+            image_dao,
+            cpu_executor,
+            slots,
+        ):
+            conversion = convert_page_to_text(
+                page_number,
+                image,
+                slots,
+                openai_client,
+                llm_cache,
+            )
+            if report_progress is not None:
+                conversion = report_page_progress(
+                    conversion,
+                    page_number,
+                    len(pending_page_numbers),
+                    report_progress,
+                )
+            ocr_tasks[page_number] = asyncio.create_task(conversion)
+            if page_number not in image_ids:
+                unsaved_images[page_number] = image
+            if len(unsaved_images) >= settings.parallel_tasks:
+                image_ids.update(
+                    await save_page_images(pdf, unsaved_images, image_dao),
+                )
+                unsaved_images = {}
+        image_ids.update(await save_page_images(pdf, unsaved_images, image_dao))
+        ocr_pages_text = await asyncio.gather(*ocr_tasks.values())
+    except BaseException:
+        for ocr_task in ocr_tasks.values():
+            ocr_task.cancel()
+        raise
 
-    # Proceed with encoding if PDF is found
-    encoded_images = encode_pdf_pages(
-        pdf=pdf,
-        pdf_id=pdf_id,
+    converted_pages_text = {
+        image_ids[page_number]: page_text
+        for page_number, page_text in zip(ocr_tasks, ocr_pages_text)
+        if page_text is not None
+    }
+    await image_dao.save_pages_text(converted_pages_text)
+    pages_text.update(zip(pending_page_numbers, ocr_pages_text))
+
+    logging.info(
+        f"Converted {len(converted_pages_text)} of {len(pending_page_numbers)} "
+        f"pages to text for PDF ID {pdf.id}",
     )
-    logging.info(f"Encoded {len(encoded_images)} images for PDF ID {pdf_id}")
+    PDF_PAGES_PROCESSED.labels(source="ocr").inc(len(converted_pages_text))
+    return [pages_text[page_number] for page_number in page_numbers]
+
+
+async def report_page_progress(
+    conversion: Awaitable[Optional[str]],
+    page_number: int,
+    page_count: int,
+    report_progress: ProgressCallback,
+) -> Optional[str]:
+    """Report the progress once a page is converted to text.
 
-    # Save the encoded images
-    return await image_dao.save_encoded_images(
-        pdf_id=pdf_id,
-        job_id=pdf.job_id,
-        encoded_images=encoded_images,
+    :param conversion: The conversion of the page, see `convert_page_to_text`.
+    :param page_number: The number of the page.
+    :param page_count: The number of pages sent to the vision model.
+    :param report_progress: Called with the progress of the page.
+    :return: The text of the page, None if the conversion failed.
+    """
+    page_text = await conversion
+    await report_progress(
+        ProgressEvent(
+            stage=ProgressStage.OCR_PAGE,
+            page=page_number,
+            pages=page_count,
+            success=page_text is not None,
+        ),
     )
+    return page_text
 
 
-async def convert_jpg_to_text(
-    pdf_id: int,
+async def stream_pdf_pages(  # noqa: WPS211
+    pdf: PDFModel,
+    pdf_file: bytes,
+    page_numbers: List[int],
+    saved_images: Dict[int, ImageModel],
     image_dao: ImageDAO,
-    image_ids: List[int],
-) -> str:
-    """Convert a list of JPG images to text, one image at a time.
+    cpu_executor: CPUExecutor,
+    slots: asyncio.Semaphore,
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Render the pages of a PDF to JPG one at a time.
+
+    The rasterization runs in the CPU executor so that the event loop
+    keeps serving other requests while the pages are rendered. The images
+    are not saved here, see `save_page_images`. Pages that already have a
+    saved image are read back instead.
 
-    :param pdf_id: The ID of the PDF to convert to text.
+    :param pdf: The PDF to convert to JPG.
+    :param pdf_file: The content of the PDF.
+    :param page_numbers: The pages to convert.
+    :param saved_images: The images saved by a previous run, by page number.
     :param image_dao: The ImageDAO object to use for database operations.
-    :param image_ids: The IDs of the images to convert to text.
-    :return: The text of the PDF.
+    :param cpu_executor: The process pool used to rasterize the PDF.
+    :param slots: Semaphore bounding the pages in flight. A slot is acquired
+        before rendering each page and must be released by the consumer once
+        the page has been processed.
+    :yields: The number and the JPEG image of each page, in page order.
     """
-    images = await image_dao.get_images_by_ids(image_ids)
-    logging.info(
-        f"Starting text conversion for {len(images)} images for PDF ID {pdf_id}.",
+    for page_number in page_numbers:
+        await slots.acquire()
+        try:
+            saved_image = saved_images.get(page_number)
+            if saved_image is not None:
+                image = await image_dao.get_image_file(saved_image)
+            else:
+                image = await render_page(pdf, pdf_file, page_number, cpu_executor)
+        except BaseException:
+            slots.release()
+            raise
+        yield page_number, image
+
+
+async def render_page(
+    pdf: PDFModel,
+    pdf_file: bytes,
+    page_number: int,
+    cpu_executor: CPUExecutor,
+) -> bytes:
+    """Render a page of a PDF to JPG.
+
+    :param pdf: The PDF to convert to JPG.
+    :param pdf_file: The content of the PDF.
+    :param page_number: The page to convert.
+    :param cpu_executor: The process pool used to rasterize the PDF.
+    :return: The JPEG image of the page.
+    """
+    rendered_images = await cpu_executor.run(
+        render_pdf_pages,
+        pdf_file,
+        pdf.id,
+        settings.page_render_profile,
+        [page_number],
     )
+    logging.info(f"Rendered page {page_number} of PDF ID {pdf.id}")
+    return rendered_images[0]
 
-    pdf_full_text = ""
-    for image in images:
-        try:
-            response = await get_text_from_image(image.encoded_image)
-            logging.info({response.choices[0].message.content})
-            content = response.choices[0].message.content
-            if content is not None:
-                pdf_full_text += content
-        except Exception as e:
-            logging.error(f"Error during processing image ID {image.id}: {e}")
-
-    image_ids_str = ", ".join(str(image.id) for image in images)
-    logging.info(f"Converted images to text for image IDs: {image_ids_str}")
-    return pdf_full_text
+
+async def save_page_images(
+    pdf: PDFModel,
+    images: Dict[int, bytes],
+    image_dao: ImageDAO,
+) -> Dict[int, int]:
+    """Save the rendered images of some pages of a PDF in a single INSERT.
+
+    :param pdf: The PDF of the pages.
+    :param images: The JPEG image of each page, by page number.
+    :param image_dao: The ImageDAO object to use for database operations.
+    :return: The ID of the saved image of each page, by page number.
+    """
+    if not images:
+        return {}
+    image_ids = await image_dao.save_images(
+        pdf.id,
+        pdf.job_id,
+        list(images.values()),
+        page_numbers=list(images),
+    )
+    return dict(zip(images, image_ids))
+
+
+async def convert_page_to_text(
+    page_number: int,
+    image: bytes,
+    slots: asyncio.Semaphore,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
+) -> Optional[str]:
+    """Convert a single JPG image to text.
+
+    :param page_number: The number of the page.
+    :param image: The JPEG image of the page to convert to text.
+    :param slots: Semaphore bounding the pages in flight, whose slot for this
+        page is released once it is converted.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
+    :return: The text of the page, None if the conversion failed.
+    """
+    started_at = time.perf_counter()
+    try:
+        response = await get_text_from_image(
+            openai_client,
+            image,
+            llm_cache,
+        )
+    except Exception as e:
+        logging.error(f"Error during processing page {page_number}: {e}")
+        return None
+    finally:
+        slots.release()
+        duration = time.perf_counter() - started_at
+        OCR_PAGE_DURATION_SECONDS.observe(duration)
+        logging.info(f"Processed page {page_number} in {duration:.3f}s")
+
+    content = response.choices[0].message.content
+    logging.info({content})
+    return content or ""
@@ -0,0 +1 @@
+"""Checkpointed processing of PDFs for a job description."""
@@ -0,0 +1,179 @@
+import logging
+from typing import Optional
+
+from openai import AsyncOpenAI
+from prometheus_client import Counter
+
+from cv_copilot.db.dao.images import ImageDAO
+from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO
+from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.models.pipeline_runs import PipelineStage
+from cv_copilot.db.models.texts import ParsedTextModel
+from cv_copilot.services.cpu.executor import CPUExecutor
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.pdf.workflow import process_pdf_workflow
+from cv_copilot.services.progress.publisher import (
+    ProgressCallback,
+    ProgressEvent,
+    ProgressStage,
+    ignore_progress,
+)
+from cv_copilot.services.text.workflow import workflow_evaluate_cv
+
+PIPELINE_STAGES_SKIPPED = Counter(
+    "pipeline_stages_skipped",
+    "Pipeline stages not run again because a previous run completed them.",
+    ["stage"],
+)
+
+
+async def run_pdf_pipeline(  # noqa: WPS211
+    pdf_id: int,
+    job_id: int,
+    pipeline_run_dao: PipelineRunDAO,
+    pdf_dao: PDFDAO,
+    image_dao: ImageDAO,
+    text_dao: TextDAO,
+    parsed_text_dao: ParsedTextDAO,
+    parsed_job_description_dao: ParsedJobDescriptionDAO,
+    cpu_executor: CPUExecutor,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
+    reevaluate: bool = False,
+    report_progress: ProgressCallback = ignore_progress,
+) -> ParsedTextModel:
+    """
+    Convert a PDF to text and evaluate it against a job description.
+
+    The progress is recorded in the pipeline run of the PDF and the job
+    description, and a new run resumes from the first incomplete stage:
+    a PDF already evaluated returns its parsed text without any work, a PDF
+    already converted to text is only evaluated. A PDF evaluated against an
+    older parse of the job description, before it was edited, is evaluated
+    again from its text. When some pages failed OCR,
+    the PDF is still evaluated, but the text stage stays incomplete so that
+    the next run converts the failed pages, and only them, again.
+
+    :param pdf_id: The ID of the PDF to process.
+    :param job_id: The ID of the job description to evaluate the PDF against.
+    :param pipeline_run_dao: DAO for PipelineRun models.
+    :param pdf_dao: DAO for PDF models.
+    :param image_dao: DAO for Image models.
+    :param text_dao: DAO for Text models.
+    :param parsed_text_dao: DAO for ParsedText models.
+    :param parsed_job_description_dao: DAO for ParsedJobDescription models.
+    :param cpu_executor: The process pool used to rasterize the PDF.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
+    :param reevaluate: Evaluate the PDF again even if it was evaluated.
+    :param report_progress: Called with each stage reached, each page
+        converted by the vision model, and the error if the processing fails.
+    :return: The parsed text.
+    :raises ValueError: If the text of a completed stage is not found.
+    """
+    try:
+        return await _run_pdf_pipeline(
+            pdf_id=pdf_id,
+            job_id=job_id,
+            pipeline_run_dao=pipeline_run_dao,
+            pdf_dao=pdf_dao,
+            image_dao=image_dao,
+            text_dao=text_dao,
+            parsed_text_dao=parsed_text_dao,
+            parsed_job_description_dao=parsed_job_description_dao,
+            cpu_executor=cpu_executor,
+            openai_client=openai_client,
+            llm_cache=llm_cache,
+            reevaluate=reevaluate,
+            report_progress=report_progress,
+        )
+    except Exception as e:
+        await report_progress(ProgressEvent(stage=ProgressStage.FAILED, error=str(e)))
+        raise
+
+
+async def _run_pdf_pipeline(  # noqa: WPS211
+    pdf_id: int,
+    job_id: int,
+    pipeline_run_dao: PipelineRunDAO,
+    pdf_dao: PDFDAO,
+    image_dao: ImageDAO,
+    text_dao: TextDAO,
+    parsed_text_dao: ParsedTextDAO,
+    parsed_job_description_dao: ParsedJobDescriptionDAO,
+    cpu_executor: CPUExecutor,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache],
+    reevaluate: bool,
+    report_progress: ProgressCallback,
+) -> ParsedTextModel:
+    run = await pipeline_run_dao.get_or_create_run(pdf_id, job_id)
+    parsed_job_description = (
+        await parsed_job_description_dao.get_parsed_job_description_by_id(job_id)
+    )
+    parsed_job_description_id = None
+    if parsed_job_description is not None:
+        parsed_job_description_id = parsed_job_description.id
+    is_evaluated = run.has_reached(PipelineStage.EVALUATED) and not reevaluate
+    if is_evaluated and run.parsed_job_description_id != parsed_job_description_id:
+        logging.info(
+            f"Job ID {job_id} was parsed again since PDF ID {pdf_id} was evaluated",
+        )
+        is_evaluated = False
+    if is_evaluated:
+        parsed_text = await parsed_text_dao.get_parsed_text(run.parsed_text_id)
+        if parsed_text is not None:
+            PIPELINE_STAGES_SKIPPED.labels(stage=PipelineStage.EVALUATED.value).inc()
+            logging.info(f"PDF ID {pdf_id} already evaluated for Job ID {job_id}")
+            await report_progress(ProgressEvent(stage=ProgressStage.EVALUATED))
+            return parsed_text
+
+    await report_progress(ProgressEvent(stage=ProgressStage.STARTED))
+
+    if run.has_reached(PipelineStage.OCRD):
+        PIPELINE_STAGES_SKIPPED.labels(stage=PipelineStage.OCRD.value).inc()
+        text = await text_dao.get_text(run.text_id)
+        if text is None:
+            raise ValueError(f"Text with id {run.text_id} not found.")
+        stage = PipelineStage.OCRD
+    else:
+        text, failed_pages = await process_pdf_workflow(
+            pdf_id=pdf_id,
+            pdf_dao=pdf_dao,
+            image_dao=image_dao,
+            text_dao=text_dao,
+            cpu_executor=cpu_executor,
+            openai_client=openai_client,
+            llm_cache=llm_cache,
+            text_id=run.text_id,
+            report_progress=report_progress,
+        )
+        stage = PipelineStage.OCRD
+        if failed_pages:
+            logging.warning(f"Pages {failed_pages} of PDF ID {pdf_id} failed OCR")
+            stage = PipelineStage.RASTERIZED
+        run = await pipeline_run_dao.update_run(run, stage, text_id=text.id)
+        await report_progress(ProgressEvent(stage=ProgressStage(stage.value)))
+
+    parsed_text = await workflow_evaluate_cv(
+        text=text,
+        job_id=job_id,
+        pdf_id=pdf_id,
+        parsed_text_dao=parsed_text_dao,
+        parsed_job_description_dao=parsed_job_description_dao,
+        openai_client=openai_client,
+        llm_cache=llm_cache,
+        parsed_job_description=parsed_job_description,
+    )
+    if stage == PipelineStage.OCRD:
+        stage = PipelineStage.EVALUATED
+    await pipeline_run_dao.update_run(
+        run,
+        stage,
+        parsed_text_id=parsed_text.id,
+        parsed_job_description_id=parsed_job_description_id,
+    )
+    await report_progress(ProgressEvent(stage=ProgressStage.EVALUATED))
+    return parsed_text
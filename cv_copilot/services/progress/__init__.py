@@ -0,0 +1 @@
+"""Progress of the processing of PDFs and job descriptions."""
@@ -0,0 +1,16 @@
+from starlette.requests import Request
+from taskiq import TaskiqDepends
+
+from cv_copilot.services.progress.publisher import ProgressPublisher
+
+
+async def get_progress_publisher(
+    request: Request = TaskiqDepends(),
+) -> ProgressPublisher:  # pragma: no cover
+    """
+    Returns the publisher of the progress of the processing.
+
+    :param request: current request.
+    :returns: progress publisher.
+    """
+    return request.app.state.progress_publisher
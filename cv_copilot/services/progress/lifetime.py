@@ -0,0 +1,19 @@
+from fastapi import FastAPI
+
+from cv_copilot.services.progress.publisher import ProgressPublisher
+from cv_copilot.settings import settings
+
+
+def init_progress_publisher(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the publisher of the progress of the processing.
+
+    It must be called after `init_redis`, as it uses the redis pool.
+
+    :param app: current fastapi application.
+    """
+    app.state.progress_publisher = ProgressPublisher(
+        redis_pool=app.state.redis_pool,
+        ttl=settings.progress_event_ttl,
+        keepalive_interval=settings.progress_keepalive_interval,
+    )
@@ -0,0 +1,209 @@
+import enum
+import functools
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence
+
+from pydantic import BaseModel
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
+
+
+class ProgressStage(str, enum.Enum):  # noqa: WPS600
+    """Stages reported while a PDF or a job description is processed."""
+
+    # Sent to the workers, not started yet
+    QUEUED = "queued"
+    STARTED = "started"
+    # A page was converted to text by the vision model
+    OCR_PAGE = "ocr_page"
+    # The text of the PDF is saved, some pages failed OCR
+    RASTERIZED = "rasterized"
+    # The text of the PDF is saved
+    OCRD = "ocrd"
+    # The CV is evaluated against the job description
+    EVALUATED = "evaluated"
+    # The skills of the job description are parsed
+    PARSED = "parsed"
+    FAILED = "failed"
+
+
+# Stages after which nothing else is reported
+FINAL_STAGES = frozenset(
+    (ProgressStage.EVALUATED, ProgressStage.PARSED, ProgressStage.FAILED),
+)
+
+
+class ProgressEvent(BaseModel):
+    """A step of the processing of a PDF or a job description."""
+
+    stage: ProgressStage
+    # The page converted, and the number of pages sent to the vision model
+    # for the PDF, for OCR_PAGE
+    page: Optional[int] = None
+    pages: Optional[int] = None
+    # Whether the page was converted, for OCR_PAGE
+    success: bool = True
+    # The error that stopped the processing, for FAILED
+    error: Optional[str] = None
+
+    @property
+    def is_final(self) -> bool:
+        """
+        Whether nothing is reported after this event.
+
+        :return: True for the last event of a processing.
+        """
+        return self.stage in FINAL_STAGES
+
+
+ProgressCallback = Callable[[ProgressEvent], Awaitable[None]]
+
+
+async def ignore_progress(event: ProgressEvent) -> None:
+    """
+    Progress callback that reports nothing.
+
+    :param event: the event, dropped.
+    """
+
+
+def pdf_channel(pdf_id: int, job_id: int) -> str:
+    """
+    Get the channel of the progress of a PDF.
+
+    :param pdf_id: the ID of the PDF.
+    :param job_id: the ID of the job description it is evaluated against.
+    :return: the channel.
+    """
+    return f"progress:job-description:{job_id}:pdf:{pdf_id}"
+
+
+def job_description_channel(job_description_id: int) -> str:
+    """
+    Get the channel of the progress of a job description.
+
+    :param job_description_id: the ID of the job description.
+    :return: the channel.
+    """
+    return f"progress:job-description:{job_description_id}"
+
+
+class ProgressPublisher:
+    """
+    Progress of the processing, sent from the workers to the API over Redis.
+
+    Each event is published on the channel of the PDF or job description,
+    and also kept in a key of the same name, so that a client subscribing
+    after the processing started, or ended, gets the current stage first.
+
+    Redis errors are logged: reporting the progress never fails the
+    processing.
+    """
+
+    def __init__(
+        self,
+        redis_pool: ConnectionPool,
+        ttl: int,
+        keepalive_interval: float,
+    ):
+        self.redis_pool = redis_pool
+        self.ttl = ttl
+        self.keepalive_interval = keepalive_interval
+
+    async def publish(
+        self,
+        channel: str,
+        event: ProgressEvent,
+        replace: bool = True,
+    ) -> None:
+        """
+        Publish an event and keep it as the last event of the channel.
+
+        :param channel: the channel, see `pdf_channel`.
+        :param event: the event.
+        :param replace: False to publish the event only if the channel has no
+            last event, e.g. when a worker may already have reported a later
+            stage.
+        """
+        message = event.model_dump_json()
+        try:
+            async with Redis(connection_pool=self.redis_pool) as redis:
+                if not replace:
+                    if await redis.set(channel, message, ex=self.ttl, nx=True):
+                        await redis.publish(channel, message)
+                    return
+                pipeline = redis.pipeline(transaction=False)
+                pipeline.set(channel, message, ex=self.ttl)
+                pipeline.publish(channel, message)
+                await pipeline.execute()
+        except RedisError as e:
+            logging.warning(f"Could not publish progress on {channel}: {e}")
+
+    async def get_last_events(
+        self,
+        channels: Sequence[str],
+    ) -> List[Optional[ProgressEvent]]:
+        """
+        Get the last event of channels, in one round trip.
+
+        :param channels: the channels, see `pdf_channel`.
+        :return: the last event of each channel, None if there is none or
+            it could not be read.
+        """
+        if not channels:
+            return []
+        try:
+            async with Redis(connection_pool=self.redis_pool) as redis:
+                messages = await redis.mget(channels)
+        except RedisError as e:
+            logging.warning(f"Could not read the last progress events: {e}")
+            return [None] * len(channels)
+        return [
+            None if message is None else ProgressEvent.model_validate_json(message)
+            for message in messages
+        ]
+
+    def reporter(self, channel: str) -> ProgressCallback:
+        """
+        Get a callback publishing the events of a channel.
+
+        :param channel: the channel, see `pdf_channel`.
+        :return: the callback.
+        """
+        return functools.partial(self.publish, channel)
+
+    async def subscribe(
+        self,
+        channel: str,
+    ) -> AsyncIterator[Optional[ProgressEvent]]:
+        """
+        Follow the events of a channel until the final one.
+
+        The last event published before subscribing comes first. None is
+        yielded every `keepalive_interval` seconds without event, so that
+        the caller can keep its connection alive.
+
+        :param channel: the channel, see `pdf_channel`.
+        :yields: the events, or None when there was none for a while.
+        """
+        async with Redis(connection_pool=self.redis_pool) as redis:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(channel)
+                last_message = await redis.get(channel)
+                if last_message is not None:
+                    event = ProgressEvent.model_validate_json(last_message)
+                    yield event
+                    if event.is_final:
+                        return
+                while True:  # noqa: WPS457
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=self.keepalive_interval,
+                    )
+                    if message is None:
+                        yield None
+                        continue
+                    event = ProgressEvent.model_validate_json(message["data"])
+                    yield event
+                    if event.is_final:
+                        return
@@ -0,0 +1,180 @@
+"""
+Vectorized scoring of all the CVs of a job description.
+
+The evaluations of the CVs are loaded in a candidates x skills matrix of
+matches, and every score is computed with a few matrix products instead of
+walking the nested dicts of each CV. The scores are the same as the ones of
+`score_calculation`. The matrix keeps the matches rather than their weight,
+so the same matrix can be scored again with other weights.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cv_copilot.services.scorer.weights import ScoringWeights
+
+# Code of each match in the matrix; unknown matches count as listed skills
+# worth nothing, skills that are not listed are NOT_LISTED.
+MATCHES = ("YES", "PARTIAL", "NO")
+UNKNOWN_MATCH = len(MATCHES)
+NOT_LISTED = -1
+
+# (importance, skill type) of each group of skills, see `group_weights`
+SKILL_GROUPS = (
+    ("required_skills", "hard_skills"),
+    ("required_skills", "soft_skills"),
+    ("nice_to_have_skills", "hard_skills"),
+    ("nice_to_have_skills", "soft_skills"),
+)
+
+# The names of the skills of a group and their matches, in the same order
+GroupMatches = Tuple[Sequence[str], Sequence[str]]
+
+
+class MatchMatrix(NamedTuple):
+    """Evaluations of the CVs of a job description, one row per CV."""
+
+    # Code of the match of each skill of each CV
+    match_codes: np.ndarray
+    # Index in SKILL_GROUPS of each skill
+    skill_groups: np.ndarray
+
+
+def extract_matches(parsed_skills: Dict[str, Any]) -> List[GroupMatches]:
+    """
+    Extract the matches of each group of skills of an evaluation.
+
+    :param parsed_skills: the evaluation of a CV, see `EvaluationExtract`.
+    :return: the matches of each group of SKILL_GROUPS.
+    """
+    group_matches = []
+    for importance, skill_type in SKILL_GROUPS:
+        evaluations = (parsed_skills.get(importance) or {}).get(skill_type) or {}
+        group_matches.append(
+            (
+                list(evaluations),
+                [evaluation["match"] for evaluation in evaluations.values()],
+            ),
+        )
+    return group_matches
+
+
+def build_match_matrix(candidates: Sequence[Sequence[GroupMatches]]) -> MatchMatrix:
+    """
+    Load the matches of CVs in a match matrix.
+
+    The CVs of a job description are evaluated against the same skills, so
+    the columns of the skills of a group are looked up once per distinct
+    list of skills instead of once per CV.
+
+    :param candidates: the matches of each group of skills of each CV.
+    :return: the match matrix, with the CVs in the same order.
+    """
+    match_codes = defaultdict(
+        lambda: UNKNOWN_MATCH,
+        {match: code for code, match in enumerate(MATCHES)},
+    )
+    skill_columns: Dict[Tuple[int, str], int] = {}
+    group_columns: Dict[Tuple[int, Tuple[str, ...]], List[int]] = {}
+    row_sizes: List[int] = []
+    columns: List[int] = []
+    codes: List[int] = []
+    for candidate in candidates:
+        row_size = 0
+        for group, (skill_names, matches) in enumerate(candidate):
+            if not skill_names:
+                continue
+            group_key = (group, tuple(skill_names))
+            skills_columns = group_columns.get(group_key)
+            if skills_columns is None:
+                skills_columns = [
+                    skill_columns.setdefault((group, skill_name), len(skill_columns))
+                    for skill_name in skill_names
+                ]
+                group_columns[group_key] = skills_columns
+            columns.extend(skills_columns)
+            codes.extend(map(match_codes.__getitem__, matches))
+            row_size += len(skills_columns)
+        row_sizes.append(row_size)
+
+    rows = np.repeat(np.arange(len(candidates)), row_sizes)
+    matrix = np.full((len(candidates), len(skill_columns)), NOT_LISTED, dtype=np.int8)
+    matrix[rows, np.array(columns, dtype=np.intp)] = codes
+    skill_groups = np.fromiter(
+        (group for group, _ in skill_columns),
+        dtype=np.intp,
+        count=len(skill_columns),
+    )
+    return MatchMatrix(matrix, skill_groups)
+
+
+def score_matrix(
+    matrix: MatchMatrix,
+    weights: Optional[ScoringWeights] = None,
+) -> np.ndarray:
+    """
+    Score every CV of a match matrix.
+
+    The score of a CV is the weighted sum, over the skill groups, of the
+    share of the skills of the group that it matches.
+
+    :param matrix: the match matrix.
+    :param weights: the weights of the scores, the default ones if None.
+    :return: the score of each CV, in the order of the matrix.
+    """
+    weights = weights or ScoringWeights()
+    # Weight of each code, UNKNOWN_MATCH and then NOT_LISTED last
+    code_weights = np.array(
+        [weights.match_weight(match) for match in MATCHES] + [0, 0],
+    )
+    matches = code_weights[matrix.match_codes]
+    listed = matrix.match_codes != NOT_LISTED
+    # skills x groups, one-hot encoding of the group of each skill
+    group_of_skill = np.eye(len(SKILL_GROUPS))[matrix.skill_groups]
+    group_matches = matches @ group_of_skill
+    group_totals = listed @ group_of_skill
+    group_shares = np.divide(
+        group_matches,
+        group_totals,
+        out=np.zeros_like(group_matches),
+        where=group_totals > 0,
+    )
+    return group_shares @ np.array(weights.group_weights())
+
+
+def score_batch(
+    parsed_skills: Sequence[Dict[str, Any]],
+    weights: Optional[ScoringWeights] = None,
+) -> List[float]:
+    """
+    Score the evaluations of CVs.
+
+    :param parsed_skills: the evaluation of each CV, see `EvaluationExtract`.
+    :param weights: the weights of the scores, the default ones if None.
+    :return: the score of each CV, in the same order.
+    """
+    matrix = build_match_matrix(
+        [extract_matches(evaluation) for evaluation in parsed_skills],
+    )
+    return score_matrix(matrix, weights).tolist()
+
+
+def rank_candidates(
+    candidates: Sequence[Tuple[int, Sequence[GroupMatches]]],
+    weights: Optional[ScoringWeights] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Rank CVs by score, best first.
+
+    :param candidates: the ID of each PDF with its matches, see
+        `ParsedTextDAO.get_latest_matches`.
+    :param weights: the weights of the scores, the default ones if None.
+    :return: the ID and the score of each PDF, best first.
+    """
+    scores = score_matrix(
+        build_match_matrix([matches for _, matches in candidates]),
+        weights,
+    )
+    ranking = np.argsort(-scores, kind="stable")
+    return [(candidates[index][0], float(scores[index])) for index in ranking]
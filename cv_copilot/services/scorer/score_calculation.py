@@ -1,40 +1,45 @@
-from typing import List
+from typing import List, Optional
 
 from cv_copilot.db.models.texts import ParsedTextModel
+from cv_copilot.services.scorer.weights import ScoringWeights
 
 
 class ScoreError(Exception):
     """Exception raised when a Score cannot be calculated."""
 
 
-def calc_skill_matches(skills: List[dict], skill_type: str) -> int:
+def calc_skill_matches(
+    skills: List[dict],
+    skill_type: str,
+    weights: Optional[ScoringWeights] = None,
+) -> int:
     """Calculate the match score for skills.
     :param skills: List of skills and their matches.
     :param skill_type: Type of skills (hard_skills or soft_skills).
+    :param weights: Weights of the matches, the default ones if None.
 
     :return int: The calculated match score.
     """
 
+    weights = weights or ScoringWeights()
     skill_match_score: float = 0.0
-    yes_match_weight: float = 1.0
-    partial_match_weight: float = 0.5
-    no_match_weight: float = 0.0
 
     if skills[skill_type]:
         for skill in skills[skill_type]:
-            if skills[skill_type][skill]["match"] == "NO":
-                skill_match_score += no_match_weight
-            elif skills[skill_type][skill]["match"] == "PARTIAL":
-                skill_match_score += partial_match_weight
-            elif skills[skill_type][skill]["match"] == "YES":
-                skill_match_score += yes_match_weight
+            skill_match_score += weights.match_weight(
+                skills[skill_type][skill]["match"],
+            )
 
     return skill_match_score
 
 
-async def score_calculation(parsed_text: ParsedTextModel) -> dict:
+async def score_calculation(
+    parsed_text: ParsedTextModel,
+    weights: Optional[ScoringWeights] = None,
+) -> dict:
     """Calculate the Score using job description and CV matches.
     :param parsed_text: Parsed text containing job description and CV matches.
+    :param weights: Weights of the score, the default ones if None.
     :return dict: A dictionary containing the calculated score.
     :raises ValueError: Exception raised when a score cannot be calculated.
     """
@@ -43,11 +48,12 @@ async def score_calculation(parsed_text: ParsedTextModel) -> dict:
     nice_to_have_skills: List[dict] = parsed_text.parsed_skills["nice_to_have_skills"]
 
     # Defining weights
+    weights = weights or ScoringWeights()
     result: float = 0
-    required_skills_weight: float = 0.8
-    nice_to_have_skills_weight: float = 0.2
-    hard_skills_weights: float = 0.5
-    soft_skills_weights: float = 0.5
+    required_skills_weight: float = weights.required_skills
+    nice_to_have_skills_weight: float = weights.nice_to_have_skills
+    hard_skills_weights: float = weights.hard_skills
+    soft_skills_weights: float = weights.soft_skills
 
     # Calc total for each skill/type
     total_required_hard_skills: int = (
@@ -71,18 +77,22 @@ async def score_calculation(parsed_text: ParsedTextModel) -> dict:
     score_required_hard_skills: float = calc_skill_matches(
         required_skills,
         "hard_skills",
+        weights,
     )
     score_required_soft_skills: float = calc_skill_matches(
         required_skills,
         "soft_skills",
+        weights,
     )
     score_nice_to_have_hard_skills: float = calc_skill_matches(
         nice_to_have_skills,
         "hard_skills",
+        weights,
     )
     score_nice_to_have_soft_skills: float = calc_skill_matches(
         nice_to_have_skills,
         "soft_skills",
+        weights,
     )
 
     # Calc final score
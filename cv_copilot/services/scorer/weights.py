@@ -0,0 +1,48 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class ScoringWeights(BaseModel):
+    """Weights of the score of a CV.
+
+    The score is the sum, for each importance and type of skill, of the
+    share of the skills that the CV matches, weighted by the product of the
+    weights of the importance and of the type. A skill counts for the weight
+    of its match: YES, PARTIAL or NO. The defaults are the weights the
+    scores were always computed with.
+    """
+
+    required_skills: float = Field(default=0.8, ge=0)
+    nice_to_have_skills: float = Field(default=0.2, ge=0)
+    hard_skills: float = Field(default=0.5, ge=0)
+    soft_skills: float = Field(default=0.5, ge=0)
+    yes_match: float = Field(default=1, ge=0)
+    partial_match: float = Field(default=0.5, ge=0)
+    no_match: float = Field(default=0, ge=0)
+
+    def match_weight(self, match: str) -> float:
+        """
+        Get the weight of a match.
+
+        :param match: the match of a skill, YES, PARTIAL or NO.
+        :return: the weight of the match, 0 when it is unknown.
+        """
+        return {
+            "YES": self.yes_match,
+            "PARTIAL": self.partial_match,
+            "NO": self.no_match,
+        }.get(match, 0)
+
+    def group_weights(self) -> List[float]:
+        """
+        Get the weight of each group of skills.
+
+        :return: the weights of the required hard and soft skills, then of the
+            nice to have hard and soft skills.
+        """
+        return [
+            importance * skill_type
+            for importance in (self.required_skills, self.nice_to_have_skills)
+            for skill_type in (self.hard_skills, self.soft_skills)
+        ]
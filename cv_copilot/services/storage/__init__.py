@@ -0,0 +1 @@
+"""Storage of binary files outside of the database."""
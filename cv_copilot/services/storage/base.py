@@ -0,0 +1,75 @@
+import abc
+from pathlib import Path
+from typing import AsyncIterator
+
+import aiofiles
+
+# Size of the chunks files are streamed in, in bytes
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobNotFoundError(Exception):
+    """Exception raised when a blob does not exist in the storage."""
+
+
+class BlobStorage(abc.ABC):
+    """
+    Storage of binary files (PDFs and page images) outside of the database.
+
+    Keys are relative paths such as ``pdfs/<sha256>.pdf``; the database only
+    keeps the key of each file.
+    """
+
+    @abc.abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        """
+        Store a blob, replacing it if it exists.
+
+        :param key: key of the blob.
+        :param data: content of the blob.
+        """
+
+    @abc.abstractmethod
+    async def put_file(self, key: str, path: Path) -> None:
+        """
+        Store a local file as a blob, streaming it in chunks.
+
+        :param key: key of the blob.
+        :param path: path of the file to store.
+        """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes:
+        """
+        Read a blob.
+
+        :param key: key of the blob.
+        :return: content of the blob.
+        :raises BlobNotFoundError: if the blob does not exist.
+        """
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Delete a blob, if it exists.
+
+        :param key: key of the blob.
+        """
+
+    async def close(self) -> None:  # noqa: B027
+        """Release the resources held by the storage."""
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    """
+    Read a local file in chunks of CHUNK_SIZE bytes.
+
+    :param path: path of the file to read.
+    :yields: the chunks of the file.
+    """
+    async with aiofiles.open(path, "rb") as source_file:
+        while True:
+            chunk = await source_file.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from starlette.requests import Request
+from taskiq import TaskiqDepends
+
+from cv_copilot.services.storage.base import BlobStorage
+
+
+async def get_blob_storage(
+    request: Request = TaskiqDepends(),
+) -> Optional[BlobStorage]:  # pragma: no cover
+    """
+    Returns the storage of PDFs and page images.
+
+    :param request: current request.
+    :returns: blob storage, None if blobs are stored in the database.
+    """
+    return request.app.state.blob_storage
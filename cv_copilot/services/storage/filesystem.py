@@ -0,0 +1,83 @@
+import os
+import uuid
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+from cv_copilot.services.storage.base import BlobNotFoundError, BlobStorage, read_chunks
+
+
+class FilesystemStorage(BlobStorage):
+    """
+    Blob storage in a local directory.
+
+    Meant for development and single-host deployments; the directory can
+    also be a mounted network volume shared by the API and the workers.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    async def put(self, key: str, data: bytes) -> None:
+        """
+        Store a blob, replacing it if it exists.
+
+        The blob is written to a temporary file first, so that readers never
+        see a partially written blob.
+
+        :param key: key of the blob.
+        :param data: content of the blob.
+        """
+        path = self._path(key)
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        async with aiofiles.open(tmp_path, "wb") as blob_file:
+            await blob_file.write(data)
+        await aiofiles.os.replace(tmp_path, path)
+
+    async def put_file(self, key: str, path: Path) -> None:
+        """
+        Store a local file as a blob, streaming it in chunks.
+
+        :param key: key of the blob.
+        :param path: path of the file to store.
+        """
+        blob_path = self._path(key)
+        await aiofiles.os.makedirs(blob_path.parent, exist_ok=True)
+        tmp_path = blob_path.with_name(f".{blob_path.name}.{uuid.uuid4().hex}")
+        async with aiofiles.open(tmp_path, "wb") as blob_file:
+            async for chunk in read_chunks(path):
+                await blob_file.write(chunk)
+        await aiofiles.os.replace(tmp_path, blob_path)
+
+    async def get(self, key: str) -> bytes:
+        """
+        Read a blob.
+
+        :param key: key of the blob.
+        :return: content of the blob.
+        :raises BlobNotFoundError: if the blob does not exist.
+        """
+        try:
+            async with aiofiles.open(self._path(key), "rb") as blob_file:
+                return await blob_file.read()
+        except FileNotFoundError as e:
+            raise BlobNotFoundError(f"Blob {key} not found") from e
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a blob, if it exists.
+
+        :param key: key of the blob.
+        """
+        try:
+            await aiofiles.os.remove(self._path(key))
+        except FileNotFoundError:
+            return
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if os.path.commonpath([path, self.root.resolve()]) != str(self.root.resolve()):
+            raise ValueError(f"Invalid blob key {key}")
+        return path
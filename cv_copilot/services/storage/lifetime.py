@@ -0,0 +1,48 @@
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI
+
+from cv_copilot.services.storage.base import BlobStorage
+from cv_copilot.services.storage.filesystem import FilesystemStorage
+from cv_copilot.services.storage.s3 import S3Storage
+from cv_copilot.settings import BlobStorageBackend, settings
+
+
+def create_blob_storage() -> Optional[BlobStorage]:
+    """
+    Create the blob storage selected in the settings.
+
+    :return: the blob storage, None if blobs are stored in the database.
+    """
+    if settings.blob_storage == BlobStorageBackend.FILESYSTEM:
+        return FilesystemStorage(settings.blob_storage_path)
+    if settings.blob_storage == BlobStorageBackend.S3:
+        return S3Storage(
+            endpoint_url=settings.s3_endpoint_url,
+            bucket=settings.s3_bucket,
+            access_key=settings.s3_access_key,
+            secret_key=settings.s3_secret_key,
+            region=settings.s3_region,
+            http_client=httpx.AsyncClient(),
+        )
+    return None
+
+
+def init_blob_storage(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the storage of PDFs and page images.
+
+    :param app: current fastapi application.
+    """
+    app.state.blob_storage = create_blob_storage()
+
+
+async def shutdown_blob_storage(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Closes the storage of PDFs and page images.
+
+    :param app: current FastAPI app.
+    """
+    if app.state.blob_storage is not None:
+        await app.state.blob_storage.close()
@@ -0,0 +1,183 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterable, Dict, Union
+from urllib.parse import quote, urlsplit
+
+import httpx
+
+from cv_copilot.services.storage.base import BlobNotFoundError, BlobStorage, read_chunks
+
+# Payload hash of requests whose body is streamed, and so not signed
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+
+class S3Storage(BlobStorage):
+    """
+    Blob storage in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    Requests are sent with the shared ``httpx`` client using path-style URLs
+    (``<endpoint>/<bucket>/<key>``) and signed with AWS Signature Version 4,
+    which every S3-compatible server supports, so no AWS SDK is needed.
+    """
+
+    service = "s3"
+
+    def __init__(  # noqa: WPS211
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        http_client: httpx.AsyncClient,
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.http_client = http_client
+
+    async def put(self, key: str, data: bytes) -> None:
+        """
+        Store a blob, replacing it if it exists.
+
+        :param key: key of the blob.
+        :param data: content of the blob.
+        """
+        response = await self._request("PUT", key, data)
+        response.raise_for_status()
+
+    async def put_file(self, key: str, path: Path) -> None:
+        """
+        Store a local file as a blob, streaming it in chunks.
+
+        S3 does not accept chunked transfer encoding for a plain PUT, so the
+        size of the file is sent upfront; the body itself is not signed.
+
+        :param key: key of the blob.
+        :param path: path of the file to store.
+        """
+        response = await self._request(
+            "PUT",
+            key,
+            read_chunks(path),
+            content_length=path.stat().st_size,
+        )
+        response.raise_for_status()
+
+    async def get(self, key: str) -> bytes:
+        """
+        Read a blob.
+
+        :param key: key of the blob.
+        :return: content of the blob.
+        :raises BlobNotFoundError: if the blob does not exist.
+        """
+        response = await self._request("GET", key)
+        if response.status_code == httpx.codes.NOT_FOUND:
+            raise BlobNotFoundError(f"Blob {key} not found")
+        response.raise_for_status()
+        return response.content
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a blob, if it exists.
+
+        :param key: key of the blob.
+        """
+        response = await self._request("DELETE", key)
+        if response.status_code != httpx.codes.NOT_FOUND:
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        """Close the HTTP client and its connection pool."""
+        await self.http_client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        data: Union[bytes, AsyncIterable[bytes]] = b"",
+        content_length: int = 0,
+    ) -> httpx.Response:
+        url = f"{self.endpoint_url}/{self.bucket}/{quote(key, safe='/')}"
+        now = datetime.now(timezone.utc)
+        if isinstance(data, bytes):
+            headers = self.sign(method, url, hashlib.sha256(data).hexdigest(), now)
+        else:
+            headers = self.sign(method, url, UNSIGNED_PAYLOAD, now)
+            headers["content-length"] = str(content_length)
+        return await self.http_client.request(
+            method,
+            url,
+            content=data,
+            headers=headers,
+        )
+
+    def sign(
+        self,
+        method: str,
+        url: str,
+        payload_hash: str,
+        now: datetime,
+    ) -> Dict[str, str]:
+        """
+        Build the headers of a request signed with AWS Signature Version 4.
+
+        :param method: HTTP method of the request.
+        :param url: URL of the request, already URL-encoded, without query.
+        :param payload_hash: hex digest of the SHA-256 hash of the body, or
+            UNSIGNED_PAYLOAD for a streamed body.
+        :param now: time of the request.
+        :return: headers to send with the request.
+        """
+        split_url = urlsplit(url)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+        headers = {
+            "host": split_url.netloc,
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+        }
+        signed_headers = ";".join(sorted(headers))
+        canonical_request = "\n".join(
+            [
+                method,
+                split_url.path,
+                "",
+                *(f"{name}:{headers[name]}" for name in sorted(headers)),
+                "",
+                signed_headers,
+                payload_hash,
+            ],
+        )
+        scope = f"{date}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ],
+        )
+        signing_key = f"AWS4{self.secret_key}".encode("utf-8")
+        for scope_part in (date, self.region, self.service, "aws4_request"):
+            signing_key = _hmac(signing_key, scope_part)
+        signature = hmac.new(
+            signing_key,
+            string_to_sign.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        return headers
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
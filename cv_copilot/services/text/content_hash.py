@@ -0,0 +1,27 @@
+import hashlib
+import unicodedata
+
+
+def normalize_job_description(description: str) -> str:
+    """
+    Normalize the text of a job description before hashing it.
+
+    Edits that do not change what the LLM reads, such as re-indenting the
+    text or adding blank lines, give the same normalized text: it is NFC
+    normalized, and each run of whitespace is a single space.
+
+    :param description: the text of the job description.
+    :return: the normalized text.
+    """
+    return " ".join(unicodedata.normalize("NFC", description).split())
+
+
+def job_description_content_hash(description: str) -> str:
+    """
+    Hash the normalized text of a job description.
+
+    :param description: the text of the job description.
+    :return: the hex digest of the SHA-256 hash of the normalized text.
+    """
+    normalized = normalize_job_description(description)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
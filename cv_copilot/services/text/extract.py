@@ -1,5 +1,10 @@
+from typing import Optional
+
+from openai import AsyncOpenAI
+
 from cv_copilot.db.models.job_descriptions import ParsedJobDescriptionModel
 from cv_copilot.db.models.texts import TextModel
+from cv_copilot.services.llm.cache import LLMCache
 from cv_copilot.services.llm.models.skills import EvaluationExtract, SkillsExtract
 from cv_copilot.services.llm.prompt_templates.cv import system_prompt_cv, user_prompt_cv
 from cv_copilot.services.llm.prompt_templates.job_descriptions import (
@@ -12,6 +17,8 @@ from cv_copilot.web.dto.job_description.schema import JobDescriptionModel
 
 async def parse_skills_job_description(
     job_description: JobDescriptionModel,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
 ) -> SkillsExtract:
     """Parse the skills from the job description.
 
@@ -22,6 +29,8 @@ async def parse_skills_job_description(
     following a 'model'.
 
     :param job_description: The complete JobDescription model used to extract the description.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
     :return: The parsed skills.
     """
 
@@ -30,20 +39,26 @@ async def parse_skills_job_description(
     )
 
     return await oa_async_request(
+        client=openai_client,
         system_prompt=system_prompt_job_description,
         user_prompt=formatted_user_prompt,
         response_model=SkillsExtract,
+        cache=llm_cache,
     )
 
 
 async def evaluate_cv(
     parsed_job_description: ParsedJobDescriptionModel,
     parsed_text: TextModel,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
 ) -> SkillsExtract:
     """
     Evaluate the CV.
 
     :param pdf_id: The ID of the PDF to evaluate.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
     """
     formatted_user_prompt = user_prompt_cv.format(
         parsed_skills=parsed_job_description.parsed_skills,
@@ -51,7 +66,9 @@ async def evaluate_cv(
     )
 
     return await oa_async_request(
+        client=openai_client,
         system_prompt=system_prompt_cv,
         user_prompt=formatted_user_prompt,
         response_model=EvaluationExtract,
+        cache=llm_cache,
     )
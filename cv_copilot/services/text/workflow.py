@@ -1,33 +1,89 @@
 import logging
+from typing import Optional
+
+from openai import AsyncOpenAI
+from prometheus_client import Counter
 
 from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO
 from cv_copilot.db.dao.texts import ParsedTextDAO
 from cv_copilot.db.models.job_descriptions import ParsedJobDescriptionModel
 from cv_copilot.db.models.texts import ParsedTextModel, TextModel
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.progress.publisher import (
+    ProgressCallback,
+    ProgressEvent,
+    ProgressStage,
+    ignore_progress,
+)
+from cv_copilot.services.text.content_hash import job_description_content_hash
 from cv_copilot.services.text.extract import evaluate_cv, parse_skills_job_description
 from cv_copilot.web.dto.job_description.schema import JobDescriptionModel
 
+JOB_DESCRIPTIONS_UNCHANGED = Counter(
+    "job_descriptions_unchanged",
+    "Job descriptions not parsed again because their description did not change.",
+)
+
 
 async def workflow_process_job_description(
     job_description: JobDescriptionModel,
     parsed_job_description_dao: ParsedJobDescriptionDAO,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
+    report_progress: ProgressCallback = ignore_progress,
+    reparse: bool = False,
 ) -> ParsedJobDescriptionModel:
     """Process the text in the job description
 
+    A job description whose normalized description did not change since it
+    was last parsed is not parsed again: its last parse is returned as is.
+
     :param job_description: The job description to process.
     :param parsed_job_description_dao: DAO for ParsedJobDescription models.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
+    :param report_progress: Called when the processing starts, and when it
+        ends or fails.
+    :param reparse: Parse the job description even if it did not change.
     :return: The parsed job description.
     """
     logging.info(f"Processing job description with id {job_description.id}")
-    job_extract = await parse_skills_job_description(job_description)
-    logging.info(f"Parsed skills: {job_extract.model_dump()}")
-    parsed_job_description = (
-        await parsed_job_description_dao.save_parsed_job_description(
-            job_description_id=job_description.id,
-            job_extract=job_extract,
+    content_hash = job_description_content_hash(job_description.description)
+    if not reparse:
+        parsed_job_description = (
+            await parsed_job_description_dao.get_parsed_job_description_by_id(
+                job_description.id,
+            )
         )
-    )
+        if (
+            parsed_job_description is not None
+            and parsed_job_description.content_hash == content_hash
+        ):
+            JOB_DESCRIPTIONS_UNCHANGED.inc()
+            logging.info(f"Job description {job_description.id} did not change")
+            await report_progress(ProgressEvent(stage=ProgressStage.PARSED))
+            return parsed_job_description
+
+    await report_progress(ProgressEvent(stage=ProgressStage.STARTED))
+    try:
+        job_extract = await parse_skills_job_description(
+            job_description,
+            openai_client,
+            llm_cache,
+        )
+        logging.info(f"Parsed skills: {job_extract.model_dump()}")
+        parsed_job_description = (
+            await parsed_job_description_dao.save_parsed_job_description(
+                job_description_id=job_description.id,
+                job_extract=job_extract,
+                content_hash=content_hash,
+            )
+        )
+    except Exception as e:
+        await report_progress(ProgressEvent(stage=ProgressStage.FAILED, error=str(e)))
+        raise
     logging.info(f"Saved parsed job description with id {parsed_job_description.id}")
+    await report_progress(ProgressEvent(stage=ProgressStage.PARSED))
     return parsed_job_description
 
 
@@ -37,6 +93,9 @@ async def workflow_evaluate_cv(
     pdf_id: int,
     parsed_text_dao: ParsedTextDAO,
     parsed_job_description_dao: ParsedJobDescriptionDAO,
+    openai_client: AsyncOpenAI,
+    llm_cache: Optional[LLMCache] = None,
+    parsed_job_description: Optional[ParsedJobDescriptionModel] = None,
 ) -> ParsedTextModel:
     """
     Process the text workflow.
@@ -45,19 +104,28 @@ async def workflow_evaluate_cv(
 
     :param text: The text to process.
     :param parsed_text: DAO for ParsedText models.
+    :param openai_client: The shared OpenAI client.
+    :param llm_cache: The LLM response cache, None to always call OpenAI.
+    :param parsed_job_description: The parse of the job description to
+        evaluate the CV against, None to use its last parse.
     :return: The parsed text.
     """
     try:
-        # Get the parsed job description skills from DB
-        parsed_job_description = (
-            await parsed_job_description_dao.get_parsed_job_description_by_id(job_id)
-        )
+        if parsed_job_description is None:
+            # Get the parsed job description skills from DB
+            parsed_job_description = (
+                await parsed_job_description_dao.get_parsed_job_description_by_id(
+                    job_id,
+                )
+            )
         if parsed_job_description is None:
             raise ValueError("Parsed job description not found")
         # Get the parsed job description skills from DB
         text_extracted = await evaluate_cv(
             parsed_job_description=parsed_job_description,
             parsed_text=text,
+            openai_client=openai_client,
+            llm_cache=llm_cache,
         )
         logging.info(f"Parsed skills: {text_extracted.model_dump()}")
         # Save and return the parsed text
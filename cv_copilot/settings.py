@@ -2,7 +2,7 @@ import enum
 import os
 from pathlib import Path
 from tempfile import gettempdir
-from typing import Optional
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 from pydantic.networks import HttpUrl
@@ -25,6 +25,38 @@ class LogLevel(str, enum.Enum):  # noqa: WPS600
     FATAL = "FATAL"
 
 
+class BlobStorageBackend(str, enum.Enum):  # noqa: WPS600
+    """Where the content of PDFs and page images is stored."""
+
+    DATABASE = "database"
+    FILESYSTEM = "filesystem"
+    S3 = "s3"
+
+
+class RenderProfileName(str, enum.Enum):  # noqa: WPS600
+    """Names of the profiles used to render PDF pages to JPG."""
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    ACCURATE = "accurate"
+    ADAPTIVE = "adaptive"
+
+
+class RenderProfile(TypedDict):
+    """Settings used to render PDF pages to JPG for the vision model."""
+
+    # Resolution used to rasterize the pages
+    dpi: int
+    # Render in shades of grey instead of colour
+    grayscale: bool
+    # Pages are downscaled so that neither side exceeds this many pixels
+    max_dimension: int
+    # JPEG quality, from 1 to 95
+    quality: int
+    # When set, quality and then size are lowered until the page fits the budget
+    max_page_bytes: Optional[int]
+
+
 class ResponseFormat(TypedDict, total=False):
     """Response format for GPT-4."""
 
@@ -78,15 +110,109 @@ class Settings(BaseSettings):
     # E.G. http://localhost:4317
     opentelemetry_endpoint: Optional[str] = None
 
+    # Storage of the content of PDFs and page images
+    blob_storage: BlobStorageBackend = BlobStorageBackend.DATABASE
+    # Directory of the "filesystem" storage
+    blob_storage_path: Path = TEMP_DIR / "cv_copilot_blobs"
+    # Bucket of the "s3" storage, on AWS or an S3-compatible server (e.g. MinIO)
+    s3_endpoint_url: str = "https://s3.amazonaws.com"
+    s3_bucket: str = "cv-copilot"
+    s3_region: str = "us-east-1"
+    s3_access_key: str = ""
+    s3_secret_key: str = ""
+
+    # Limits of the uploaded PDFs, larger files are rejected
+    max_upload_bytes: int = 10 * 1024 * 1024
+    max_upload_pages: int = 30
+    # Uploads are read in chunks of this size, in bytes
+    upload_chunk_size: int = 64 * 1024
+    # PDFs of a batch upload, the PDFs of its ZIP archives included
+    max_batch_files: int = 500
+    # PDFs of a batch sent to the workers at the same time
+    batch_enqueue_concurrency: int = 20
+
+    # Read the text layer of digital PDFs instead of sending pages to OCR
+    text_layer_enabled: bool = True
+    # Pages with fewer non-whitespace characters are sent to OCR
+    text_layer_min_chars: int = 100
+    # Pages with a higher share of unreadable characters are sent to OCR
+    text_layer_max_garbage_ratio: float = 0.05
+
+    # Profile used to render the pages that are sent to OCR
+    render_profile: RenderProfileName = RenderProfileName.BALANCED
+    render_profiles: Dict[RenderProfileName, RenderProfile] = {
+        RenderProfileName.FAST: {
+            "dpi": 100,
+            "grayscale": True,
+            "max_dimension": 1024,
+            "quality": 60,
+            "max_page_bytes": None,
+        },
+        RenderProfileName.BALANCED: {
+            "dpi": 150,
+            "grayscale": True,
+            "max_dimension": 1600,
+            "quality": 75,
+            "max_page_bytes": None,
+        },
+        RenderProfileName.ACCURATE: {
+            "dpi": 200,
+            "grayscale": False,
+            "max_dimension": 2048,
+            "quality": 90,
+            "max_page_bytes": None,
+        },
+        RenderProfileName.ADAPTIVE: {
+            "dpi": 200,
+            "grayscale": True,
+            "max_dimension": 2048,
+            "quality": 85,
+            "max_page_bytes": 250_000,
+        },
+    }
+
     # Background Tasks settings
+    # Seconds the result of a taskiq task is kept in Redis
+    task_result_ttl: int = 86400  # one day
+    # Also bounds the concurrent vision requests for the pages of one PDF
     parallel_tasks: int = 20
 
+    # Process pool for CPU-bound work (PDF rasterization, image encoding)
+    cpu_workers_count: int = 2
+    # Tasks that can be submitted at the same time before callers must wait
+    cpu_max_pending_tasks: int = 8
+    # Seconds to wait for a free slot before rejecting a task
+    cpu_queue_timeout: float = 60.0
+
     # OpenAPI settings
     openai_api_key: str = os.getenv("CV_COPILOT_OPENAI_API_KEY", "")
     seed: int = 12345
     temperature: float = 0.0  # noqa: WPS358
     max_tokens: int = 4096
 
+    # Connection pool of the shared OpenAI client
+    openai_max_connections: int = 50
+    openai_max_keepalive_connections: int = 20
+    # Seconds an idle connection is kept open
+    openai_keepalive_expiry: float = 60.0
+    # Seconds before a request (or opening a connection) times out
+    openai_timeout: float = 600.0
+    openai_connect_timeout: float = 10.0
+    openai_max_retries: int = 2
+
+    # Cache of LLM responses, in process (LRU) and in Redis
+    llm_cache_enabled: bool = True
+    # Seconds a response stays cached
+    llm_cache_ttl: int = 604800  # one week
+    llm_cache_local_max_entries: int = 1024
+    llm_cache_local_max_bytes: int = 64 * 1024 * 1024
+
+    # Progress of the processing, published in Redis
+    # Seconds the last event of a PDF or job description is kept
+    progress_event_ttl: int = 86400  # one day
+    # Seconds without event before a keep-alive is sent to the clients
+    progress_keepalive_interval: float = 15.0
+
     # Settings for GPT-4 Vision
     vision_model_name: str = "gpt-4-vision-preview"
     vision_prompt: str = "Read all the text in this image and give it back as JSON."
@@ -99,6 +225,14 @@ class Settings(BaseSettings):
     openai_hostname: HttpUrl = HttpUrl("https://api.openai.com")
     openai_chat_endpoint: str = "/v1/chat/completions"
 
+    @property
+    def page_render_profile(self) -> RenderProfile:
+        """Get the settings of the selected render profile.
+
+        :return: the selected render profile.
+        """
+        return self.render_profiles[self.render_profile]
+
     @property
     def openai_url_chat(self) -> str:
         """Build OpenAI URL for chat endpoint.
@@ -0,0 +1,134 @@
+"""
+Tasks executed by the taskiq workers.
+
+The processing of PDFs and job descriptions calls OpenAI and rasterizes
+documents, which can take minutes. It runs in separate worker processes
+(`taskiq worker cv_copilot.tkq:broker cv_copilot.tasks`), so that the API
+only enqueues it and the workers can be scaled independently. Results are
+stored in the result backend and exposed by the `/tasks/{task_id}` endpoint.
+"""
+import logging
+from typing import Optional
+
+from openai import AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
+from taskiq import TaskiqDepends
+
+from cv_copilot.db.dao.images import ImageDAO
+from cv_copilot.db.dao.job_descriptions import (
+    JobDescriptionDAO,
+    ParsedJobDescriptionDAO,
+)
+from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.dependencies import get_db_session
+from cv_copilot.services.cpu.dependency import get_cpu_executor
+from cv_copilot.services.cpu.executor import CPUExecutor
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.llm.dependency import get_llm_cache, get_openai_client
+from cv_copilot.services.pipeline.workflow import run_pdf_pipeline
+from cv_copilot.services.progress.dependency import get_progress_publisher
+from cv_copilot.services.progress.publisher import (
+    ProgressPublisher,
+    job_description_channel,
+    pdf_channel,
+)
+from cv_copilot.services.storage.base import BlobStorage
+from cv_copilot.services.storage.dependency import get_blob_storage
+from cv_copilot.services.text.workflow import workflow_process_job_description
+from cv_copilot.tkq import broker
+
+
+@broker.task(task_name="process_pdf")
+async def process_pdf_task(
+    job_id: int,
+    pdf_id: int,
+    bypass_cache: bool = False,
+    session: AsyncSession = TaskiqDepends(get_db_session),
+    cpu_executor: CPUExecutor = TaskiqDepends(get_cpu_executor),
+    openai_client: AsyncOpenAI = TaskiqDepends(get_openai_client),
+    llm_cache: Optional[LLMCache] = TaskiqDepends(get_llm_cache),
+    blob_storage: Optional[BlobStorage] = TaskiqDepends(get_blob_storage),
+    progress_publisher: ProgressPublisher = TaskiqDepends(get_progress_publisher),
+) -> int:
+    """
+    Convert a PDF to text and evaluate it against its job description.
+
+    The processing resumes from the stages completed by a previous run.
+    Its progress is published on the `pdf_channel` of the PDF.
+
+    :param job_id: ID of the job description related to the PDF.
+    :param pdf_id: ID of the PDF to process.
+    :param bypass_cache: Boolean to call OpenAI even if responses are cached.
+    :param session: Database session.
+    :param cpu_executor: Process pool used to rasterize the PDF.
+    :param openai_client: Shared OpenAI client.
+    :param llm_cache: Cache of LLM responses.
+    :param blob_storage: Storage of the PDFs and page images, None to keep
+        them in the database.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: ID of the created ParsedText.
+    """
+    if bypass_cache:
+        llm_cache = None
+    logging.info(f"Task: Process PDF ID {pdf_id}")
+    parsed_text = await run_pdf_pipeline(
+        pdf_id=pdf_id,
+        job_id=job_id,
+        pipeline_run_dao=PipelineRunDAO(session),
+        pdf_dao=PDFDAO(session, blob_storage),
+        image_dao=ImageDAO(session, blob_storage),
+        text_dao=TextDAO(session),
+        parsed_text_dao=ParsedTextDAO(session),
+        parsed_job_description_dao=ParsedJobDescriptionDAO(session),
+        cpu_executor=cpu_executor,
+        openai_client=openai_client,
+        llm_cache=llm_cache,
+        reevaluate=bypass_cache,
+        report_progress=progress_publisher.reporter(pdf_channel(pdf_id, job_id)),
+    )
+    return parsed_text.id
+
+
+@broker.task(task_name="process_job_description")
+async def process_job_description_task(
+    job_description_id: int,
+    bypass_cache: bool = False,
+    session: AsyncSession = TaskiqDepends(get_db_session),
+    openai_client: AsyncOpenAI = TaskiqDepends(get_openai_client),
+    llm_cache: Optional[LLMCache] = TaskiqDepends(get_llm_cache),
+    progress_publisher: ProgressPublisher = TaskiqDepends(get_progress_publisher),
+) -> int:
+    """
+    Parse the skills of a job description.
+
+    Its progress is published on the `job_description_channel` of the job
+    description.
+
+    :param job_description_id: ID of the job description to process.
+    :param bypass_cache: Boolean to call OpenAI even if responses are cached,
+        and parse the job description even if it did not change.
+    :param session: Database session.
+    :param openai_client: Shared OpenAI client.
+    :param llm_cache: Cache of LLM responses.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: ID of the created ParsedJobDescription.
+    :raises ValueError: If the job description is not found.
+    """
+    if bypass_cache:
+        llm_cache = None
+    job_description = await JobDescriptionDAO(session).get_job_description_by_id(
+        job_description_id,
+    )
+    if job_description is None:
+        raise ValueError(f"Job description with id {job_description_id} not found.")
+    parsed_job_description = await workflow_process_job_description(
+        job_description,
+        ParsedJobDescriptionDAO(session),
+        openai_client,
+        llm_cache,
+        progress_publisher.reporter(job_description_channel(job_description_id)),
+        reparse=bypass_cache,
+    )
+    return parsed_job_description.id
@@ -0,0 +1,193 @@
+import hashlib
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Dict
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+
+from cv_copilot.db.dao.images import ImageDAO
+from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.models.images import ImageModel
+from cv_copilot.db.models.pdfs import PDFBlobModel
+from cv_copilot.services.pdf.upload import spool_pdf_upload
+from cv_copilot.services.storage.base import BlobNotFoundError
+from cv_copilot.services.storage.filesystem import FilesystemStorage
+from cv_copilot.services.storage.s3 import S3Storage
+from cv_copilot.web.dto.job_description.schema import JobDescriptionDTO
+from cv_copilot.web.dto.pdfs.schema import PDFModelInputDTO
+
+
+@pytest.mark.anyio
+async def test_filesystem_storage(tmp_path: Path) -> None:
+    """Tests storing, reading and deleting blobs in a directory."""
+    storage = FilesystemStorage(tmp_path)
+
+    await storage.put("pdfs/abc.pdf", b"%PDF-1.4...")
+
+    assert await storage.get("pdfs/abc.pdf") == b"%PDF-1.4..."
+    await storage.delete("pdfs/abc.pdf")
+    await storage.delete("pdfs/abc.pdf")
+    with pytest.raises(BlobNotFoundError):
+        await storage.get("pdfs/abc.pdf")
+    with pytest.raises(ValueError):
+        await storage.put("../outside.pdf", b"")
+
+
+@pytest.mark.anyio
+async def test_s3_storage_signs_requests(tmp_path: Path) -> None:
+    """Tests the S3 storage against a fake bucket checking the signatures."""
+    bucket: Dict[str, bytes] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["authorization"].startswith(
+            "AWS4-HMAC-SHA256 Credential=access/",
+        )
+        key = request.url.path.removeprefix("/cvs/")
+        if request.method == "PUT":
+            assert request.headers["content-length"] == str(len(request.content))
+            bucket[key] = request.content
+            return httpx.Response(200)
+        if key not in bucket:
+            return httpx.Response(404)
+        if request.method == "DELETE":
+            del bucket[key]  # noqa: WPS420
+            return httpx.Response(204)
+        return httpx.Response(200, content=bucket[key])
+
+    storage = S3Storage(
+        endpoint_url="http://minio:9000/",
+        bucket="cvs",
+        access_key="access",
+        secret_key="secret",
+        region="us-east-1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    pdf_path = tmp_path / "cv.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 streamed...")
+
+    await storage.put("images/1/page.jpg", b"\xff\xd8\xff")
+    await storage.put_file("pdfs/cv.pdf", pdf_path)
+
+    assert bucket == {
+        "images/1/page.jpg": b"\xff\xd8\xff",
+        "pdfs/cv.pdf": b"%PDF-1.4 streamed...",
+    }
+    assert await storage.get("images/1/page.jpg") == b"\xff\xd8\xff"
+    await storage.delete("images/1/page.jpg")
+    await storage.delete("images/1/page.jpg")
+    with pytest.raises(BlobNotFoundError):
+        await storage.get("images/1/page.jpg")
+    await storage.close()
+
+
+@pytest.mark.anyio
+async def test_daos_keep_files_in_blob_storage(
+    tmp_path: Path,
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+) -> None:
+    """Tests that only the storage keys of the files are saved in the database."""
+    storage = FilesystemStorage(tmp_path)
+    pdf_dao = PDFDAO(dbsession, storage)
+    image_dao = ImageDAO(dbsession, storage)
+    pdf_file_content = b"%PDF-1.4 stored outside..."
+
+    upload_file = UploadFile(
+        filename="cv.pdf",
+        file=BytesIO(pdf_file_content),
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+    async with spool_pdf_upload(upload_file) as spooled_pdf:
+        pdf = await pdf_dao.upload_pdf(
+            PDFModelInputDTO(
+                name="cv.pdf",
+                job_id=create_job_description.id,
+                created_date=datetime(2023, 1, 1).isoformat(),
+            ),
+            spooled_pdf,
+        )
+    image_ids = await image_dao.save_images(
+        pdf.id,
+        create_job_description.id,
+        [b"\xff\xd8\xff page"],
+    )
+
+    blob_file = await dbsession.scalar(
+        select(PDFBlobModel.file).where(
+            PDFBlobModel.content_hash == hashlib.sha256(pdf_file_content).hexdigest(),
+        ),
+    )
+    assert blob_file is None
+    assert await pdf_dao.get_pdf_file(pdf.id) == pdf_file_content
+    image = await dbsession.get(ImageModel, image_ids[0])
+    assert image is not None
+    assert image.file is None
+    assert await image_dao.get_image_file(image) == b"\xff\xd8\xff page"
+
+    storage_key = image.storage_key
+    await image_dao.delete_image_by_id(image_ids[0])
+    with pytest.raises(BlobNotFoundError):
+        await storage.get(storage_key)
+
+
+@pytest.mark.anyio
+async def test_delete_pdf_deletes_its_files(
+    tmp_path: Path,
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+) -> None:
+    """Tests that the content of a PDF is deleted with the last PDF using it."""
+    storage = FilesystemStorage(tmp_path)
+    pdf_dao = PDFDAO(dbsession, storage)
+    image_dao = ImageDAO(dbsession, storage)
+    pdf_file_content = b"%PDF-1.4 deleted..."
+    content_hash = hashlib.sha256(pdf_file_content).hexdigest()
+    pdfs = []
+    for name in ("cv.pdf", "same-cv.pdf"):
+        upload_file = UploadFile(
+            filename=name,
+            file=BytesIO(pdf_file_content),
+            headers=Headers({"content-type": "application/pdf"}),
+        )
+        async with spool_pdf_upload(upload_file) as spooled_pdf:
+            pdfs.append(
+                await pdf_dao.upload_pdf(
+                    PDFModelInputDTO(
+                        name=name,
+                        job_id=create_job_description.id,
+                        created_date=datetime(2023, 1, 1).isoformat(),
+                    ),
+                    spooled_pdf,
+                ),
+            )
+    image_ids = await image_dao.save_images(
+        pdfs[0].id,
+        create_job_description.id,
+        [b"\xff\xd8\xff page"],
+    )
+    image = await dbsession.get(ImageModel, image_ids[0])
+    assert image is not None
+    image_key = image.storage_key
+    blob = await pdf_dao.get_blob_by_hash(content_hash)
+    assert blob is not None
+    blob_key = blob.storage_key
+
+    assert await pdf_dao.delete_pdf_by_id(pdfs[0].id)
+
+    with pytest.raises(BlobNotFoundError):
+        await storage.get(image_key)
+    # The other PDF still uses the content
+    assert await pdf_dao.get_pdf_file(pdfs[1].id) == pdf_file_content
+
+    assert await pdf_dao.delete_pdf_by_id(pdfs[1].id)
+
+    assert await pdf_dao.get_blob_by_hash(content_hash) is None
+    with pytest.raises(BlobNotFoundError):
+        await storage.get(blob_key)
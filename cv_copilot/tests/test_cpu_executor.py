@@ -0,0 +1,31 @@
+import asyncio
+import math
+import time
+
+import pytest
+
+from cv_copilot.services.cpu.executor import CPUExecutor, CPUExecutorBusyError
+
+
+@pytest.mark.anyio
+async def test_cpu_executor_runs_in_process_pool() -> None:
+    """Tests that functions are executed in the pool and their result returned."""
+    executor = CPUExecutor(max_workers=1, max_pending=2)
+    try:
+        assert await executor.run(math.factorial, 10) == 3628800
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_cpu_executor_rejects_when_queue_is_full() -> None:
+    """Tests that tasks are rejected when no slot frees up in time."""
+    executor = CPUExecutor(max_workers=1, max_pending=1, queue_timeout=0.01)
+    try:
+        slow_task = asyncio.create_task(executor.run(time.sleep, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(CPUExecutorBusyError):
+            await executor.run(math.factorial, 10)
+        await slow_task
+    finally:
+        executor.shutdown()
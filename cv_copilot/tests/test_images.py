@@ -1,4 +1,7 @@
+from typing import Any, List
+
 import pytest
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cv_copilot.db.dao.images import ImageDAO
@@ -20,13 +23,13 @@ async def test_upload_image(
     :param create_pdf: PDFModelDTO fixture.
     """
     dao = ImageDAO(dbsession)
-    test_encoded_image = "data:image/jpeg;base64,/9j/4AAQSkZJR"
+    test_image = b"\xff\xd8\xff\xe0\x00\x10JFIF"
 
     # Create an ImageModel instance for testing upload
     image_instance = ImageModel(
         pdf_id=create_pdf.id,
         job_id=create_job_description.id,
-        encoded_image=test_encoded_image,
+        file=test_image,
     )
 
     # Upload the image using the DAO
@@ -36,4 +39,70 @@ async def test_upload_image(
     assert uploaded_image is not None
     assert uploaded_image.pdf_id == create_pdf.id
     assert uploaded_image.job_id == create_job_description.id
-    assert uploaded_image.encoded_image == test_encoded_image
+    assert uploaded_image.file == test_image
+
+
+@pytest.mark.anyio
+async def test_save_images_in_one_statement(
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that the images of a document are inserted in one statement.
+
+    :param dbsession: AsyncSession fixture.
+    :param create_job_description: JobDescriptionDTO fixture.
+    :param create_pdf: PDFModelDTO fixture.
+    """
+    dao = ImageDAO(dbsession)
+    pages = [f"page-{page}".encode() for page in range(1, 6)]
+    statements: List[str] = []
+
+    def count_statement(*args: Any) -> None:
+        statements.append(args[2])
+
+    engine = dbsession.bind.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        image_ids = await dao.save_images(
+            create_pdf.id,
+            create_job_description.id,
+            pages,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    image_statements = [statement for statement in statements if "images" in statement]
+    assert len(image_statements) == 1
+    assert image_statements[0].startswith("INSERT INTO images")
+    images = await dao.get_images_by_ids(image_ids)
+    assert [image.file for image in images] == pages
+
+
+@pytest.mark.anyio
+async def test_get_page_images_without_bytes(
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that the pages of a PDF are listed without loading their bytes.
+
+    :param dbsession: AsyncSession fixture.
+    :param create_job_description: JobDescriptionDTO fixture.
+    :param create_pdf: PDFModelDTO fixture.
+    """
+    dao = ImageDAO(dbsession)
+    await dao.save_images(
+        create_pdf.id,
+        create_job_description.id,
+        [b"page-1", b"page-2"],
+        page_numbers=[1, 2],
+    )
+    dbsession.expunge_all()
+
+    images = await dao.get_page_images(create_pdf.id)
+
+    pages = {image.page_number: image for image in images}
+    assert sorted(pages) == [1, 2]
+    assert all("file" in inspect(image).unloaded for image in images)
+    assert await dao.get_image_file(pages[2]) == b"page-2"
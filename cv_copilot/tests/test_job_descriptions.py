@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from cv_copilot.db.dao.job_descriptions import (
+    JobDescriptionDAO,
+    ParsedJobDescriptionDAO,
+)
+from cv_copilot.db.dao.scores import ScoreDAO
+from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.services.llm.models.skills import (
+    EvaluationExtract,
+    Skills,
+    SkillsExtract,
+)
+from cv_copilot.services.text import workflow
+from cv_copilot.web.dto.job_description.schema import (
+    JobDescriptionDTO,
+    JobDescriptionInputDTO,
+)
+from cv_copilot.web.dto.pdfs.schema import PDFModelDTO
+from cv_copilot.web.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.mark.anyio
+async def test_job_description_dashboard(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that the PDFs are listed with their last score and evaluation."""
+    job_id = create_pdf.job_id
+    new_pdf = PDFModel(name="new.pdf", job_id=job_id, created_date=datetime(2024, 1, 1))
+    dbsession.add(new_pdf)
+    await dbsession.flush()
+    parsed_job_description = await ParsedJobDescriptionDAO(
+        dbsession,
+    ).save_parsed_job_description(
+        job_id,
+        SkillsExtract(required_skills=Skills(), nice_to_have_skills=Skills()),
+    )
+    text = await TextDAO(dbsession).save_text(pdf_id=create_pdf.id, text="CV")
+    for match in ("NO", "YES"):
+        python_skill = {
+            "name": "Python",
+            "match": match,
+            "content_match": "",
+            "reasoning": "",
+        }
+        await ParsedTextDAO(dbsession).save_parsed_text(
+            text=text,
+            job_id=job_id,
+            pdf_id=create_pdf.id,
+            text_extracted=EvaluationExtract.model_validate(
+                {
+                    "required_skills": {
+                        "hard_skills": {"Python": python_skill},
+                        "soft_skills": {},
+                    },
+                    "nice_to_have_skills": {"hard_skills": {}, "soft_skills": {}},
+                },
+            ),
+        )
+    score_dao = ScoreDAO(dbsession)
+    for score in (0.2, 0.6):
+        await score_dao.save_score(
+            pdf_id=create_pdf.id,
+            job_description_id=job_id,
+            parsed_job_description_id=parsed_job_description.id,
+            score=score,
+        )
+    url = fastapi_app.url_path_for(
+        "get_job_description_dashboard",
+        job_description_id=job_id,
+    )
+
+    first_page = await client.get(url, params={"limit": 1})
+    second_page = await client.get(
+        url,
+        params={"limit": 1, "cursor": first_page.headers[NEXT_CURSOR_HEADER]},
+    )
+    scores_only = await client.get(url, params={"fields": "score"})
+
+    assert first_page.status_code == status.HTTP_200_OK
+    [new_entry] = first_page.json()
+    assert new_entry["id"] == new_pdf.id
+    assert new_entry["score"] is None
+    assert new_entry["evaluation"] is None
+    [entry] = second_page.json()
+    assert entry["id"] == create_pdf.id
+    assert entry["score"] == 0.6
+    evaluation = entry["evaluation"]["parsed_skills"]
+    assert evaluation["required_skills"]["hard_skills"]["Python"]["match"] == "YES"
+    assert [(entry["score"], entry["evaluation"]) for entry in scores_only.json()] == [
+        (None, None),
+        (0.6, None),
+    ]
+
+
+@pytest.mark.anyio
+async def test_process_unchanged_job_description(
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that a job description is parsed again only when it changes."""
+    parse = mocker.patch.object(
+        workflow,
+        "parse_skills_job_description",
+        return_value=SkillsExtract(
+            required_skills=Skills(),
+            nice_to_have_skills=Skills(),
+        ),
+    )
+    job_description_dao = JobDescriptionDAO(dbsession)
+    parsed_job_description_dao = ParsedJobDescriptionDAO(dbsession)
+
+    async def process(description: str, reparse: bool = False) -> int:
+        await job_description_dao.update_job_description(
+            create_job_description.id,
+            JobDescriptionInputDTO(title="Title", description=description),
+        )
+        job_description = await job_description_dao.get_job_description_by_id(
+            create_job_description.id,
+        )
+        parsed_job_description = await workflow.workflow_process_job_description(
+            job_description,
+            parsed_job_description_dao,
+            openai_client=None,
+            reparse=reparse,
+        )
+        return parsed_job_description.id
+
+    first_id = await process("Python  developer")
+    assert await process(" Python\ndeveloper ") == first_id
+    assert parse.call_count == 1
+    edited_id = await process("Senior Python developer")
+    assert edited_id != first_id
+    assert parse.call_count == 2
+    assert await process("Senior Python developer", reparse=True) != edited_id
+    assert parse.call_count == 3
@@ -0,0 +1,57 @@
+import pytest
+from pytest_mock import MockerFixture
+from redis.asyncio import ConnectionPool
+
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.llm.models.skills import Skills, SkillsExtract
+from cv_copilot.services.llm.utils import oa_async_request
+
+
+@pytest.mark.anyio
+async def test_llm_cache_shares_entries_through_redis(
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """Tests that entries cached by one process are found by another one."""
+    first_cache = LLMCache(fake_redis_pool, ttl=60, max_entries=8, max_bytes=1024)
+    second_cache = LLMCache(fake_redis_pool, ttl=60, max_entries=8, max_bytes=1024)
+    key = LLMCache.make_key({"model": "gpt", "messages": ["hello"]})
+
+    assert await second_cache.get(key) is None
+    await first_cache.set(key, "response")
+
+    assert await second_cache.get(key) == "response"
+
+
+@pytest.mark.anyio
+async def test_llm_cache_evicts_least_recently_used_entries() -> None:
+    """Tests that the in-process tier is bounded in entries and in size."""
+    cache = LLMCache(redis_pool=None, ttl=60, max_entries=2, max_bytes=10)
+    await cache.set("a", "aaa")
+    await cache.set("b", "bbb")
+    assert await cache.get("a") == "aaa"
+
+    await cache.set("c", "ccc")
+    assert await cache.get("b") is None
+    await cache.set("d", "dddddddd")
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") is None
+    assert await cache.get("d") == "dddddddd"
+
+
+@pytest.mark.anyio
+async def test_oa_async_request_uses_cache(mocker: MockerFixture) -> None:
+    """Tests that an identical request is answered from the cache."""
+    skills = SkillsExtract(required_skills=Skills(), nice_to_have_skills=Skills())
+    client = mocker.Mock()
+    client.chat.completions.create = mocker.AsyncMock(return_value=skills)
+    cache = LLMCache(redis_pool=None, ttl=60, max_entries=8, max_bytes=1024)
+
+    responses = [
+        await oa_async_request(client, "system", "user", SkillsExtract, cache)
+        for _ in range(2)
+    ]
+    await oa_async_request(client, "system", "other user", SkillsExtract, cache)
+
+    assert responses == [skills, skills]
+    assert client.chat.completions.create.await_count == 2
@@ -0,0 +1,304 @@
+import asyncio
+import random
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional
+
+import pytest
+from PIL import Image
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.texts import TextDAO
+from cv_copilot.services.pdf import processing, workflow
+from cv_copilot.services.pdf.processing import is_text_layer_usable
+from cv_copilot.services.progress.publisher import ProgressEvent
+from cv_copilot.settings import RenderProfileName, settings
+from cv_copilot.web.dto.pdfs.schema import PDFModelDTO
+
+DIGITAL_PAGE = "Experienced Python developer with ten years of FastAPI. " * 5
+
+
+class InlineExecutor:
+    """CPU executor running functions inline, for tests."""
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return func(*args)
+
+
+def _completion(content: str) -> Any:
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.mark.anyio
+async def test_ocr_pdf_pages_streams_pages_in_order(
+    mocker: MockerFixture,
+) -> None:
+    """Tests that pages are sent to OCR as soon as rendered, and kept in order."""
+    events: List[str] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    def fake_render_pdf_pages(
+        pdf_file: bytes,
+        pdf_id: int,
+        profile: Any,
+        page_numbers: List[int],
+    ) -> List[bytes]:
+        events.append(f"render-{page_numbers[0]}")
+        return [f"page-{page_numbers[0]}".encode()]
+
+    async def fake_save_images(
+        pdf_id: int,
+        job_id: int,
+        images: List[bytes],
+        page_numbers: List[int],
+    ) -> Any:
+        return [10 + page_number for page_number in page_numbers]
+
+    async def fake_get_text_from_image(
+        client: Any,
+        image: bytes,
+        cache: Any = None,
+    ) -> Any:
+        nonlocal in_flight, max_in_flight
+        page = image.decode()
+        events.append(f"ocr-{page}")
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later pages answer first.
+        await asyncio.sleep(0.01 * (5 - int(page.split("-")[1])))
+        in_flight -= 1
+        if page == "page-3":
+            raise RuntimeError("vision request failed")
+        return _completion(f"[{page}]")
+
+    mocker.patch.object(workflow, "count_pdf_pages", return_value=4)
+    mocker.patch.object(workflow, "render_pdf_pages", fake_render_pdf_pages)
+    mocker.patch.object(workflow, "get_text_from_image", fake_get_text_from_image)
+    mocker.patch.object(workflow.settings, "parallel_tasks", 2)
+    image_dao = mocker.AsyncMock()
+    image_dao.get_page_images.return_value = []
+    image_dao.save_images.side_effect = fake_save_images
+    progress: List[ProgressEvent] = []
+
+    async def report_progress(event: ProgressEvent) -> None:
+        progress.append(event)
+
+    pages_text = await workflow.ocr_pdf_pages(
+        SimpleNamespace(id=1, job_id=1),
+        b"%PDF-1.4...",
+        None,
+        image_dao,
+        InlineExecutor(),
+        mocker.Mock(),
+        report_progress=report_progress,
+    )
+
+    assert pages_text == ["[page-1]", "[page-2]", None, "[page-4]"]
+    assert max_in_flight == 2
+    assert events.index("ocr-page-1") < events.index("render-4")
+    # Each page is reported once converted, not in page order.
+    assert progress[0].page == 2
+    assert sorted((event.page, event.pages, event.success) for event in progress) == [
+        (1, 4, True),
+        (2, 4, True),
+        (3, 4, False),
+        (4, 4, True),
+    ]
+    # The images are saved once per window of `parallel_tasks` pages.
+    assert [
+        save_call.kwargs["page_numbers"]
+        for save_call in image_dao.save_images.await_args_list
+    ] == [[1, 2], [3, 4]]
+    image_dao.save_pages_text.assert_awaited_once_with(
+        {11: "[page-1]", 12: "[page-2]", 14: "[page-4]"},
+    )
+
+
+@pytest.mark.anyio
+async def test_ocr_pdf_pages_resumes_from_saved_pages(mocker: MockerFixture) -> None:
+    """Tests that only the pages without a saved text are converted again."""
+    render_pdf_pages = mocker.patch.object(
+        workflow,
+        "render_pdf_pages",
+        return_value=[b"page-3"],
+    )
+    get_text_from_image = mocker.patch.object(
+        workflow,
+        "get_text_from_image",
+        side_effect=lambda client, image, cache: _completion(f"[{image.decode()}]"),
+    )
+    image_dao = mocker.AsyncMock()
+    image_dao.get_page_images.return_value = [
+        SimpleNamespace(id=11, page_number=1, text="[page-1]"),
+        # Rendered by the previous run, but its conversion failed.
+        SimpleNamespace(id=12, page_number=2, text=None),
+    ]
+    image_dao.get_image_file.return_value = b"page-2"
+    image_dao.save_images.return_value = [13]
+
+    pages_text = await workflow.ocr_pdf_pages(
+        SimpleNamespace(id=1, job_id=1),
+        b"%PDF-1.4...",
+        [1, 2, 3],
+        image_dao,
+        InlineExecutor(),
+        mocker.Mock(),
+    )
+
+    assert pages_text == ["[page-1]", "[page-2]", "[page-3]"]
+    assert render_pdf_pages.call_count == 1
+    assert get_text_from_image.call_count == 2
+    image_dao.save_images.assert_awaited_once_with(
+        1,
+        1,
+        [b"page-3"],
+        page_numbers=[3],
+    )
+    image_dao.save_pages_text.assert_awaited_once_with(
+        {12: "[page-2]", 13: "[page-3]"},
+    )
+
+
+def test_is_text_layer_usable() -> None:
+    """Tests the detection of pages that need OCR."""
+    assert is_text_layer_usable(DIGITAL_PAGE, min_chars=100, max_garbage_ratio=0.05)
+    assert not is_text_layer_usable("  \n ", min_chars=100, max_garbage_ratio=0.05)
+    assert not is_text_layer_usable(
+        "�\x01" * 100,
+        min_chars=100,
+        max_garbage_ratio=0.05,
+    )
+
+
+@pytest.mark.anyio
+async def test_process_pdf_workflow_only_ocrs_pages_without_text(
+    mocker: MockerFixture,
+) -> None:
+    """Tests that only pages without a usable text layer are sent to OCR."""
+    pdf = SimpleNamespace(id=1, job_id=1, content_hash="hash")
+    pdf_dao = mocker.AsyncMock()
+    pdf_dao.get_pdf_by_id.return_value = pdf
+    pdf_dao.get_pdf_file.return_value = b"%PDF-1.4..."
+    text_dao = mocker.AsyncMock()
+    text_dao.get_text_by_content_hash.return_value = None
+    text_dao.save_text.side_effect = lambda pdf_id, text, complete: text
+    mocker.patch.object(
+        workflow,
+        "extract_text_layer",
+        return_value=[DIGITAL_PAGE, "", DIGITAL_PAGE],
+    )
+    rasterized_pages: List[Optional[List[int]]] = []
+
+    async def fake_ocr_pdf_pages(
+        pdf: Any,
+        pdf_file: bytes,
+        page_numbers: Optional[List[int]],
+        *args: Any,
+    ) -> List[str]:
+        rasterized_pages.append(page_numbers)
+        return ["scanned page"]
+
+    mocker.patch.object(workflow, "ocr_pdf_pages", fake_ocr_pdf_pages)
+
+    text, failed_pages = await workflow.process_pdf_workflow(
+        pdf_id=1,
+        pdf_dao=pdf_dao,
+        image_dao=mocker.AsyncMock(),
+        text_dao=text_dao,
+        cpu_executor=InlineExecutor(),
+        openai_client=mocker.Mock(),
+    )
+
+    assert rasterized_pages == [[2]]
+    assert text == "\n".join([DIGITAL_PAGE, "scanned page", DIGITAL_PAGE])
+    assert failed_pages == []
+    assert text_dao.save_text.call_args.kwargs["complete"]
+
+
+@pytest.mark.anyio
+async def test_process_pdf_workflow_reuses_text_of_duplicate_pdf(
+    mocker: MockerFixture,
+) -> None:
+    """Tests that a PDF with already processed content is not processed again."""
+    pdf_dao = mocker.AsyncMock()
+    pdf_dao.get_pdf_by_id.return_value = SimpleNamespace(
+        id=2,
+        job_id=2,
+        content_hash="hash",
+    )
+    text_dao = mocker.AsyncMock()
+    text_dao.get_text_by_content_hash.return_value = SimpleNamespace(
+        pdf_id=1,
+        text=DIGITAL_PAGE,
+    )
+    text_dao.save_text.side_effect = lambda pdf_id, text: (pdf_id, text)
+    ocr_pdf_pages = mocker.patch.object(workflow, "ocr_pdf_pages")
+
+    text, _ = await workflow.process_pdf_workflow(
+        pdf_id=2,
+        pdf_dao=pdf_dao,
+        image_dao=mocker.AsyncMock(),
+        text_dao=text_dao,
+        cpu_executor=InlineExecutor(),
+        openai_client=mocker.Mock(),
+    )
+
+    assert text == (2, DIGITAL_PAGE)
+    pdf_dao.get_pdf_file.assert_not_called()
+    ocr_pdf_pages.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_text_with_failed_pages_is_not_reused(
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that only texts without failed pages are reused for duplicates."""
+    text_dao = TextDAO(dbsession)
+    pdf = await PDFDAO(dbsession).get_pdf_by_id(create_pdf.id)
+    assert pdf is not None
+    text = await text_dao.save_text(pdf_id=pdf.id, text="page 1\n", complete=False)
+
+    assert await text_dao.get_text_by_content_hash(pdf.content_hash) is None
+
+    await text_dao.update_text(text_id=text.id, text="page 1\npage 2")
+    reused_text = await text_dao.get_text_by_content_hash(pdf.content_hash)
+    assert reused_text is not None
+    assert reused_text.id == text.id
+
+
+def test_render_pdf_pages_applies_render_profile(mocker: MockerFixture) -> None:
+    """Tests that pages are rendered and downscaled following the profile."""
+    convert_from_bytes = mocker.patch.object(
+        processing.pdf2image.pdf2image,
+        "convert_from_bytes",
+        return_value=[Image.new("L", (2000, 1000), color=255)],
+    )
+    profile = settings.render_profiles[RenderProfileName.FAST]
+
+    jpegs = processing.render_pdf_pages(b"%PDF-1.4...", 1, profile, [2])
+
+    convert_from_bytes.assert_called_once_with(
+        b"%PDF-1.4...",
+        dpi=profile["dpi"],
+        grayscale=True,
+        first_page=2,
+        last_page=2,
+    )
+    with Image.open(BytesIO(jpegs[0])) as image:
+        assert image.size == (1024, 512)
+        assert image.mode == "L"
+
+
+def test_encode_jpeg_fits_byte_budget() -> None:
+    """Tests that adaptive encoding lowers quality and size to fit the budget."""
+    noise = Image.frombytes("L", (1200, 1200), random.Random(0).randbytes(1440000))
+
+    unbounded = processing.encode_jpeg(noise, quality=95)
+    bounded = processing.encode_jpeg(noise, quality=95, max_bytes=len(unbounded) // 4)
+
+    assert len(bounded) <= len(unbounded) // 4
@@ -1,16 +1,46 @@
+import hashlib
 import uuid
+import zipfile
 from datetime import datetime
 from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 
 import pytest
 from fastapi import FastAPI, UploadFile
 from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy import func, inspect, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from starlette.datastructures import Headers
 
 from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.dao.texts import TextDAO
+from cv_copilot.db.dao.upload_batches import UploadBatchDAO
+from cv_copilot.db.models.pdfs import PDFBlobModel
+from cv_copilot.db.models.pipeline_runs import PipelineStage
+from cv_copilot.db.models.texts import ParsedTextModel
+from cv_copilot.services.cpu.dependency import get_cpu_executor
+from cv_copilot.services.cpu.executor import CPUExecutorBusyError
+from cv_copilot.services.pdf.batch import ingest_pdf_batch
+from cv_copilot.services.pdf.upload import spool_pdf_upload
+from cv_copilot.services.progress.dependency import get_progress_publisher
+from cv_copilot.services.progress.publisher import (
+    ProgressEvent,
+    ProgressStage,
+    pdf_channel,
+)
+from cv_copilot.services.storage.dependency import get_blob_storage
+from cv_copilot.services.storage.filesystem import FilesystemStorage
+from cv_copilot.settings import settings
+from cv_copilot.web.api.pdfs import views as pdf_views
 from cv_copilot.web.dto.job_description.schema import JobDescriptionDTO
+from cv_copilot.web.dto.pdfs.schema import PDFModelInputDTO
+from cv_copilot.web.pagination import NEXT_CURSOR_HEADER
 
 
 @pytest.mark.anyio
@@ -19,8 +49,13 @@ async def test_upload_pdf(
     client: AsyncClient,
     dbsession: AsyncSession,
     create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
 ) -> None:
     """Tests PDF upload."""
+    # The pages are counted by poppler, in the process pool.
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=1)
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
     url = fastapi_app.url_path_for("upload_pdf")
     test_name = uuid.uuid4().hex
     test_job_id = (
@@ -68,3 +103,418 @@ async def test_upload_pdf(
     pdf_instance = await dao.get_pdf_by_id(pdf_data["id"])
     assert pdf_instance is not None
     assert pdf_instance.name == test_name
+
+
+@pytest.mark.anyio
+async def test_upload_pdf_limits(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that PDFs with too many bytes or pages are rejected."""
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=settings.max_upload_pages + 1)
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
+    url = fastapi_app.url_path_for("upload_pdf")
+    data = {
+        "name": "large.pdf",
+        "job_id": create_job_description.id,
+        "created_date": datetime(2023, 1, 1).isoformat(),
+    }
+    files = {"pdf_file": ("large.pdf", b"%PDF-1.4 large...", "application/pdf")}
+
+    too_many_pages = await client.post(url, files=files, data=data)
+    mocker.patch.object(settings, "max_upload_bytes", 8)
+    mocker.patch.object(settings, "upload_chunk_size", 4)
+    too_many_bytes = await client.post(url, files=files, data=data)
+
+    assert too_many_pages.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert too_many_bytes.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert cpu_executor.run.await_count == 1
+    blob_count = await dbsession.scalar(
+        select(func.count()).select_from(PDFBlobModel),
+    )
+    assert blob_count == 0
+
+
+@pytest.mark.anyio
+async def test_upload_pdf_batch(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that the PDFs of files and ZIP archives are added as a batch."""
+    cpu_executor = mocker.Mock()
+    # The last PDF of the archive has too many pages, and the pages of the
+    # last PDF cannot be counted.
+    cpu_executor.run = mocker.AsyncMock(
+        side_effect=[
+            1,
+            2,
+            settings.max_upload_pages + 1,
+            CPUExecutorBusyError("busy"),
+        ],
+    )
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
+    kiq = mocker.patch.object(
+        pdf_views.process_pdf_task,
+        "kiq",
+        return_value=SimpleNamespace(task_id="task-id"),
+    )
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as archive_file:
+        archive_file.writestr("cvs/second.pdf", b"%PDF-1.4 second...")
+        archive_file.writestr("cvs/notes.txt", b"not a CV")
+        archive_file.writestr("__MACOSX/cvs/._second.pdf", b"metadata")
+        archive_file.writestr("cvs/corrupt.pdf", b"%PDF-1.4 corrupt...")
+        archive_file.writestr("cvs/long.pdf", b"%PDF-1.4 long...")
+    # The content does not match the CRC-32 of the file anymore.
+    archive_content = archive.getvalue().replace(
+        b"%PDF-1.4 corrupt...",
+        b"%PDF-1.4 CORRUPT...",
+    )
+    job_id = create_job_description.id
+
+    response = await client.post(
+        fastapi_app.url_path_for("upload_pdf_batch"),
+        files=[
+            ("files", ("first.pdf", b"%PDF-1.4 first...", "application/pdf")),
+            ("files", ("cvs.zip", archive_content, "application/zip")),
+            ("files", ("broken.zip", b"not a ZIP archive", "application/zip")),
+            ("files", ("busy.pdf", b"%PDF-1.4 busy...", "application/pdf")),
+        ],
+        data={"job_id": job_id},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    batch = response.json()
+    assert len(batch["pdf_ids"]) == 2
+    assert [rejected["name"] for rejected in batch["rejected_files"]] == [
+        "corrupt.pdf",
+        "long.pdf",
+        "broken.zip",
+        "busy.pdf",
+    ]
+    assert kiq.await_count == 2
+    pdfs = await client.get(
+        fastapi_app.url_path_for("get_pdfs"),
+        params={"job_id": job_id},
+    )
+    assert {pdf["name"] for pdf in pdfs.json()} == {"first.pdf", "second.pdf"}
+
+    url = fastapi_app.url_path_for("get_pdf_batch_progress", batch_id=batch["id"])
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["stages"] == {"queued": 2}
+    progress_publisher = fastapi_app.dependency_overrides[get_progress_publisher]()
+    await progress_publisher.publish(
+        pdf_channel(batch["pdf_ids"][0], job_id),
+        ProgressEvent(stage=ProgressStage.EVALUATED),
+    )
+    progress = (await client.get(url)).json()
+    assert progress["pdf_count"] == 2
+    assert progress["stages"] == {"evaluated": 1, "queued": 1}
+    assert progress["done"] == 1
+
+    response = await client.get(
+        fastapi_app.url_path_for("get_pdf_batch_progress", batch_id=batch["id"] + 1),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_upload_pdf_batch_with_enqueue_failures(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that the PDFs that cannot be sent to the workers are returned."""
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=1)
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
+    progress_publisher = fastapi_app.dependency_overrides[get_progress_publisher]()
+    job_id = create_job_description.id
+    pdf_ids = []
+
+    async def fake_kiq(job_id: int, pdf_id: int) -> Any:
+        pdf_ids.append(pdf_id)
+        if len(pdf_ids) == 2:
+            raise ConnectionError("broker unavailable")
+        # The worker starts before the PDF is reported as queued.
+        await progress_publisher.publish(
+            pdf_channel(pdf_id, job_id),
+            ProgressEvent(stage=ProgressStage.STARTED),
+        )
+        return SimpleNamespace(task_id="task-id")
+
+    mocker.patch.object(pdf_views.process_pdf_task, "kiq", side_effect=fake_kiq)
+
+    response = await client.post(
+        fastapi_app.url_path_for("upload_pdf_batch"),
+        files=[
+            ("files", ("first.pdf", b"%PDF-1.4 first...", "application/pdf")),
+            ("files", ("second.pdf", b"%PDF-1.4 second...", "application/pdf")),
+        ],
+        data={"job_id": job_id},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    batch = response.json()
+    assert batch["enqueue_failures"] == [
+        {"pdf_id": pdf_ids[1], "reason": "broker unavailable"},
+    ]
+    progress = (
+        await client.get(
+            fastapi_app.url_path_for("get_pdf_batch_progress", batch_id=batch["id"]),
+        )
+    ).json()
+    assert progress["stages"] == {"started": 1, "pending": 1}
+
+
+@pytest.mark.anyio
+async def test_pdf_batch_progress_without_events(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that an evaluated PDF is done once its events have expired."""
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=1)
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
+    job_id = create_job_description.id
+    response = await client.post(
+        fastapi_app.url_path_for("upload_pdf_batch"),
+        files=[
+            ("files", ("first.pdf", b"%PDF-1.4 first...", "application/pdf")),
+            ("files", ("second.pdf", b"%PDF-1.4 second...", "application/pdf")),
+        ],
+        data={"job_id": job_id, "process_after_upload": False},
+    )
+    batch = response.json()
+    pdf_id = batch["pdf_ids"][0]
+    # Evaluated with a page that failed OCR, so the run stays RASTERIZED.
+    text = await TextDAO(dbsession).save_text(pdf_id=pdf_id, text="CV", complete=False)
+    parsed_text = ParsedTextModel(
+        job_description_id=job_id,
+        text_id=text.id,
+        pdf_id=pdf_id,
+        parsed_skills={},
+    )
+    dbsession.add(parsed_text)
+    await dbsession.commit()
+    pipeline_run_dao = PipelineRunDAO(dbsession)
+    await pipeline_run_dao.update_run(
+        await pipeline_run_dao.get_or_create_run(pdf_id, job_id),
+        PipelineStage.RASTERIZED,
+        text_id=text.id,
+        parsed_text_id=parsed_text.id,
+    )
+
+    response = await client.get(
+        fastapi_app.url_path_for("get_pdf_batch_progress", batch_id=batch["id"]),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    progress = response.json()
+    assert progress["stages"] == {"rasterized": 1, "pending": 1}
+    assert progress["done"] == 1
+
+
+@pytest.mark.anyio
+async def test_upload_too_large_pdf_batch_stores_nothing(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that a batch with too many PDFs is rejected before storing any."""
+    mocker.patch.object(settings, "max_batch_files", 2)
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=1)
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as archive_file:
+        archive_file.writestr("second.pdf", b"%PDF-1.4 second...")
+        archive_file.writestr("third.pdf", b"%PDF-1.4 third...")
+
+    response = await client.post(
+        fastapi_app.url_path_for("upload_pdf_batch"),
+        files=[
+            ("files", ("first.pdf", b"%PDF-1.4 first...", "application/pdf")),
+            ("files", ("cvs.zip", archive.getvalue(), "application/zip")),
+        ],
+        data={"job_id": create_job_description.id},
+    )
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    cpu_executor.run.assert_not_called()
+    assert await dbsession.scalar(select(func.count(PDFBlobModel.id))) == 0
+
+
+@pytest.mark.anyio
+async def test_failed_pdf_batch_deletes_stored_files(
+    tmp_path: Path,
+    dbsession: AsyncSession,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that the files stored by a batch that fails are deleted."""
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(side_effect=[1, OSError("disk full")])
+    uploads = [
+        UploadFile(
+            filename=name,
+            file=BytesIO(f"%PDF-1.4 {name}...".encode()),
+            headers=Headers({"content-type": "application/pdf"}),
+        )
+        for name in ("first.pdf", "second.pdf")
+    ]
+
+    with pytest.raises(OSError):
+        await ingest_pdf_batch(
+            uploads,
+            1,
+            PDFDAO(dbsession, FilesystemStorage(tmp_path)),
+            UploadBatchDAO(dbsession),
+            cpu_executor,
+        )
+
+    assert not list(tmp_path.rglob("*.pdf"))
+
+
+@pytest.mark.anyio
+async def test_upload_pdf_batch_of_unknown_job_description(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    tmp_path: Path,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that a batch of an unknown job description stores nothing."""
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=1)
+    fastapi_app.dependency_overrides[get_cpu_executor] = lambda: cpu_executor
+    storage = FilesystemStorage(tmp_path)
+    fastapi_app.dependency_overrides[get_blob_storage] = lambda: storage
+
+    response = await client.post(
+        fastapi_app.url_path_for("upload_pdf_batch"),
+        files=[("files", ("first.pdf", b"%PDF-1.4 first...", "application/pdf"))],
+        data={"job_id": 1},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    cpu_executor.run.assert_not_called()
+    assert not list(tmp_path.rglob("*.pdf"))
+
+
+@pytest.mark.anyio
+async def test_pdf_batch_of_unknown_job_description_deletes_stored_files(
+    tmp_path: Path,
+    dbsession: AsyncSession,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that the files are deleted when the batch cannot be added."""
+    cpu_executor = mocker.Mock()
+    cpu_executor.run = mocker.AsyncMock(return_value=1)
+    uploads = [
+        UploadFile(
+            filename="first.pdf",
+            file=BytesIO(b"%PDF-1.4 first..."),
+            headers=Headers({"content-type": "application/pdf"}),
+        ),
+    ]
+
+    with pytest.raises(IntegrityError):
+        await ingest_pdf_batch(
+            uploads,
+            1,
+            PDFDAO(dbsession, FilesystemStorage(tmp_path)),
+            UploadBatchDAO(dbsession),
+            cpu_executor,
+        )
+
+    cpu_executor.run.assert_awaited_once()
+    assert not list(tmp_path.rglob("*.pdf"))
+
+
+@pytest.mark.anyio
+async def test_upload_same_pdf_stores_content_once(
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+) -> None:
+    """Tests that uploading the same file twice stores its content only once."""
+    dao = PDFDAO(dbsession)
+    pdf_file_content = b"%PDF-1.4 duplicate..."
+    pdf_ids = []
+    for name in ("first.pdf", "second.pdf"):
+        upload_file = UploadFile(
+            filename=name,
+            file=BytesIO(pdf_file_content),
+            headers=Headers({"content-type": "application/pdf"}),
+        )
+        pdf_input = PDFModelInputDTO(
+            name=name,
+            job_id=create_job_description.id,
+            created_date=datetime(2023, 1, 1).isoformat(),
+        )
+        async with spool_pdf_upload(upload_file) as spooled_pdf:
+            pdf = await dao.upload_pdf(pdf_input, spooled_pdf)
+        pdf_ids.append(pdf.id)
+
+    first_pdf = await dao.get_pdf_by_id(pdf_ids[0])
+    second_pdf = await dao.get_pdf_by_id(pdf_ids[1])
+    assert first_pdf is not None and second_pdf is not None
+    assert first_pdf.content_hash == hashlib.sha256(pdf_file_content).hexdigest()
+    assert first_pdf.content_hash == second_pdf.content_hash
+
+    blob_count = await dbsession.scalar(
+        select(func.count()).select_from(PDFBlobModel),
+    )
+    assert blob_count == 1
+    blob = await dao.get_blob_by_hash(first_pdf.content_hash)
+    assert blob is not None
+    assert blob.size == len(pdf_file_content)
+    assert "file" in inspect(blob).unloaded
+    assert await dao.get_pdf_file(pdf_ids[1]) == pdf_file_content
+
+
+@pytest.mark.anyio
+async def test_get_pdfs_cursor_pagination(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_job_description: JobDescriptionDTO,
+) -> None:
+    """Tests that the PDFs are listed page by page with cursors."""
+    dao = PDFDAO(dbsession)
+    for index in range(3):
+        upload_file = UploadFile(
+            filename=f"{index}.pdf",
+            file=BytesIO(f"%PDF-1.4 {index}...".encode()),
+        )
+        pdf_input = PDFModelInputDTO(
+            name=f"{index}.pdf",
+            job_id=create_job_description.id,
+            # Same date for all of them, the ID breaks the tie.
+            created_date=datetime(2023, 1, 1).isoformat(),
+        )
+        async with spool_pdf_upload(upload_file) as spooled_pdf:
+            await dao.upload_pdf(pdf_input, spooled_pdf)
+    url = fastapi_app.url_path_for("get_pdfs")
+    params = {"job_id": create_job_description.id, "limit": 2}
+
+    first_page = await client.get(url, params=params)
+    next_cursor = first_page.headers[NEXT_CURSOR_HEADER]
+    second_page = await client.get(url, params={**params, "cursor": next_cursor})
+    invalid_cursor = await client.get(url, params={**params, "cursor": "invalid"})
+
+    names = [pdf["name"] for pdf in first_page.json() + second_page.json()]
+    assert names == ["2.pdf", "1.pdf", "0.pdf"]
+    assert NEXT_CURSOR_HEADER not in second_page.headers
+    assert invalid_cursor.status_code == status.HTTP_400_BAD_REQUEST
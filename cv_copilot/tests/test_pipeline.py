@@ -0,0 +1,142 @@
+from typing import Any, List, Optional
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.models.pipeline_runs import PipelineStage
+from cv_copilot.db.models.texts import ParsedTextModel, TextModel
+from cv_copilot.services.llm.models.skills import Skills, SkillsExtract
+from cv_copilot.services.pdf.workflow import ProcessedPDF
+from cv_copilot.services.pipeline import workflow
+from cv_copilot.services.progress.publisher import ProgressEvent, ProgressStage
+from cv_copilot.web.dto.pdfs.schema import PDFModelDTO
+
+
+@pytest.mark.anyio
+async def test_run_pdf_pipeline_resumes_from_first_incomplete_stage(
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that a run only does the stages that a previous run did not complete."""
+    text_dao = TextDAO(dbsession)
+    parsed_job_description_dao = ParsedJobDescriptionDAO(dbsession)
+    job_extract = SkillsExtract(required_skills=Skills(), nice_to_have_skills=Skills())
+    await parsed_job_description_dao.save_parsed_job_description(
+        create_pdf.job_id,
+        job_extract,
+    )
+    text_ids: List[Optional[int]] = []
+
+    async def fake_process_pdf_workflow(
+        pdf_id: int,
+        text_id: Optional[int],
+        **kwargs: Any,
+    ) -> ProcessedPDF:
+        text_ids.append(text_id)
+        if text_id is None:
+            # The second page fails OCR on the first run.
+            text = await text_dao.save_text(pdf_id=pdf_id, text="page 1\n")
+            return ProcessedPDF(text, [2])
+        text = await text_dao.update_text(text_id=text_id, text="page 1\npage 2")
+        return ProcessedPDF(text, [])
+
+    async def fake_workflow_evaluate_cv(
+        text: TextModel,
+        job_id: int,
+        pdf_id: int,
+        **kwargs: Any,
+    ) -> ParsedTextModel:
+        parsed_text = ParsedTextModel(
+            job_description_id=job_id,
+            text_id=text.id,
+            pdf_id=pdf_id,
+            parsed_skills={"text": text.text},
+        )
+        dbsession.add(parsed_text)
+        await dbsession.commit()
+        return parsed_text
+
+    process_pdf_workflow = mocker.patch.object(
+        workflow,
+        "process_pdf_workflow",
+        side_effect=fake_process_pdf_workflow,
+    )
+    workflow_evaluate_cv = mocker.patch.object(
+        workflow,
+        "workflow_evaluate_cv",
+        side_effect=fake_workflow_evaluate_cv,
+    )
+    pipeline_run_dao = PipelineRunDAO(dbsession)
+    progress: List[ProgressStage] = []
+
+    async def report_progress(event: ProgressEvent) -> None:
+        progress.append(event.stage)
+
+    async def run_pipeline(reevaluate: bool = False) -> ParsedTextModel:
+        return await workflow.run_pdf_pipeline(
+            pdf_id=create_pdf.id,
+            job_id=create_pdf.job_id,
+            pipeline_run_dao=pipeline_run_dao,
+            pdf_dao=mocker.AsyncMock(),
+            image_dao=mocker.AsyncMock(),
+            text_dao=text_dao,
+            parsed_text_dao=ParsedTextDAO(dbsession),
+            parsed_job_description_dao=parsed_job_description_dao,
+            cpu_executor=mocker.AsyncMock(),
+            openai_client=mocker.Mock(),
+            reevaluate=reevaluate,
+            report_progress=report_progress,
+        )
+
+    partial = await run_pipeline()
+    run = await pipeline_run_dao.get_run(create_pdf.id, create_pdf.job_id)
+    assert run is not None
+    assert run.stage == PipelineStage.RASTERIZED
+    assert partial.parsed_skills == {"text": "page 1\n"}
+    assert progress == [
+        ProgressStage.STARTED,
+        ProgressStage.RASTERIZED,
+        ProgressStage.EVALUATED,
+    ]
+
+    # The failed page is converted again, in the same text.
+    complete = await run_pipeline()
+    assert text_ids == [None, run.text_id]
+    assert complete.parsed_skills == {"text": "page 1\npage 2"}
+    assert run.stage == PipelineStage.EVALUATED
+    assert run.parsed_text_id == complete.id
+
+    # Nothing to do anymore.
+    progress.clear()
+    cached = await run_pipeline()
+    assert cached.id == complete.id
+    assert progress == [ProgressStage.EVALUATED]
+    assert process_pdf_workflow.call_count == 2
+    assert workflow_evaluate_cv.call_count == 2
+
+    reevaluated = await run_pipeline(reevaluate=True)
+    assert reevaluated.id != complete.id
+    assert process_pdf_workflow.call_count == 2
+    assert workflow_evaluate_cv.call_count == 3
+
+    # The job description was edited and parsed again: the text is evaluated
+    # against the new parse, without converting the PDF again.
+    parsed_job_description = (
+        await parsed_job_description_dao.save_parsed_job_description(
+            create_pdf.job_id,
+            job_extract,
+        )
+    )
+    progress.clear()
+    stale = await run_pipeline()
+    assert stale.id != reevaluated.id
+    assert progress == [ProgressStage.STARTED, ProgressStage.EVALUATED]
+    assert run.parsed_job_description_id == parsed_job_description.id
+    assert process_pdf_workflow.call_count == 2
+    assert workflow_evaluate_cv.call_count == 4
+    assert (await run_pipeline()).id == stale.id
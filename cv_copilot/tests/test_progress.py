@@ -0,0 +1,83 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from redis.asyncio import ConnectionPool
+from starlette import status
+
+from cv_copilot.services.progress.dependency import get_progress_publisher
+from cv_copilot.services.progress.publisher import (
+    ProgressEvent,
+    ProgressPublisher,
+    ProgressStage,
+    pdf_channel,
+)
+from cv_copilot.web.api.pdfs import views as pdf_views
+
+
+def _events(body: str) -> List[Dict[str, Any]]:
+    return [
+        json.loads(line.removeprefix("data: "))
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+@pytest.mark.anyio
+async def test_stream_pdf_progress(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    fake_redis_pool: ConnectionPool,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that the progress published by the workers is streamed to the end."""
+    publisher = ProgressPublisher(fake_redis_pool, ttl=60, keepalive_interval=0.01)
+    fastapi_app.dependency_overrides[get_progress_publisher] = lambda: publisher
+    mocker.patch.object(
+        pdf_views.process_pdf_task,
+        "kiq",
+        return_value=SimpleNamespace(task_id="task-id"),
+    )
+    report_progress = publisher.reporter(pdf_channel(pdf_id=2, job_id=1))
+    # A previous run ended, the stream of a new one must not end right away.
+    await report_progress(ProgressEvent(stage=ProgressStage.EVALUATED))
+    await client.post(
+        fastapi_app.url_path_for("enqueue_process_pdf", pdf_id=2),
+        params={"job_id": 1},
+    )
+    url = fastapi_app.url_path_for("stream_pdf_progress", pdf_id=2)
+
+    async def process_pdf() -> None:
+        await asyncio.sleep(0.05)
+        await report_progress(ProgressEvent(stage=ProgressStage.STARTED))
+        await report_progress(
+            ProgressEvent(stage=ProgressStage.OCR_PAGE, page=1, pages=1),
+        )
+        await report_progress(ProgressEvent(stage=ProgressStage.OCRD))
+        await report_progress(ProgressEvent(stage=ProgressStage.EVALUATED))
+
+    worker = asyncio.create_task(process_pdf())
+    response = await client.get(url, params={"job_id": 1})
+    await worker
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert ": keep-alive" in response.text
+    events = _events(response.text)
+    assert [event["stage"] for event in events] == [
+        "queued",
+        "started",
+        "ocr_page",
+        "ocrd",
+        "evaluated",
+    ]
+    assert events[2]["page"] == 1
+
+    # The processing ended: the stream only sends the final event.
+    response = await client.get(url, params={"job_id": 1})
+    assert [event["stage"] for event in _events(response.text)] == ["evaluated"]
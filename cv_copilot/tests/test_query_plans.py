@@ -0,0 +1,227 @@
+"""
+Query plan regression tests.
+
+Each DAO query is run against a synthetic dataset and its plan is read with
+EXPLAIN, to check that it is served by an index instead of a sequential scan
+of the table. Adding a query without the matching index, or changing a query
+so that it cannot use its index anymore, makes these tests fail.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cv_copilot.db.dao.images import ImageDAO
+from cv_copilot.db.dao.job_descriptions import (
+    JobDescriptionDAO,
+    ParsedJobDescriptionDAO,
+)
+from cv_copilot.db.dao.leaderboard import LeaderboardDAO
+from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.dao.scores import ScoreDAO
+from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.dao.upload_batches import UploadBatchDAO
+from cv_copilot.db.dao.weight_profiles import WeightProfileDAO
+from cv_copilot.db.pagination import Cursor
+
+JOB_DESCRIPTIONS = 1000
+PDFS_PER_JOB_DESCRIPTION = 5
+
+# Every PDF is processed and scored, with two pages.
+SEED_STATEMENTS = (
+    "INSERT INTO job_descriptions (id, title, description, created_date) "
+    "SELECT jd, 'job ' || jd, 'description', "
+    "TIMESTAMP '2023-01-01' + jd * INTERVAL '1 hour' "
+    f"FROM generate_series(1, {JOB_DESCRIPTIONS}) AS jd",
+    "INSERT INTO pdf_blobs (content_hash, file, size, created_date) "
+    "SELECT md5(p::text), NULL, 0, now() "
+    f"FROM generate_series(1, {JOB_DESCRIPTIONS * PDFS_PER_JOB_DESCRIPTION}) AS p",
+    "INSERT INTO upload_batches (id, job_id, pdf_count, created_date) "
+    f"SELECT id, id, {PDFS_PER_JOB_DESCRIPTION}, now() FROM job_descriptions",
+    "INSERT INTO pdfs (id, name, job_id, content_hash, batch_id, created_date) "
+    f"SELECT p, 'cv ' || p || '.pdf', (p - 1) / {PDFS_PER_JOB_DESCRIPTION} + 1, "
+    f"md5(p::text), (p - 1) / {PDFS_PER_JOB_DESCRIPTION} + 1, "
+    "TIMESTAMP '2023-01-01' + p * INTERVAL '1 minute' "
+    f"FROM generate_series(1, {JOB_DESCRIPTIONS * PDFS_PER_JOB_DESCRIPTION}) AS p",
+    "INSERT INTO images (pdf_id, job_id, file, created_date) "
+    "SELECT id, job_id, '\\xffd8'::bytea, now() "
+    "FROM pdfs, generate_series(1, 2)",
+    "INSERT INTO texts (id, pdf_id, text, complete, created_date) "
+    "SELECT id, id, 'text', true, now() FROM pdfs",
+    "INSERT INTO parsed_job_descriptions "
+    "(id, job_description_id, parsed_skills, created_date) "
+    "SELECT id, id, '{}'::jsonb, now() FROM job_descriptions",
+    "INSERT INTO parsed_texts "
+    "(id, job_description_id, text_id, pdf_id, parsed_skills, created_date) "
+    "SELECT id, job_id, id, id, '{}'::jsonb, now() FROM pdfs",
+    "INSERT INTO scores "
+    "(pdf_id, job_description_id, parsed_job_description_id, score, created_date) "
+    "SELECT id, job_id, job_id, random(), created_date FROM pdfs",
+    "INSERT INTO pipeline_runs "
+    "(pdf_id, job_description_id, stage, text_id, parsed_text_id, created_date) "
+    "SELECT id, job_id, 'scored', id, id, now() FROM pdfs",
+    "INSERT INTO weight_profiles (job_description_id, weights, created_date) "
+    "SELECT id, '{}'::jsonb, now() FROM job_descriptions",
+    "INSERT INTO leaderboard (pdf_id, job_description_id, score, updated_date) "
+    "SELECT pdf_id, job_description_id, score, created_date FROM scores",
+)
+SEEDED_TABLES = (
+    "job_descriptions",
+    "pdf_blobs",
+    "upload_batches",
+    "pdfs",
+    "images",
+    "texts",
+    "parsed_job_descriptions",
+    "parsed_texts",
+    "scores",
+    "pipeline_runs",
+    "weight_profiles",
+    "leaderboard",
+)
+
+DAOQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+DAO_QUERIES: Dict[str, DAOQuery] = {
+    "ImageDAO.get_images_by_pdf_id": lambda session: ImageDAO(
+        session,
+    ).get_images_by_pdf_id(42),
+    "ImageDAO.get_page_images": lambda session: ImageDAO(
+        session,
+    ).get_page_images(42),
+    "PDFDAO.get_all_pdfs": lambda session: PDFDAO(session).get_all_pdfs(
+        job_id=7,
+        limit=10,
+    ),
+    "PDFDAO.get_all_pdfs with cursor": lambda session: PDFDAO(session,).get_all_pdfs(
+        job_id=7,
+        limit=10,
+        cursor=Cursor(datetime(2023, 1, 1) + timedelta(minutes=160), 160),
+    ),
+    "PDFDAO.get_pdf_file": lambda session: PDFDAO(session).get_pdf_file(42),
+    "PDFDAO.get_blob_by_hash": lambda session: PDFDAO(session).get_blob_by_hash(
+        "a1d0c6e83f027327d8461063f4ac58a6",
+    ),
+    "PDFDAO.filter": lambda session: PDFDAO(session).filter(name="cv 42.pdf"),
+    "JobDescriptionDAO.get_all_job_descriptions": lambda session: JobDescriptionDAO(
+        session,
+    ).get_all_job_descriptions(limit=10),
+    "JobDescriptionDAO.get_dashboard": lambda session: JobDescriptionDAO(
+        session,
+    ).get_dashboard(7, limit=10),
+    "ParsedJobDescriptionDAO.get_parsed_job_description_by_id": (
+        lambda session: ParsedJobDescriptionDAO(
+            session,
+        ).get_parsed_job_description_by_id(7)
+    ),
+    "TextDAO.get_text": lambda session: TextDAO(session).get_text(42),
+    "TextDAO.get_text_by_content_hash": lambda session: TextDAO(
+        session,
+    ).get_text_by_content_hash("a1d0c6e83f027327d8461063f4ac58a6"),
+    "ParsedTextDAO.get_parsed_text_by_id": lambda session: ParsedTextDAO(
+        session,
+    ).get_parsed_text_by_id(42),
+    "ParsedTextDAO.get_parsed_text": lambda session: ParsedTextDAO(
+        session,
+    ).get_parsed_text(42),
+    "ParsedTextDAO.get_parsed_text_by_pdf_id_and_job_id": lambda session: (
+        ParsedTextDAO(session).get_parsed_text_by_pdf_id_and_job_id(42, 2)
+    ),
+    "ParsedTextDAO.get_latest_matches": lambda session: ParsedTextDAO(
+        session,
+    ).get_latest_matches(7),
+    "ScoreDAO.get_scores_by_pdf_id_and_job_description_id": lambda session: (
+        ScoreDAO(session).get_scores_by_pdf_id_and_job_description_id(42, 2)
+    ),
+    "ScoreDAO.get_scores_by_job_description_id": lambda session: ScoreDAO(
+        session,
+    ).get_scores_by_job_description_id(7, limit=10),
+    "LeaderboardDAO.get_top": lambda session: LeaderboardDAO(session).get_top(7, 5),
+    "PipelineRunDAO.get_run": lambda session: PipelineRunDAO(session).get_run(42, 2),
+    "WeightProfileDAO.get_weight_profile": lambda session: WeightProfileDAO(
+        session,
+    ).get_weight_profile(7),
+    "UploadBatchDAO.get_pdf_stages": lambda session: UploadBatchDAO(
+        session,
+    ).get_pdf_stages(7),
+}
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _seed(dbsession: AsyncSession) -> None:
+    for statement in SEED_STATEMENTS:
+        await dbsession.execute(text(statement))
+    for table in SEEDED_TABLES:
+        await dbsession.execute(text(f"ANALYZE {table}"))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("query_name", list(DAO_QUERIES))
+async def test_dao_query_uses_index(dbsession: AsyncSession, query_name: str) -> None:
+    """Tests that a DAO query does not scan a whole table.
+
+    :param dbsession: AsyncSession fixture.
+    :param query_name: name of the DAO query in DAO_QUERIES.
+    """
+    await _seed(dbsession)
+    connection = await dbsession.connection()
+    statements: List[Tuple[str, Any]] = []
+
+    def record_statement(*args: Any) -> None:
+        statements.append((args[2], args[3]))
+
+    engine = connection.sync_engine
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        await DAO_QUERIES[query_name](dbsession)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    selects = [
+        (statement, parameters)
+        for statement, parameters in statements
+        if statement.lstrip().upper().startswith("SELECT")
+    ]
+    assert selects
+    for statement, parameters in selects:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}",
+            parameters,
+        )
+        plan = result.scalar_one()[0]["Plan"]
+        seq_scans = [
+            node["Relation Name"]
+            for node in _plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+        ]
+        assert not seq_scans, f"{query_name} scans {seq_scans}:\n{statement}"
+
+
+@pytest.mark.anyio
+async def test_foreign_keys_are_indexed(dbsession: AsyncSession) -> None:
+    """Tests that every foreign key leads an index, for joins and cascades.
+
+    :param dbsession: AsyncSession fixture.
+    """
+    result = await dbsession.execute(
+        text(
+            "SELECT c.conrelid::regclass::text, a.attname "
+            "FROM pg_constraint c "
+            "JOIN pg_attribute a "
+            "ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1] "
+            "WHERE c.contype = 'f' AND NOT EXISTS ("
+            "  SELECT 1 FROM pg_index i "
+            "  WHERE i.indrelid = c.conrelid AND i.indkey[0] = c.conkey[1]"
+            ")",
+        ),
+    )
+
+    assert result.all() == []
@@ -0,0 +1,344 @@
+import random
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
+from cv_copilot.db.dao.scores import ScoreDAO
+from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.models.leaderboard import LeaderboardEntryModel
+from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.db.models.pipeline_runs import PipelineRunModel, PipelineStage
+from cv_copilot.services.llm.models.skills import (
+    EvaluationExtract,
+    Skills,
+    SkillsExtract,
+)
+from cv_copilot.services.scorer.batch import score_batch
+from cv_copilot.services.scorer.score_calculation import score_calculation
+from cv_copilot.services.scorer.weights import ScoringWeights
+from cv_copilot.web.dto.pdfs.schema import PDFModelDTO
+
+
+def _evaluation(matches: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """Build the parsed skills of a CV from the match of each skill.
+
+    :param matches: the match of each skill, by "importance/skill type".
+    :return: the parsed skills.
+    """
+    parsed_skills: Dict[str, Any] = {
+        importance: {"hard_skills": {}, "soft_skills": {}}
+        for importance in ("required_skills", "nice_to_have_skills")
+    }
+    for group, skill_matches in matches.items():
+        importance, skill_type = group.split("/")
+        parsed_skills[importance][skill_type] = {
+            skill: {
+                "name": skill,
+                "match": match,
+                "content_match": "",
+                "reasoning": "",
+            }
+            for skill, match in skill_matches.items()
+        }
+    return parsed_skills
+
+
+def _random_evaluation(rng: random.Random) -> Dict[str, Any]:
+    return _evaluation(
+        {
+            group: {
+                f"skill {skill}": rng.choice(["YES", "PARTIAL", "NO", "UNKNOWN"])
+                for skill in range(rng.randint(0, 6))
+            }
+            for group in (
+                "required_skills/hard_skills",
+                "required_skills/soft_skills",
+                "nice_to_have_skills/hard_skills",
+                "nice_to_have_skills/soft_skills",
+            )
+        },
+    )
+
+
+@pytest.mark.anyio
+async def test_score_batch_matches_score_calculation() -> None:
+    """Tests that the vectorized scores are the scores of each CV."""
+    rng = random.Random(0)
+    evaluations = [_random_evaluation(rng) for _ in range(200)]
+
+    weights = ScoringWeights(
+        required_skills=0.6,
+        hard_skills=0.9,
+        soft_skills=0.1,
+        no_match=0.1,
+    )
+
+    for scoring_weights in (None, weights):
+        scores = score_batch(evaluations, scoring_weights)
+        for evaluation, score in zip(evaluations, scores):
+            expected = await score_calculation(
+                SimpleNamespace(parsed_skills=evaluation),
+                scoring_weights,
+            )
+            assert score == pytest.approx(expected["score"])
+    assert score_batch([]) == []
+
+
+@pytest.mark.anyio
+async def test_process_job_description_scores(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that the last evaluation of every PDF of a job is scored."""
+    job_id = create_pdf.job_id
+    await ParsedJobDescriptionDAO(dbsession).save_parsed_job_description(
+        job_id,
+        SkillsExtract(required_skills=Skills(), nice_to_have_skills=Skills()),
+    )
+    text = await TextDAO(dbsession).save_text(pdf_id=create_pdf.id, text="CV")
+    parsed_text_dao = ParsedTextDAO(dbsession)
+    for match in ("NO", "YES"):
+        # The PDF is evaluated twice, only the last evaluation is scored.
+        parsed_text = await parsed_text_dao.save_parsed_text(
+            text=text,
+            job_id=job_id,
+            pdf_id=create_pdf.id,
+            text_extracted=EvaluationExtract.model_validate(
+                _evaluation({"required_skills/hard_skills": {"Python": match}}),
+            ),
+        )
+    pipeline_run_dao = PipelineRunDAO(dbsession)
+    run = await pipeline_run_dao.get_or_create_run(create_pdf.id, job_id)
+    await pipeline_run_dao.update_run(
+        run,
+        PipelineStage.EVALUATED,
+        parsed_text_id=parsed_text.id,
+    )
+    url = fastapi_app.url_path_for(
+        "process_job_description_scores",
+        job_description_id=job_id,
+    )
+    top_url = fastapi_app.url_path_for("get_top_scores", job_description_id=job_id)
+
+    response = await client.post(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    scores = response.json()
+    assert [(score["pdf_id"], score["score"]) for score in scores] == [
+        (create_pdf.id, pytest.approx(0.4)),
+    ]
+    await dbsession.refresh(run)
+    assert run.stage == PipelineStage.SCORED
+    assert len((await client.get(top_url)).json()) == 1
+
+    # The scores computed with the previous weights are outdated.
+    await client.put(
+        fastapi_app.url_path_for(
+            "update_job_description_weights",
+            job_description_id=job_id,
+        ),
+        json={"hard_skills": 1, "soft_skills": 0},
+    )
+    await dbsession.refresh(run)
+    assert run.stage == PipelineStage.EVALUATED
+    assert (await client.get(top_url)).json() == []
+    response = await client.post(
+        fastapi_app.url_path_for(
+            "get_scores",
+            pdf_id=create_pdf.id,
+            job_description_id=job_id,
+        ),
+    )
+    assert response.json()["score"] == pytest.approx(0.8)
+
+    response = await client.post(
+        fastapi_app.url_path_for(
+            "process_job_description_scores",
+            job_description_id=job_id + 1,
+        ),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_rerank_with_weight_profile(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that the PDFs of a job are ranked with its saved or given weights."""
+    job_id = create_pdf.job_id
+    other_pdf = PDFModel(name="other.pdf", job_id=job_id)
+    dbsession.add(other_pdf)
+    await dbsession.flush()
+    parsed_text_dao = ParsedTextDAO(dbsession)
+    # The first PDF has the hard skill, the other one the soft skill.
+    for pdf_id, hard_match, soft_match in (
+        (create_pdf.id, "YES", "NO"),
+        (other_pdf.id, "NO", "YES"),
+    ):
+        text = await TextDAO(dbsession).save_text(pdf_id=pdf_id, text="CV")
+        await parsed_text_dao.save_parsed_text(
+            text=text,
+            job_id=job_id,
+            pdf_id=pdf_id,
+            text_extracted=EvaluationExtract.model_validate(
+                _evaluation(
+                    {
+                        "required_skills/hard_skills": {"Python": hard_match},
+                        "required_skills/soft_skills": {"Teamwork": soft_match},
+                    },
+                ),
+            ),
+        )
+    weights_url = fastapi_app.url_path_for(
+        "update_job_description_weights",
+        job_description_id=job_id,
+    )
+    rerank_url = fastapi_app.url_path_for(
+        "rerank_job_description",
+        job_description_id=job_id,
+    )
+
+    response = await client.get(weights_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["soft_skills"] == 0.5
+
+    response = await client.put(
+        weights_url,
+        json={"hard_skills": 0.2, "soft_skills": 0.8},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["soft_skills"] == 0.8
+    response = await client.get(weights_url)
+    assert response.json()["hard_skills"] == 0.2
+
+    response = await client.post(rerank_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert [(rank["pdf_id"], rank["score"]) for rank in response.json()] == [
+        (other_pdf.id, pytest.approx(0.64)),
+        (create_pdf.id, pytest.approx(0.16)),
+    ]
+
+    response = await client.post(rerank_url, json={"hard_skills": 1, "soft_skills": 0})
+    assert [(rank["pdf_id"], rank["score"]) for rank in response.json()] == [
+        (create_pdf.id, pytest.approx(0.8)),
+        (other_pdf.id, pytest.approx(0)),
+    ]
+
+    response = await client.put(
+        fastapi_app.url_path_for(
+            "update_job_description_weights",
+            job_description_id=job_id + 1,
+        ),
+        json={},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_top_scores(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that the leaderboard keeps the last score of each PDF."""
+    job_id = create_pdf.job_id
+    parsed_job_description = await ParsedJobDescriptionDAO(
+        dbsession,
+    ).save_parsed_job_description(
+        job_id,
+        SkillsExtract(required_skills=Skills(), nice_to_have_skills=Skills()),
+    )
+    pdfs = [PDFModel(name=f"cv {pdf}.pdf", job_id=job_id) for pdf in range(3)]
+    dbsession.add_all(pdfs)
+    await dbsession.flush()
+    score_dao = ScoreDAO(dbsession)
+    await score_dao.save_scores(
+        job_description_id=job_id,
+        parsed_job_description_id=parsed_job_description.id,
+        scores={pdfs[0].id: 0.9, pdfs[1].id: 0.5, pdfs[2].id: 0.7},
+    )
+    # The last score of a PDF replaces its previous one.
+    await score_dao.save_score(
+        pdf_id=pdfs[0].id,
+        job_description_id=job_id,
+        parsed_job_description_id=parsed_job_description.id,
+        score=0.1,
+    )
+    url = fastapi_app.url_path_for("get_top_scores", job_description_id=job_id)
+
+    response = await client.get(url, params={"k": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [(entry["pdf_id"], entry["score"]) for entry in response.json()] == [
+        (pdfs[2].id, 0.7),
+        (pdfs[1].id, 0.5),
+    ]
+    response = await client.get(url, params={"k": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.anyio
+async def test_save_scores_of_many_pdfs(
+    dbsession: AsyncSession,
+    create_pdf: PDFModelDTO,
+) -> None:
+    """Tests that more PDFs than parameters of a statement can be scored."""
+    job_id = create_pdf.job_id
+    pdf_count = 9000
+    parsed_job_description = await ParsedJobDescriptionDAO(
+        dbsession,
+    ).save_parsed_job_description(
+        job_id,
+        SkillsExtract(required_skills=Skills(), nice_to_have_skills=Skills()),
+    )
+    result = await dbsession.execute(
+        insert(PDFModel).returning(PDFModel.id),
+        [{"name": f"cv {pdf}.pdf", "job_id": job_id} for pdf in range(pdf_count)],
+    )
+    pdf_ids = list(result.scalars().all())
+    await dbsession.execute(
+        insert(PipelineRunModel),
+        [
+            {
+                "pdf_id": pdf_id,
+                "job_description_id": job_id,
+                "stage": PipelineStage.EVALUATED.value,
+            }
+            for pdf_id in pdf_ids
+        ],
+    )
+
+    await ScoreDAO(dbsession).save_scores(
+        job_description_id=job_id,
+        parsed_job_description_id=parsed_job_description.id,
+        scores={pdf_id: 0.5 for pdf_id in pdf_ids},
+    )
+    await PipelineRunDAO(dbsession).mark_scored(job_id, pdf_ids)
+
+    leaderboard_count = await dbsession.scalar(
+        select(func.count()).where(
+            LeaderboardEntryModel.job_description_id == job_id,
+        ),
+    )
+    scored_count = await dbsession.scalar(
+        select(func.count()).where(
+            PipelineRunModel.job_description_id == job_id,
+            PipelineRunModel.stage == PipelineStage.SCORED.value,
+        ),
+    )
+    assert leaderboard_count == pdf_count
+    assert scored_count == pdf_count
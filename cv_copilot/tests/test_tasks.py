@@ -0,0 +1,54 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from starlette import status
+from taskiq import TaskiqResult
+
+from cv_copilot.tkq import broker
+from cv_copilot.web.api.pdfs import views as pdf_views
+
+
+@pytest.mark.anyio
+async def test_task_status(fastapi_app: FastAPI, client: AsyncClient) -> None:
+    """Tests that the status of a task shows its result once it is ready."""
+    task_id = uuid.uuid4().hex
+    url = fastapi_app.url_path_for("get_task_status", task_id=task_id)
+
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["is_ready"] is False
+
+    await broker.result_backend.set_result(
+        task_id,
+        TaskiqResult(is_err=False, log=None, return_value=7, execution_time=0.5),
+    )
+    response = await client.get(url)
+    task_status = response.json()
+    assert task_status["is_ready"] is True
+    assert task_status["is_err"] is False
+    assert task_status["return_value"] == 7
+
+
+@pytest.mark.anyio
+async def test_enqueue_process_pdf(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    mocker: MockerFixture,
+) -> None:
+    """Tests that processing a PDF is sent to the workers."""
+    kiq = mocker.patch.object(
+        pdf_views.process_pdf_task,
+        "kiq",
+        return_value=SimpleNamespace(task_id="task-id"),
+    )
+    url = fastapi_app.url_path_for("enqueue_process_pdf", pdf_id=2)
+
+    response = await client.post(url, params={"job_id": 1})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"task_id": "task-id"}
+    kiq.assert_awaited_once_with(job_id=1, pdf_id=2, bypass_cache=False)
@@ -6,6 +6,7 @@ from cv_copilot.settings import settings
 
 result_backend = RedisAsyncResultBackend(
     redis_url=str(settings.redis_url.with_path("/1")),
+    result_ex_time=settings.task_result_ttl,
 )
 broker = ListQueueBroker(
     str(settings.redis_url.with_path("/1")),
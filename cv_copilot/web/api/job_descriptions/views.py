@@ -1,19 +1,40 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cv_copilot.db.dao.job_descriptions import (
     JobDescriptionDAO,
     ParsedJobDescriptionDAO,
 )
+from cv_copilot.db.dao.weight_profiles import WeightProfileDAO
 from cv_copilot.db.dependencies import get_db_session
+from cv_copilot.db.pagination import Cursor
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.llm.dependency import get_llm_cache, get_openai_client
+from cv_copilot.services.progress.dependency import get_progress_publisher
+from cv_copilot.services.progress.publisher import (
+    ProgressEvent,
+    ProgressPublisher,
+    ProgressStage,
+    job_description_channel,
+)
 from cv_copilot.services.text.workflow import workflow_process_job_description
+from cv_copilot.tasks import process_job_description_task
 from cv_copilot.web.dto.job_description.schema import (
+    DashboardEntryDTO,
+    DashboardField,
     JobDescriptionDTO,
     JobDescriptionInputDTO,
+    JobDescriptionTaskDTO,
     ParsedJobDescriptionDTO,
 )
+from cv_copilot.web.dto.scores.schema import WeightProfileDTO, WeightProfileInputDTO
+from cv_copilot.web.dto.tasks.schema import TaskDTO
+from cv_copilot.web.pagination import get_cursor, set_next_cursor
+from cv_copilot.web.progress import stream_progress
 
 router = APIRouter()
 
@@ -40,50 +61,69 @@ async def get_parsed_job_description_dao(
     return ParsedJobDescriptionDAO(session)
 
 
-@router.post("/", response_model=JobDescriptionDTO)
+async def get_weight_profile_dao(
+    session: AsyncSession = Depends(get_db_session),
+) -> WeightProfileDAO:
+    """Dependency for WeightProfileDAO.
+
+    :param session: AsyncSession dependency.
+    :return: WeightProfileDAO instance.
+    """
+    return WeightProfileDAO(session)
+
+
+@router.post("/", response_model=JobDescriptionTaskDTO)
 async def create_job_description(
     job_description_input: JobDescriptionInputDTO,
-    background_tasks: BackgroundTasks,
     job_description_dao: JobDescriptionDAO = Depends(get_job_description_dao),
-    parsed_job_description_dao: ParsedJobDescriptionDAO = Depends(
-        get_parsed_job_description_dao,
-    ),
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
     run_process_workflow: bool = False,
-) -> JobDescriptionDTO:
+) -> JobDescriptionTaskDTO:
     """
     Store a new job description in the database.
 
     :param job_description_input: DTO for creating a job description model.
     :param job_description_dao: DAO for Job Descriptions models.
-    :param parsed_job_description_dao: DAO for ParsedJobDescription models.
-    :param background_tasks: BackgroundTasks dependency.
-    :param run_process_workflow: Boolean to run the workflow process.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :param run_process_workflow: Boolean to send the job description to the workers.
     :return: job_description_model: DTO of the created job description model.
     """
     job_description = await job_description_dao.create_job_description(
         job_description_input,
     )
+    task_id = None
     if run_process_workflow:
-        background_tasks.add_task(
-            workflow_process_job_description,
-            job_description,
-            parsed_job_description_dao,
+        await progress_publisher.publish(
+            job_description_channel(job_description.id),
+            ProgressEvent(stage=ProgressStage.QUEUED),
         )
-        return JobDescriptionDTO.from_orm(job_description)
-    return JobDescriptionDTO.from_orm(job_description)
+        task = await process_job_description_task.kiq(
+            job_description_id=job_description.id,
+        )
+        task_id = task.task_id
+    return JobDescriptionTaskDTO(
+        **JobDescriptionDTO.from_orm(job_description).model_dump(),
+        task_id=task_id,
+    )
 
 
 @router.get("/", response_model=List[JobDescriptionDTO])
 async def get_job_descriptions(
+    response: Response,
     limit: int = 10,
-    offset: int = 0,
+    offset: int = Query(0, deprecated=True),
+    cursor: Optional[Cursor] = Depends(get_cursor),
     job_description_dao: JobDescriptionDAO = Depends(get_job_description_dao),
 ) -> List[JobDescriptionDTO]:
     """
     Retrieve the most recent job descriptions.
 
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
+    :param response: The response, to set the cursor of the next page.
     :param limit: The number of recent job descriptions to return.
-    :param offset: The offset to start from.
+    :param offset: Deprecated, the offset to start from when there is no cursor.
+    :param cursor: The cursor of the page, from the previous page.
     :param job_description_dao: DAO for Job Descriptions models.
     :return: List of recent job descriptions.
     :raises HTTPException: If no job descriptions are found.
@@ -91,12 +131,14 @@ async def get_job_descriptions(
     list_job_descriptions = await job_description_dao.get_all_job_descriptions(
         limit,
         offset,
+        cursor,
     )
     if list_job_descriptions is None:
         raise HTTPException(
             status_code=404,  # noqa: WPS432
             detail="No job description found",
         )
+    set_next_cursor(response, list_job_descriptions, limit)
     return list_job_descriptions
 
 
@@ -124,6 +166,45 @@ async def get_job_description_by_id(
     return JobDescriptionDTO.from_orm(job_description)
 
 
+@router.get("/{job_description_id}/dashboard", response_model=List[DashboardEntryDTO])
+async def get_job_description_dashboard(
+    job_description_id: int,
+    response: Response,
+    limit: int = 10,
+    cursor: Optional[Cursor] = Depends(get_cursor),
+    fields: List[DashboardField] = Query(list(DashboardField)),
+    job_description_dao: JobDescriptionDAO = Depends(get_job_description_dao),
+) -> List[DashboardEntryDTO]:
+    """
+    Retrieve the recent PDFs of a job description with their scores.
+
+    The last score and the last evaluation of each PDF are read in the same
+    query as the PDFs. The cursor of the next page is returned in the
+    X-Next-Cursor header.
+
+    :param job_description_id: ID of the job description.
+    :param response: The response, to set the cursor of the next page.
+    :param limit: The number of PDFs to return.
+    :param cursor: The cursor of the page, from the previous page.
+    :param fields: The optional fields to return, all of them by default.
+    :param job_description_dao: DAO for Job Descriptions models.
+    :return: List of DashboardEntryDTO, most recent first.
+    """
+    dashboard = await job_description_dao.get_dashboard(
+        job_description_id,
+        limit,
+        cursor,
+        with_scores=DashboardField.SCORE in fields,
+        with_evaluations=DashboardField.EVALUATION in fields,
+    )
+    entries = [
+        DashboardEntryDTO.from_models(pdf, entry, evaluation)
+        for pdf, entry, evaluation in dashboard
+    ]
+    set_next_cursor(response, entries, limit)
+    return entries
+
+
 @router.put("/{job_description_id}/", response_model=JobDescriptionDTO)
 async def update_job_description(
     job_description_id: int,
@@ -174,13 +255,25 @@ async def process_job_description(
     parsed_job_description_dao: ParsedJobDescriptionDAO = Depends(
         get_parsed_job_description_dao,
     ),
+    openai_client: AsyncOpenAI = Depends(get_openai_client),
+    llm_cache: Optional[LLMCache] = Depends(get_llm_cache),
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+    bypass_cache: bool = False,
 ) -> ParsedJobDescriptionDTO:
     """
     Process a job description.
 
+    A job description whose description did not change since it was last
+    processed returns its last parse, without calling OpenAI.
+
     :param job_description_id: ID of the job description to process.
     :param job_description_dao: DAO for Job Descriptions models.
     :param parsed_job_description_dao: DAO for ParsedJobDescription models.
+    :param openai_client: Shared OpenAI client.
+    :param llm_cache: Cache of LLM responses.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :param bypass_cache: Boolean to call OpenAI even if responses are cached,
+        and parse the job description even if it did not change.
     :return: Confirmation of processing.
     :raises HTTPException: If the job description is not found.
     """
@@ -192,8 +285,134 @@ async def process_job_description(
             status_code=404,  # noqa: WPS432
             detail="Job description not found",
         )
+    if bypass_cache:
+        llm_cache = None
     job_description_processed = await workflow_process_job_description(
         job_description,
         parsed_job_description_dao,
+        openai_client,
+        llm_cache,
+        progress_publisher.reporter(job_description_channel(job_description_id)),
+        reparse=bypass_cache,
     )
     return ParsedJobDescriptionDTO.from_orm(job_description_processed)
+
+
+@router.post("/{job_description_id}/process/", response_model=TaskDTO)
+async def enqueue_process_job_description(
+    job_description_id: int,
+    bypass_cache: bool = False,
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+) -> TaskDTO:
+    """
+    Send a job description to the workers to be processed.
+
+    Unlike `GET /{job_description_id}/process/`, it returns immediately: the
+    status of the processing is available at `/tasks/{task_id}`, and its
+    progress is streamed by `GET /{job_description_id}/progress`.
+
+    :param job_description_id: ID of the job description to process.
+    :param bypass_cache: Boolean to call OpenAI even if responses are cached.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: TaskDTO with the ID of the task.
+    """
+    # Replaces the final event of a previous run, which would end the stream.
+    await progress_publisher.publish(
+        job_description_channel(job_description_id),
+        ProgressEvent(stage=ProgressStage.QUEUED),
+    )
+    task = await process_job_description_task.kiq(
+        job_description_id=job_description_id,
+        bypass_cache=bypass_cache,
+    )
+    return TaskDTO(task_id=task.task_id)
+
+
+@router.get("/{job_description_id}/progress")
+async def stream_job_description_progress(
+    job_description_id: int,
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+) -> StreamingResponse:
+    """
+    Stream the progress of the processing of a job description.
+
+    The progress is sent as Server-Sent Events, see
+    `GET /pdfs/{pdf_id}/progress`. The stream ends once the skills of the
+    job description are parsed or its processing failed.
+
+    :param job_description_id: ID of the job description.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: The event stream.
+    """
+    return stream_progress(
+        progress_publisher,
+        job_description_channel(job_description_id),
+    )
+
+
+@router.get("/{job_description_id}/weights/", response_model=WeightProfileDTO)
+async def get_job_description_weights(
+    job_description_id: int,
+    job_description_dao: JobDescriptionDAO = Depends(get_job_description_dao),
+    weight_profile_dao: WeightProfileDAO = Depends(get_weight_profile_dao),
+) -> WeightProfileDTO:
+    """
+    Retrieve the weights the CVs of a job description are scored with.
+
+    :param job_description_id: ID of the job description.
+    :param job_description_dao: DAO for Job Descriptions models.
+    :param weight_profile_dao: DAO for WeightProfile models.
+    :return: The weights, the default ones if none were saved.
+    :raises HTTPException: If the job description is not found.
+    """
+    job_description = await job_description_dao.get_job_description_by_id(
+        job_description_id,
+    )
+    if job_description is None:
+        raise HTTPException(
+            status_code=404,  # noqa: WPS432
+            detail="Job description not found",
+        )
+    weights = await weight_profile_dao.get_weights(job_description_id)
+    return WeightProfileDTO(
+        job_description_id=job_description_id,
+        **weights.model_dump(),
+    )
+
+
+@router.put("/{job_description_id}/weights/", response_model=WeightProfileDTO)
+async def update_job_description_weights(
+    job_description_id: int,
+    weights: WeightProfileInputDTO,
+    job_description_dao: JobDescriptionDAO = Depends(get_job_description_dao),
+    weight_profile_dao: WeightProfileDAO = Depends(get_weight_profile_dao),
+) -> WeightProfileDTO:
+    """
+    Save the weights to score the CVs of a job description with.
+
+    The scores already saved are kept, but they are outdated: the CVs leave
+    the leaderboard of `/scores/{job_description_id}/top` until they are
+    scored again with `POST /scores/process/{job_description_id}`, and
+    scoring a single CV computes its score again. Rank the CVs with
+    `POST /scores/rerank/{job_description_id}` to try weights out.
+
+    :param job_description_id: ID of the job description.
+    :param weights: The new weights.
+    :param job_description_dao: DAO for Job Descriptions models.
+    :param weight_profile_dao: DAO for WeightProfile models.
+    :return: The saved weights.
+    :raises HTTPException: If the job description is not found.
+    """
+    job_description = await job_description_dao.get_job_description_by_id(
+        job_description_id,
+    )
+    if job_description is None:
+        raise HTTPException(
+            status_code=404,  # noqa: WPS432
+            detail="Job description not found",
+        )
+    weight_profile = await weight_profile_dao.save_weight_profile(
+        job_description_id,
+        weights,
+    )
+    return WeightProfileDTO.from_orm(weight_profile)
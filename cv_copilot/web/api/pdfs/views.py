@@ -1,20 +1,61 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
-from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Query, Response, UploadFile
 from fastapi.param_functions import Depends
+from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cv_copilot.db.dao.images import ImageDAO
-from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO
+from cv_copilot.db.dao.job_descriptions import (
+    JobDescriptionDAO,
+    ParsedJobDescriptionDAO,
+)
 from cv_copilot.db.dao.pdfs import PDFDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
 from cv_copilot.db.dao.texts import ParsedTextDAO, TextDAO
+from cv_copilot.db.dao.upload_batches import UploadBatchDAO
 from cv_copilot.db.dependencies import get_db_session
-from cv_copilot.services.pdf.workflow import process_pdf_workflow
-from cv_copilot.services.text.workflow import workflow_evaluate_cv
-from cv_copilot.web.dto.pdfs.schema import PDFModelDTO, PDFModelInputDTO
+from cv_copilot.db.pagination import Cursor
+from cv_copilot.services.cpu.dependency import get_cpu_executor
+from cv_copilot.services.cpu.executor import CPUExecutor
+from cv_copilot.services.llm.cache import LLMCache
+from cv_copilot.services.llm.dependency import get_llm_cache, get_openai_client
+from cv_copilot.services.pdf.batch import (
+    BatchTooLargeError,
+    ingest_pdf_batch,
+    summarize_batch_progress,
+)
+from cv_copilot.services.pdf.processing import PDFConversionError, count_pdf_file_pages
+from cv_copilot.services.pdf.upload import UploadTooLargeError, spool_pdf_upload
+from cv_copilot.services.pipeline.workflow import run_pdf_pipeline
+from cv_copilot.services.progress.dependency import get_progress_publisher
+from cv_copilot.services.progress.publisher import (
+    ProgressEvent,
+    ProgressPublisher,
+    ProgressStage,
+    pdf_channel,
+)
+from cv_copilot.services.storage.base import BlobStorage
+from cv_copilot.services.storage.dependency import get_blob_storage
+from cv_copilot.settings import settings
+from cv_copilot.tasks import process_pdf_task
+from cv_copilot.web.dto.pdfs.schema import (
+    EnqueueFailureDTO,
+    PDFModelDTO,
+    PDFModelInputDTO,
+    PDFModelTaskDTO,
+    RejectedFileDTO,
+    UploadBatchDTO,
+    UploadBatchProgressDTO,
+)
+from cv_copilot.web.dto.tasks.schema import TaskDTO
 from cv_copilot.web.dto.texts.schema import ParsedTextDTO
+from cv_copilot.web.pagination import get_cursor, set_next_cursor
+from cv_copilot.web.progress import stream_progress
 
 router = APIRouter()
 
@@ -31,61 +72,274 @@ def get_dao_dependency(dao_class: type):  # noqa: DAR201
     return dependency
 
 
-get_pdf_dao = get_dao_dependency(PDFDAO)
+def get_blob_dao_dependency(dao_class: type):  # noqa: DAR201
+    """Create a dependency for a DAO class storing blobs.
+
+    :param dao_class: The DAO class to create a dependency for.
+    """
+
+    async def dependency(
+        session: AsyncSession = Depends(get_db_session),
+        blob_storage: Optional[BlobStorage] = Depends(get_blob_storage),
+    ):
+        return dao_class(session, blob_storage)
+
+    return dependency
+
+
+get_pdf_dao = get_blob_dao_dependency(PDFDAO)
 get_text_dao = get_dao_dependency(TextDAO)
 get_parsed_text_dao = get_dao_dependency(ParsedTextDAO)
 get_job_description_dao = get_dao_dependency(ParsedJobDescriptionDAO)
-get_image_dao = get_dao_dependency(ImageDAO)
+get_job_descriptions_dao = get_dao_dependency(JobDescriptionDAO)
+get_image_dao = get_blob_dao_dependency(ImageDAO)
+get_pipeline_run_dao = get_dao_dependency(PipelineRunDAO)
+get_upload_batch_dao = get_dao_dependency(UploadBatchDAO)
+
+
+async def enqueue_pdf_batch(
+    job_id: int,
+    pdf_ids: List[int],
+    progress_publisher: ProgressPublisher,
+) -> List[Tuple[int, str]]:
+    """
+    Send the PDFs of a batch to the workers.
+
+    At most `settings.batch_enqueue_concurrency` PDFs are sent at the same
+    time, so that a large batch does not open as many Redis connections.
+    A PDF is reported QUEUED once it is sent, unless its worker already
+    reported a later stage. A PDF that cannot be sent does not fail the
+    others: it stays PENDING and is returned with the error.
+
+    :param job_id: ID of the job description of the PDFs.
+    :param pdf_ids: IDs of the PDFs.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: the ID of each PDF that could not be sent, with the error.
+    """
+    slots = asyncio.Semaphore(settings.batch_enqueue_concurrency)
+
+    async def enqueue(pdf_id: int) -> None:  # noqa: WPS430
+        async with slots:
+            await process_pdf_task.kiq(job_id=job_id, pdf_id=pdf_id)
+            await progress_publisher.publish(
+                pdf_channel(pdf_id, job_id),
+                ProgressEvent(stage=ProgressStage.QUEUED),
+                replace=False,
+            )
+
+    results = await asyncio.gather(
+        *(enqueue(pdf_id) for pdf_id in pdf_ids),
+        return_exceptions=True,
+    )
+    enqueue_failures: List[Tuple[int, str]] = []
+    for pdf_id, result in zip(pdf_ids, results):
+        if isinstance(result, Exception):
+            logging.warning(f"Could not send PDF ID {pdf_id} to the workers: {result}")
+            enqueue_failures.append((pdf_id, str(result)))
+        elif isinstance(result, BaseException):
+            raise result
+    return enqueue_failures
 
 
 @router.get("/", response_model=List[PDFModelDTO])
 async def get_pdfs(
     job_id: int,
+    response: Response,
     limit: int = 10,
-    offset: int = 0,
+    offset: int = Query(0, deprecated=True),
+    cursor: Optional[Cursor] = Depends(get_cursor),
     pdf_dao: PDFDAO = Depends(get_pdf_dao),
 ) -> List[PDFModelDTO]:
     """
-    Retrieve all pdfs from the database.
+    Retrieve all pdfs from the database, most recent first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
 
     :param job_id: the job_id for the jobs description related to the pdfs
+    :param response: the response, to set the cursor of the next page.
     :param limit: limit of PDFs objects, defaults to 10.
-    :param offset: offset of PDFs objects, defaults to 0.
+    :param offset: deprecated, offset of PDFs objects when there is no cursor.
+    :param cursor: the cursor of the page, from the previous page.
     :param pdf_dao: DAO for PDFs models.
     :return: list of PDFs objects from database.
     """
-    return await pdf_dao.get_all_pdfs(job_id=job_id, limit=limit, offset=offset)
+    pdfs = await pdf_dao.get_all_pdfs(
+        job_id=job_id,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    set_next_cursor(response, pdfs, limit)
+    return pdfs
 
 
-@router.post("/", response_model=PDFModelDTO)
+@router.post("/", response_model=PDFModelTaskDTO)
 async def upload_pdf(
-    background_tasks: BackgroundTasks,
     pdf_file: UploadFile = File(...),
     name: str = Form(...),
     job_id: int = Form(...),
     created_date: Union[str, datetime] = Form(...),
     pdf_dao: PDFDAO = Depends(get_pdf_dao),
+    cpu_executor: CPUExecutor = Depends(get_cpu_executor),
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
     process_after_upload: bool = Form(False),
-) -> PDFModelDTO:
+) -> PDFModelTaskDTO:
     """
     Store a new PDF in the database.
 
+    The file is read in chunks and rejected if it is larger than
+    `settings.max_upload_bytes` or has more than `settings.max_upload_pages`
+    pages.
+
     :param pdf_file: PDF file to upload.
     :param name: Name of the PDF.
     :param job_id: ID of the job description related to the PDF.
     :param created_date: Date the PDF was created. Can be a string or a datetime.
     :param pdf_dao: DAO for PDFs models.
-    :param background_tasks: BackgroundTasks dependency.
-    :param process_after_upload: Boolean to run the workflow process.
-    :return: PDFModelDTO of the created PDF.
+    :param cpu_executor: Process pool used to count the pages of the PDF.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :param process_after_upload: Boolean to send the PDF to the workers.
+    :return: PDFModelTaskDTO of the created PDF.
+    :raises HTTPException: If the PDF is too large or cannot be read.
     """
     pdf_input = PDFModelInputDTO(name=name, job_id=job_id, created_date=created_date)
-    pdf_model = await pdf_dao.upload_pdf(pdf_input, pdf_file)
+    try:
+        async with spool_pdf_upload(pdf_file) as spooled_pdf:
+            page_count = await cpu_executor.run(
+                count_pdf_file_pages,
+                str(spooled_pdf.path),
+            )
+            if page_count > settings.max_upload_pages:
+                raise HTTPException(
+                    status_code=413,  # noqa: WPS432
+                    detail=(
+                        f"PDF has {page_count} pages, "
+                        f"the limit is {settings.max_upload_pages}"
+                    ),
+                )
+            pdf_model = await pdf_dao.upload_pdf(pdf_input, spooled_pdf)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=413,  # noqa: WPS432
+            detail=str(e),
+        ) from e
+    except PDFConversionError as e:
+        raise HTTPException(
+            status_code=422,  # noqa: WPS432
+            detail=f"Invalid PDF: {e}",
+        ) from e
 
+    task_id = None
     if process_after_upload:
-        background_tasks.add_task(process_pdf, job_id=job_id, pdf_id=pdf_model.id)
+        await progress_publisher.publish(
+            pdf_channel(pdf_model.id, job_id),
+            ProgressEvent(stage=ProgressStage.QUEUED),
+        )
+        task = await process_pdf_task.kiq(job_id=job_id, pdf_id=pdf_model.id)
+        task_id = task.task_id
+    return PDFModelTaskDTO(**pdf_model.model_dump(), task_id=task_id)
+
 
-    return pdf_model  # noqa: WPS331
+@router.post("/batches", response_model=UploadBatchDTO)
+async def upload_pdf_batch(
+    files: List[UploadFile] = File(...),
+    job_id: int = Form(...),
+    process_after_upload: bool = Form(True),
+    job_description_dao: JobDescriptionDAO = Depends(get_job_descriptions_dao),
+    pdf_dao: PDFDAO = Depends(get_pdf_dao),
+    upload_batch_dao: UploadBatchDAO = Depends(get_upload_batch_dao),
+    cpu_executor: CPUExecutor = Depends(get_cpu_executor),
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+) -> UploadBatchDTO:
+    """
+    Store a batch of PDFs in the database, and send them to the workers.
+
+    The files are PDFs or ZIP archives of PDFs. They are read one at a time,
+    in chunks, with the limits of `POST /`: the files over the limits or
+    that cannot be read are rejected, the others are added in one
+    transaction. The progress of the batch is available at
+    `/batches/{batch_id}`.
+
+    :param files: PDFs and ZIP archives of PDFs to upload.
+    :param job_id: ID of the job description related to the PDFs.
+    :param process_after_upload: Boolean to send the PDFs to the workers.
+    :param job_description_dao: DAO for Job Descriptions models.
+    :param pdf_dao: DAO for PDFs models.
+    :param upload_batch_dao: DAO for UploadBatch models.
+    :param cpu_executor: Process pool used to count the pages of the PDFs.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: UploadBatchDTO of the created batch.
+    :raises HTTPException: If the job description is not found, or if the
+        batch has too many PDFs.
+    """
+    if await job_description_dao.get_job_description_by_id(job_id) is None:
+        raise HTTPException(
+            status_code=404,  # noqa: WPS432
+            detail="Job description not found",
+        )
+    try:
+        batch, pdf_ids, rejected_files = await ingest_pdf_batch(
+            files,
+            job_id,
+            pdf_dao,
+            upload_batch_dao,
+            cpu_executor,
+        )
+    except BatchTooLargeError as e:
+        raise HTTPException(
+            status_code=413,  # noqa: WPS432
+            detail=str(e),
+        ) from e
+    logging.info(f"Uploaded batch ID {batch.id} of {len(pdf_ids)} PDFs")
+    enqueue_failures: List[Tuple[int, str]] = []
+    if process_after_upload:
+        enqueue_failures = await enqueue_pdf_batch(
+            job_id,
+            pdf_ids,
+            progress_publisher,
+        )
+    return UploadBatchDTO(
+        id=batch.id,
+        job_id=job_id,
+        pdf_ids=pdf_ids,
+        rejected_files=[
+            RejectedFileDTO(name=name, reason=reason) for name, reason in rejected_files
+        ],
+        enqueue_failures=[
+            EnqueueFailureDTO(pdf_id=pdf_id, reason=reason)
+            for pdf_id, reason in enqueue_failures
+        ],
+        created_date=batch.created_date.isoformat(),
+    )
+
+
+@router.get("/batches/{batch_id}", response_model=UploadBatchProgressDTO)
+async def get_pdf_batch_progress(
+    batch_id: int,
+    upload_batch_dao: UploadBatchDAO = Depends(get_upload_batch_dao),
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+) -> UploadBatchProgressDTO:
+    """
+    Retrieve the progress of the processing of a batch of PDFs.
+
+    :param batch_id: ID of the batch.
+    :param upload_batch_dao: DAO for UploadBatch models.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: UploadBatchProgressDTO with the number of PDFs at each stage.
+    :raises HTTPException: If the batch is not found.
+    """
+    batch = await upload_batch_dao.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=404,  # noqa: WPS432
+            detail="Batch not found",
+        )
+    pdf_stages = await upload_batch_dao.get_pdf_stages(batch_id)
+    last_events = await progress_publisher.get_last_events(
+        [pdf_channel(pdf_id, batch.job_id) for pdf_id, _, _ in pdf_stages],
+    )
+    stages, done = summarize_batch_progress(pdf_stages, last_events)
+    return UploadBatchProgressDTO.from_orm(batch, stages, done)
 
 
 @router.get("/{pdf_id}/process", response_model=ParsedTextDTO)
@@ -99,9 +353,18 @@ async def process_pdf(
     pdf_dao: PDFDAO = Depends(get_pdf_dao),
     image_dao: ImageDAO = Depends(get_image_dao),
     text_dao: TextDAO = Depends(get_text_dao),
+    pipeline_run_dao: PipelineRunDAO = Depends(get_pipeline_run_dao),
+    cpu_executor: CPUExecutor = Depends(get_cpu_executor),
+    openai_client: AsyncOpenAI = Depends(get_openai_client),
+    llm_cache: Optional[LLMCache] = Depends(get_llm_cache),
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+    bypass_cache: bool = False,
 ) -> ParsedTextDTO:
     """
-    Trigger background tasks to process the PDF.
+    Process the PDF, resuming from the stages completed by a previous run.
+
+    A PDF already evaluated for the job description is returned as is,
+    unless the cache is bypassed.
 
     :param job_id: ID of the job description related to the PDF.
     :param pdf_id: ID of the PDF to process.
@@ -110,24 +373,34 @@ async def process_pdf(
     :param pdf_dao: DAO for PDFs models.
     :param image_dao: DAO for Image models.
     :param text_dao: DAO for Text models.
-    :return: ParsedTextDTO of the created ParsedText.
+    :param pipeline_run_dao: DAO for PipelineRun models.
+    :param cpu_executor: Process pool used to rasterize the PDF.
+    :param openai_client: Shared OpenAI client.
+    :param llm_cache: Cache of LLM responses.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :param bypass_cache: Boolean to call OpenAI even if responses are cached,
+        and evaluate the PDF again.
+    :return: ParsedTextDTO of the ParsedText.
     """
+    if bypass_cache:
+        llm_cache = None
     # Trigger background tasks to process the PDF
     try:
         logging.info(f"Workflow: Process PDF ID {pdf_id}")
-        text = await process_pdf_workflow(
+        parsed_text = await run_pdf_pipeline(
             pdf_id=pdf_id,
+            job_id=job_id,
+            pipeline_run_dao=pipeline_run_dao,
             pdf_dao=pdf_dao,
             image_dao=image_dao,
             text_dao=text_dao,
-        )
-        logging.info(f"Workflow: Evaluate CV ID {pdf_id}")
-        parsed_text = await workflow_evaluate_cv(
-            text=text,
-            job_id=job_id,
-            pdf_id=pdf_id,
             parsed_text_dao=parsed_text_dao,
             parsed_job_description_dao=parsed_job_description_dao,
+            cpu_executor=cpu_executor,
+            openai_client=openai_client,
+            llm_cache=llm_cache,
+            reevaluate=bypass_cache,
+            report_progress=progress_publisher.reporter(pdf_channel(pdf_id, job_id)),
         )
         return ParsedTextDTO.from_orm(parsed_text)
     except Exception as e:
@@ -135,6 +408,61 @@ async def process_pdf(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.post("/{pdf_id}/process", response_model=TaskDTO)
+async def enqueue_process_pdf(
+    job_id: int,
+    pdf_id: int,
+    bypass_cache: bool = False,
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+) -> TaskDTO:
+    """
+    Send the PDF to the workers to be processed.
+
+    Unlike `GET /{pdf_id}/process`, it returns immediately: the status of
+    the processing is available at `/tasks/{task_id}`, and its progress is
+    streamed by `GET /{pdf_id}/progress`.
+
+    :param job_id: ID of the job description related to the PDF.
+    :param pdf_id: ID of the PDF to process.
+    :param bypass_cache: Boolean to call OpenAI even if responses are cached.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: TaskDTO with the ID of the task.
+    """
+    # Replaces the final event of a previous run, which would end the stream.
+    await progress_publisher.publish(
+        pdf_channel(pdf_id, job_id),
+        ProgressEvent(stage=ProgressStage.QUEUED),
+    )
+    task = await process_pdf_task.kiq(
+        job_id=job_id,
+        pdf_id=pdf_id,
+        bypass_cache=bypass_cache,
+    )
+    return TaskDTO(task_id=task.task_id)
+
+
+@router.get("/{pdf_id}/progress")
+async def stream_pdf_progress(
+    job_id: int,
+    pdf_id: int,
+    progress_publisher: ProgressPublisher = Depends(get_progress_publisher),
+) -> StreamingResponse:
+    """
+    Stream the progress of the processing of the PDF as Server-Sent Events.
+
+    Each event is named after its stage, with the ProgressEvent as JSON
+    data: the stages of the pipeline and each page converted by the vision
+    model. The stream ends once the PDF is evaluated or its processing
+    failed.
+
+    :param job_id: ID of the job description related to the PDF.
+    :param pdf_id: ID of the PDF.
+    :param progress_publisher: Publisher of the progress of the processing.
+    :return: The event stream.
+    """
+    return stream_progress(progress_publisher, pdf_channel(pdf_id, job_id))
+
+
 @router.get("/{pdf_id}", response_model=PDFModelDTO)
 async def get_pdf(
     pdf_id: int,
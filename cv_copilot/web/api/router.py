@@ -10,6 +10,7 @@ from cv_copilot.web.api import (  # noqa: WPS235
     pdfs,
     redis,
     scores,
+    tasks,
     texts,
     users,
 )
@@ -38,3 +39,4 @@ api_router.include_router(
     tags=["parsed-texts"],
 )
 api_router.include_router(scores.router, prefix="/scores", tags=["scores"])
+api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
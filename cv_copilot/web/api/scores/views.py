@@ -1,12 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cv_copilot.db.dao.job_descriptions import ParsedJobDescriptionDAO
+from cv_copilot.db.dao.leaderboard import LeaderboardDAO
+from cv_copilot.db.dao.pipeline_runs import PipelineRunDAO
 from cv_copilot.db.dao.scores import ScoreDAO
 from cv_copilot.db.dao.texts import ParsedTextDAO
+from cv_copilot.db.dao.weight_profiles import WeightProfileDAO
 from cv_copilot.db.dependencies import get_db_session
+from cv_copilot.db.models.pipeline_runs import PipelineStage
+from cv_copilot.db.pagination import Cursor
+from cv_copilot.services.scorer.batch import rank_candidates
 from cv_copilot.services.scorer.score_calculation import score_calculation
-from cv_copilot.web.dto.scores.schema import ScoreModelDTO
+from cv_copilot.web.dto.scores.schema import (
+    LeaderboardEntryDTO,
+    RankedCandidateDTO,
+    ScoreModelDTO,
+    WeightProfileInputDTO,
+)
+from cv_copilot.web.pagination import get_cursor, set_next_cursor
 
 router = APIRouter()
 
@@ -23,6 +37,112 @@ def get_dao_dependency(dao_class):  # noqa: D103
 get_score_dao = get_dao_dependency(ScoreDAO)
 get_parsed_text_dao = get_dao_dependency(ParsedTextDAO)
 get_job_description_dao = get_dao_dependency(ParsedJobDescriptionDAO)
+get_pipeline_run_dao = get_dao_dependency(PipelineRunDAO)
+get_weight_profile_dao = get_dao_dependency(WeightProfileDAO)
+get_leaderboard_dao = get_dao_dependency(LeaderboardDAO)
+
+
+@router.get("/", response_model=List[ScoreModelDTO])
+async def get_job_description_scores(
+    job_description_id: int,
+    response: Response,
+    limit: int = 10,
+    cursor: Optional[Cursor] = Depends(get_cursor),
+    score_dao: ScoreDAO = Depends(get_score_dao),
+) -> List[ScoreModelDTO]:
+    """List the Scores of a job description, most recent first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
+    :param job_description_id: ID of the job description.
+    :param response: The response, to set the cursor of the next page.
+    :param limit: The number of scores to return.
+    :param cursor: The cursor of the page, from the previous page.
+    :param score_dao: The ScoreDAO object to use for database operations.
+    :return: list of ScoreModelDTO.
+    """
+    scores = await score_dao.get_scores_by_job_description_id(
+        job_description_id=job_description_id,
+        limit=limit,
+        cursor=cursor,
+    )
+    score_dtos = [ScoreModelDTO.from_orm(score) for score in scores]
+    set_next_cursor(response, score_dtos, limit)
+    return score_dtos
+
+
+@router.post("/process/{job_description_id}", response_model=List[ScoreModelDTO])
+async def process_job_description_scores(
+    job_description_id: int,
+    score_dao: ScoreDAO = Depends(get_score_dao),
+    parsed_text_dao: ParsedTextDAO = Depends(get_parsed_text_dao),
+    parsed_job_description_dao: ParsedJobDescriptionDAO = Depends(
+        get_job_description_dao,
+    ),
+    pipeline_run_dao: PipelineRunDAO = Depends(get_pipeline_run_dao),
+    weight_profile_dao: WeightProfileDAO = Depends(get_weight_profile_dao),
+) -> List[ScoreModelDTO]:
+    """Score all the evaluated PDFs of a job description at once.
+
+    The last evaluation of each PDF is scored in a single vectorized pass
+    with the weight profile of the job description, and the scores are
+    saved in a single bulk insert.
+
+    :param job_description_id: ID of the job description.
+    :param score_dao: The ScoreDAO object to use for database operations.
+    :param parsed_text_dao: The ParsedTextDAO object to use for database operations.
+    :param parsed_job_description_dao: The ParsedJobDescriptionDAO object to use for database operations.
+    :param pipeline_run_dao: The PipelineRunDAO object to use for database operations.
+    :param weight_profile_dao: The WeightProfileDAO object to use for database operations.
+    :return: list of ScoreModelDTO of the new scores.
+    :raises HTTPException: If the job description is not parsed.
+    """
+    parsed_job_description = (
+        await parsed_job_description_dao.get_parsed_job_description_by_id(
+            job_description_id,
+        )
+    )
+    if parsed_job_description is None:
+        raise HTTPException(status_code=404, detail="Parsed job description not found")
+
+    candidates = await parsed_text_dao.get_latest_matches(job_description_id)
+    weights = await weight_profile_dao.get_weights(job_description_id)
+    scores = dict(rank_candidates(candidates, weights))
+    saved_scores = await score_dao.save_scores(
+        job_description_id=job_description_id,
+        parsed_job_description_id=parsed_job_description.id,
+        scores=scores,
+    )
+    await pipeline_run_dao.mark_scored(job_description_id, list(scores))
+    return [ScoreModelDTO.from_orm(score) for score in saved_scores]
+
+
+@router.post("/rerank/{job_description_id}", response_model=List[RankedCandidateDTO])
+async def rerank_job_description(
+    job_description_id: int,
+    weights: Optional[WeightProfileInputDTO] = None,
+    parsed_text_dao: ParsedTextDAO = Depends(get_parsed_text_dao),
+    weight_profile_dao: WeightProfileDAO = Depends(get_weight_profile_dao),
+) -> List[RankedCandidateDTO]:
+    """Rank the evaluated PDFs of a job description, best first.
+
+    The last evaluation of each PDF is scored again from the stored matches,
+    without calling OpenAI, so that other weights can be tried out. Nothing
+    is saved: save the weights to the job description to keep them.
+
+    :param job_description_id: ID of the job description.
+    :param weights: The weights to rank with, the saved ones if None.
+    :param parsed_text_dao: The ParsedTextDAO object to use for database operations.
+    :param weight_profile_dao: The WeightProfileDAO object to use for database operations.
+    :return: list of RankedCandidateDTO, best first.
+    """
+    if weights is None:
+        weights = await weight_profile_dao.get_weights(job_description_id)
+    candidates = await parsed_text_dao.get_latest_matches(job_description_id)
+    return [
+        RankedCandidateDTO(pdf_id=pdf_id, score=score)
+        for pdf_id, score in rank_candidates(candidates, weights)
+    ]
 
 
 @router.post("/process/{pdf_id}/{job_description_id}", response_model=ScoreModelDTO)
@@ -34,22 +154,41 @@ async def get_scores(
     parsed_job_description_dao: ParsedJobDescriptionDAO = Depends(
         get_job_description_dao,
     ),
+    pipeline_run_dao: PipelineRunDAO = Depends(get_pipeline_run_dao),
+    weight_profile_dao: WeightProfileDAO = Depends(get_weight_profile_dao),
 ) -> ScoreModelDTO:
     """Process a new Score.
 
+    When the pipeline run of the PDF is already scored, its score is returned
+    instead of being computed again.
+
     :param pdf_id: ID of the pdf.
     :param job_description_id: ID of the job description
     :param score_dao: The ScoreDAO object to use for database operations.
     :param parsed_text_dao: The ParsedTextDAO object to use for database operations.
     :param parsed_job_description_dao: The ParsedJobDescriptionDAO object to use for database operations.
+    :param pipeline_run_dao: The PipelineRunDAO object to use for database operations.
+    :param weight_profile_dao: The WeightProfileDAO object to use for database operations.
     :return: ScoreModelDTO of the retrieved score.
     :raises HTTPException: If the score is not found.
     """
+    run = await pipeline_run_dao.get_run(pdf_id, job_description_id)
+    if run is not None and run.has_reached(PipelineStage.SCORED):
+        last_score = await score_dao.get_scores_by_pdf_id_and_job_description_id(
+            pdf_id=pdf_id,
+            job_description_id=job_description_id,
+        )
+        if last_score is not None:
+            return ScoreModelDTO.from_orm(last_score)
 
-    parsed_text_result = await parsed_text_dao.get_parsed_text_by_pdf_id_and_job_id(
-        pdf_id=int(pdf_id),
-        job_description_id=int(job_description_id),
-    )
+    if run is not None and run.parsed_text_id is not None:
+        # Score the last evaluation of the PDF
+        parsed_text_result = await parsed_text_dao.get_parsed_text(run.parsed_text_id)
+    else:
+        parsed_text_result = await parsed_text_dao.get_parsed_text_by_pdf_id_and_job_id(
+            pdf_id=int(pdf_id),
+            job_description_id=int(job_description_id),
+        )
     parsed_job_descriptions = (
         await parsed_job_description_dao.get_parsed_job_description_by_id(
             job_description_id,
@@ -57,7 +196,10 @@ async def get_scores(
     )
     if parsed_text_result is None or parsed_job_descriptions is None:
         raise HTTPException(status_code=404, detail="Parsed text not found")
-    result = await score_calculation(parsed_text=parsed_text_result)
+    result = await score_calculation(
+        parsed_text=parsed_text_result,
+        weights=await weight_profile_dao.get_weights(job_description_id),
+    )
 
     score = await score_dao.save_score(
         pdf_id=int(pdf_id),
@@ -69,9 +211,29 @@ async def get_scores(
     if score is None:
         raise HTTPException(status_code=404, detail="Score not found")
 
+    if run is not None and run.has_reached(PipelineStage.EVALUATED):
+        await pipeline_run_dao.update_run(run, PipelineStage.SCORED)
+
     return ScoreModelDTO.from_orm(score)
 
 
+@router.get("/{job_description_id}/top", response_model=List[LeaderboardEntryDTO])
+async def get_top_scores(
+    job_description_id: int,
+    k: int = Query(10, ge=1, le=1000),
+    leaderboard_dao: LeaderboardDAO = Depends(get_leaderboard_dao),
+) -> List[LeaderboardEntryDTO]:
+    """Get the best PDFs of a job description by their last score.
+
+    :param job_description_id: ID of the job description.
+    :param k: The number of PDFs to return.
+    :param leaderboard_dao: The LeaderboardDAO object to use for database operations.
+    :return: list of LeaderboardEntryDTO, best first.
+    """
+    entries = await leaderboard_dao.get_top(job_description_id, k)
+    return [LeaderboardEntryDTO.from_orm(entry) for entry in entries]
+
+
 @router.get("/{pdf_id}/{job_description_id}", response_model=ScoreModelDTO)
 async def get_last_score(
     pdf_id: int,
@@ -0,0 +1,4 @@
+"""Tasks API."""
+from cv_copilot.web.api.tasks.views import router
+
+__all__ = ["router"]
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from cv_copilot.tkq import broker
+from cv_copilot.web.dto.tasks.schema import TaskStatusDTO
+
+router = APIRouter()
+
+
+@router.get("/{task_id}", response_model=TaskStatusDTO)
+async def get_task_status(task_id: str) -> TaskStatusDTO:
+    """
+    Get the status of a task sent to the workers.
+
+    :param task_id: ID of the task.
+    :return: status of the task, with its result once it is ready.
+    """
+    result_backend = broker.result_backend
+    if not await result_backend.is_result_ready(task_id):
+        return TaskStatusDTO(task_id=task_id, is_ready=False)
+
+    result = await result_backend.get_result(task_id)
+    return TaskStatusDTO(
+        task_id=task_id,
+        is_ready=True,
+        is_err=result.is_err,
+        return_value=result.return_value,
+        error=str(result.error) if result.error is not None else None,
+        execution_time=result.execution_time,
+    )
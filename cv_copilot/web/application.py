@@ -15,6 +15,7 @@ from cv_copilot.logging import configure_logging
 from cv_copilot.settings import settings
 from cv_copilot.web.api.router import api_router
 from cv_copilot.web.lifetime import register_shutdown_event, register_startup_event
+from cv_copilot.web.pagination import NEXT_CURSOR_HEADER
 
 APP_ROOT = Path(__file__).parent.parent
 
@@ -73,6 +74,7 @@ def get_app() -> FastAPI:
         allow_origins=["*"],  # Allows all origins
         allow_methods=["*"],  # Allows all methods
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     return app
@@ -1,3 +1,4 @@
+import enum
 import json
 from typing import Any, Dict, Optional
 
@@ -7,6 +8,11 @@ from cv_copilot.db.models.job_descriptions import (
     JobDescriptionModel,
     ParsedJobDescriptionModel,
 )
+from cv_copilot.db.models.leaderboard import LeaderboardEntryModel
+from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.db.models.texts import ParsedTextModel
+from cv_copilot.web.dto.pdfs.schema import PDFModelDTO
+from cv_copilot.web.dto.texts.schema import ParsedTextDTO
 
 
 class JobDescriptionDTO(BaseModel):
@@ -54,6 +60,12 @@ class JobDescriptionDTO(BaseModel):
         )
 
 
+class JobDescriptionTaskDTO(JobDescriptionDTO):
+    """DTO for a created job description, with the ID of the task processing it."""
+
+    task_id: Optional[str] = None
+
+
 class JobDescriptionInputDTO(BaseModel):
     """DTO for creating a Job Description model.
 
@@ -94,3 +106,39 @@ class ParsedJobDescriptionDTO(BaseModel):
             parsed_skills=parsed_skills,
             created_date=obj.created_date.isoformat(),
         )
+
+
+class DashboardField(str, enum.Enum):  # noqa: WPS600
+    """Optional fields of the dashboard of a job description."""
+
+    SCORE = "score"
+    EVALUATION = "evaluation"
+
+
+class DashboardEntryDTO(PDFModelDTO):
+    """DTO for a PDF of a job description with its last score and evaluation."""
+
+    score: Optional[float] = None
+    evaluation: Optional[ParsedTextDTO] = None
+
+    @classmethod
+    def from_models(
+        cls,
+        pdf: PDFModel,
+        entry: Optional[LeaderboardEntryModel],
+        evaluation: Optional[ParsedTextModel],
+    ) -> "DashboardEntryDTO":
+        """Create a DashboardEntryDTO from a row of the dashboard.
+
+        :param pdf: The PDFModel.
+        :param entry: The LeaderboardEntryModel of its last score, if any.
+        :param evaluation: Its last ParsedTextModel, if any.
+        :return: The created DashboardEntryDTO.
+        """
+        return cls(
+            **PDFModelDTO.from_orm(pdf).model_dump(),
+            score=entry.score if entry is not None else None,
+            evaluation=(
+                ParsedTextDTO.from_orm(evaluation) if evaluation is not None else None
+            ),
+        )
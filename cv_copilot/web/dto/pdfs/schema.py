@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import Optional, Union
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, HttpUrl, validator
 
 from cv_copilot.db.models.pdfs import PDFModel
+from cv_copilot.db.models.upload_batches import UploadBatchModel
 
 
 class PDFModelDTO(BaseModel):
@@ -35,6 +36,84 @@ class PDFModelDTO(BaseModel):
         )
 
 
+class PDFModelTaskDTO(PDFModelDTO):
+    """DTO for an uploaded PDF, with the ID of the task processing it, if any."""
+
+    task_id: Optional[str] = None
+
+
+class RejectedFileDTO(BaseModel):
+    """DTO for a file of a batch upload that was not added."""
+
+    name: str
+    reason: str
+
+
+class EnqueueFailureDTO(BaseModel):
+    """DTO for a PDF of a batch upload that could not be sent to the workers."""
+
+    pdf_id: int
+    reason: str
+
+
+class UploadBatchDTO(BaseModel):
+    """
+    DTO for a batch of uploaded PDFs.
+
+    The progress of the processing of the batch is available at
+    `/pdfs/batches/{id}`. The PDFs in `enqueue_failures` are added but not
+    processed, see `POST /pdfs/{pdf_id}/process`.
+    """
+
+    id: int
+    job_id: int
+    pdf_ids: List[int]
+    rejected_files: List[RejectedFileDTO] = []
+    enqueue_failures: List[EnqueueFailureDTO] = []
+    created_date: str
+
+
+class UploadBatchProgressDTO(BaseModel):
+    """
+    DTO for the progress of the processing of a batch of uploaded PDFs.
+
+    `stages` counts the PDFs of the batch by their current stage, see
+    `ProgressStage`, or by the last stage their pipeline run completed when
+    their progress is not known anymore: pending, evaluated, scored, ...
+    """
+
+    id: int
+    job_id: int
+    pdf_count: int
+    stages: Dict[str, int]
+    # PDFs evaluated, scored, or whose processing failed
+    done: int
+    created_date: str
+
+    @classmethod
+    def from_orm(
+        cls,
+        obj: UploadBatchModel,
+        stages: Dict[str, int],
+        done: int,
+    ) -> "UploadBatchProgressDTO":
+        """Create an UploadBatchProgressDTO from an UploadBatchModel.
+
+        :param obj: The UploadBatchModel to create a DTO from.
+        :param stages: The number of PDFs at each stage.
+        :param done: The number of PDFs processed.
+        :return: The created UploadBatchProgressDTO.
+        """
+        return cls(
+            id=obj.id,
+            job_id=obj.job_id,
+            pdf_count=obj.pdf_count,
+            stages=stages,
+            done=done,
+            created_date=obj.created_date.isoformat(),
+        )
+
+
 class PDFModelInputDTO(BaseModel):
     """DTO for creating a PDF model.
 
@@ -72,7 +151,7 @@ class PDFModelInputDTO(BaseModel):
 
 class PDFModelInternalDTO(BaseModel):
     """
-    Internal DTO for PDF models including the file data.
+    Internal DTO for PDF models including the hash of the file data.
 
     :param obj: The PDFModel to create a DTO from.
     :return: The created PDFModelInternalDTO.
@@ -81,14 +160,14 @@ class PDFModelInternalDTO(BaseModel):
     id: int
     name: str
     job_id: int
-    file: bytes
+    content_hash: Optional[str] = None
     s3_url: Optional[HttpUrl] = None
     created_date: datetime
 
     @classmethod
     def from_orm(cls, obj: PDFModel) -> "PDFModelInternalDTO":
         """
-        Create a PDFModelInternalDTO from a PDFModel including the file data.
+        Create a PDFModelInternalDTO from a PDFModel including the file hash.
 
         :param obj: The PDFModel to create a DTO from.
         :return: The created PDFModelInternalDTO.
@@ -97,7 +176,7 @@ class PDFModelInternalDTO(BaseModel):
             id=obj.id,
             job_id=obj.job_id,
             name=obj.name,
-            file=obj.file,
+            content_hash=obj.content_hash,
             s3_url=obj.s3_url,
             created_date=obj.created_date,
         )
@@ -1,6 +1,9 @@
 from pydantic import BaseModel
 
+from cv_copilot.db.models.leaderboard import LeaderboardEntryModel
 from cv_copilot.db.models.scores import ScoreModel
+from cv_copilot.db.models.weight_profiles import WeightProfileModel
+from cv_copilot.services.scorer.weights import ScoringWeights
 
 
 class ScoreModelDTO(BaseModel):
@@ -32,3 +35,52 @@ class ScoreModelDTO(BaseModel):
             score=obj.score,
             created_date=obj.created_date.isoformat(),
         )
+
+
+class LeaderboardEntryDTO(BaseModel):
+    """DTO for the last score of a PDF in the leaderboard of a job description."""
+
+    pdf_id: int
+    job_description_id: int
+    score: float
+    updated_date: str
+
+    @classmethod
+    def from_orm(cls, obj: LeaderboardEntryModel) -> "LeaderboardEntryDTO":
+        """Create a LeaderboardEntryDTO from a LeaderboardEntryModel.
+
+        :param obj: The LeaderboardEntryModel to create a DTO from.
+        :return: The created LeaderboardEntryDTO.
+        """
+        return cls(
+            pdf_id=obj.pdf_id,
+            job_description_id=obj.job_description_id,
+            score=obj.score,
+            updated_date=obj.updated_date.isoformat(),
+        )
+
+
+class WeightProfileInputDTO(ScoringWeights):
+    """DTO for the weights of the scores of a job description."""
+
+
+class WeightProfileDTO(WeightProfileInputDTO):
+    """DTO for the weight profile of a job description."""
+
+    job_description_id: int
+
+    @classmethod
+    def from_orm(cls, obj: WeightProfileModel) -> "WeightProfileDTO":
+        """Create a WeightProfileDTO from a WeightProfileModel.
+
+        :param obj: The WeightProfileModel to create a DTO from.
+        :return: The created WeightProfileDTO.
+        """
+        return cls(job_description_id=obj.job_description_id, **obj.weights)
+
+
+class RankedCandidateDTO(BaseModel):
+    """DTO for the score of a CV in a ranking that is not saved."""
+
+    pdf_id: int
+    score: float
@@ -0,0 +1 @@
+"""Tasks DTOs."""
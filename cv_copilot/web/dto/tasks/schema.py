@@ -0,0 +1,25 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class TaskDTO(BaseModel):
+    """DTO returned when a task is sent to the workers."""
+
+    task_id: str
+
+
+class TaskStatusDTO(BaseModel):
+    """
+    DTO for the status of a task.
+
+    A task that is queued, running or unknown is not ready. Once it is ready,
+    `return_value` holds its result, or `error` the reason it failed.
+    """
+
+    task_id: str
+    is_ready: bool
+    is_err: Optional[bool] = None
+    return_value: Optional[Any] = None
+    error: Optional[str] = None
+    execution_time: Optional[float] = None
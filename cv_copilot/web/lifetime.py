@@ -19,7 +19,18 @@ from prometheus_fastapi_instrumentator.instrumentation import (
 )
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from cv_copilot.services.cpu.lifetime import init_cpu_executor, shutdown_cpu_executor
+from cv_copilot.services.llm.lifetime import (
+    init_llm_cache,
+    init_openai,
+    shutdown_openai,
+)
+from cv_copilot.services.progress.lifetime import init_progress_publisher
 from cv_copilot.services.redis.lifetime import init_redis, shutdown_redis
+from cv_copilot.services.storage.lifetime import (
+    init_blob_storage,
+    shutdown_blob_storage,
+)
 from cv_copilot.settings import settings
 from cv_copilot.tkq import broker
 
@@ -142,6 +153,11 @@ def register_startup_event(
         _setup_db(app)
         setup_opentelemetry(app)
         init_redis(app)
+        init_cpu_executor(app)
+        init_openai(app)
+        init_llm_cache(app)
+        init_progress_publisher(app)
+        init_blob_storage(app)
         setup_prometheus(app)
         app.middleware_stack = app.build_middleware_stack()
         pass  # noqa: WPS420
@@ -166,6 +182,9 @@ def register_shutdown_event(
         await app.state.db_engine.dispose()
 
         await shutdown_redis(app)
+        shutdown_cpu_executor(app)
+        await shutdown_openai(app)
+        await shutdown_blob_storage(app)
         stop_opentelemetry(app)
         pass  # noqa: WPS420
 
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Optional, Protocol, Sequence
+
+from fastapi import HTTPException, Response
+
+from cv_copilot.db.pagination import Cursor, InvalidCursorError
+
+# Header of list responses holding the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageItem(Protocol):
+    """An item of a page, as returned by the API."""
+
+    id: int
+    created_date: str
+
+
+def get_cursor(cursor: Optional[str] = None) -> Optional[Cursor]:
+    """
+    Decode the cursor of a list request.
+
+    :param cursor: the cursor from the X-Next-Cursor header of the previous
+        page, None for the first page.
+    :return: the decoded cursor.
+    :raises HTTPException: If the cursor is invalid.
+    """
+    if cursor is None:
+        return None
+    try:
+        return Cursor.decode(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def set_next_cursor(
+    response: Response,
+    page: Sequence[PageItem],
+    limit: int,
+) -> None:
+    """
+    Set the cursor of the next page in the headers of a list response.
+
+    The header is not set on the last page.
+
+    :param response: the list response.
+    :param page: the items of the page.
+    :param limit: the size of the page.
+    """
+    if len(page) < limit:
+        return
+    last_item = page[-1]
+    response.headers[NEXT_CURSOR_HEADER] = Cursor(
+        datetime.fromisoformat(last_item.created_date),
+        last_item.id,
+    ).encode()
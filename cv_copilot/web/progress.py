@@ -0,0 +1,41 @@
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from cv_copilot.services.progress.publisher import ProgressPublisher
+
+# Sent to the client when there was no event for a while, see `subscribe`
+KEEPALIVE_COMMENT = ": keep-alive\n\n"
+
+
+async def _server_sent_events(
+    progress_publisher: ProgressPublisher,
+    channel: str,
+) -> AsyncIterator[str]:
+    async for event in progress_publisher.subscribe(channel):
+        if event is None:
+            yield KEEPALIVE_COMMENT
+        else:
+            yield f"event: {event.stage.value}\ndata: {event.model_dump_json()}\n\n"
+
+
+def stream_progress(
+    progress_publisher: ProgressPublisher,
+    channel: str,
+) -> StreamingResponse:
+    """
+    Stream the progress of a processing as Server-Sent Events.
+
+    The stream starts with the current stage and ends after the final one,
+    see `ProgressPublisher.subscribe`. Nothing runs in the API while the
+    workers process the document: the response only waits on Redis.
+
+    :param progress_publisher: the publisher of the progress.
+    :param channel: the channel of the PDF or job description.
+    :return: the event stream response.
+    """
+    return StreamingResponse(
+        _server_sent_events(progress_publisher, channel),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
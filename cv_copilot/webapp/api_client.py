@@ -0,0 +1,117 @@
+"""Client of the CV-Copilot API shared by the pages of the webapp.
+
+Every request goes through one HTTP session whose connections are kept
+alive, instead of opening a new connection per request. Reads are cached
+for CACHE_TTL seconds so that the reruns of the page do not fetch
+everything again, and every request that changes data clears the cache.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API_URL = "http://localhost:8000/api"
+# Seconds a read is served from the cache
+CACHE_TTL = 30
+# Connections kept alive, and reads sent at once by `get_many`
+POOL_SIZE = 10
+
+# Path and query parameters of a read
+Read = Tuple[str, Optional[Dict[str, Any]]]
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Get the HTTP session shared by all the reruns of the webapp.
+
+    :return: the session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Read a resource of the API, from the cache if it was read recently.
+
+    Errors are raised rather than returned, so that they are not cached.
+
+    :param path: the path of the resource, after API_URL.
+    :param params: the query parameters.
+    :return: the JSON response.
+    """
+    response = get_session().get(f"{API_URL}{path}", params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_many(reads: Sequence[Read]) -> List[Optional[Any]]:
+    """Read independent resources of the API concurrently.
+
+    :param reads: the path and query parameters of each resource.
+    :return: the JSON response of each resource, None when it failed.
+    """
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        futures = [executor.submit(get_json, path, params) for path, params in reads]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except requests.RequestException:
+            results.append(None)
+    return results
+
+
+def send(
+    method: str,
+    path: str,
+    timeout: float = 10,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a request that changes data, and clear the cached reads.
+
+    :param method: the HTTP method.
+    :param path: the path of the endpoint, after API_URL.
+    :param timeout: the timeout of the request, in seconds.
+    :param kwargs: the other arguments of `requests.Session.request`.
+    :return: the response.
+    """
+    try:
+        return get_session().request(
+            method,
+            f"{API_URL}{path}",
+            timeout=timeout,
+            **kwargs,
+        )
+    finally:
+        get_json.clear()
+
+
+def stream_events(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: float = 600,
+) -> Iterator[Dict[str, Any]]:
+    """Follow a stream of Server-Sent Events of the API until it ends.
+
+    :param path: the path of the stream, after API_URL.
+    :param params: the query parameters.
+    :param timeout: the seconds to wait for an event, keep-alives included.
+    :yields: the data of each event.
+    """
+    with get_session().get(
+        f"{API_URL}{path}",
+        params=params,
+        stream=True,
+        timeout=timeout,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines(decode_unicode=True):
+            if line and line.startswith("data: "):
+                yield json.loads(line[len("data: ") :])
@@ -1,13 +1,15 @@
-from typing import Dict, List, Optional
+from typing import Dict, List
 
 import requests
 import streamlit as st
 
 from cv_copilot.web.dto.job_description.schema import ParsedJobDescriptionDTO
-from cv_copilot.webapp.pdf_evaluation import display_recent_cvs, upload_pdf
-
-API_ENDPOINT = "http://localhost:8000/api/job-descriptions"
-API_ENDPOINT_PARSED = "http://localhost:8000/api/parsed-job-descriptions"
+from cv_copilot.webapp import api_client
+from cv_copilot.webapp.pdf_evaluation import (
+    display_recent_cvs,
+    get_cv_list_read,
+    upload_pdf,
+)
 
 
 def get_job_descriptions(limit: int) -> List[Dict[str, str]]:
@@ -16,29 +18,11 @@ def get_job_descriptions(limit: int) -> List[Dict[str, str]]:
     :param limit: The number of job descriptions to return.
     :return: List of job descriptions.
     """
-    response = requests.get(
-        f"{API_ENDPOINT}/",
-        params={"limit": limit},
-        timeout=3,
-    )
-    if response.status_code == 200:
-        return response.json()
-    st.error("Failed to fetch job descriptions")
-    return []
-
-
-def get_parsed_job_description(
-    job_description_id: str,
-) -> Optional[ParsedJobDescriptionDTO]:
-    response = requests.get(
-        f"{API_ENDPOINT_PARSED}/{job_description_id}/",
-        timeout=3,
-    )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error(f"Failed to fetch parsed job description: {response.status_code}")
-        return None
+    try:
+        return api_client.get_json("/job-descriptions/", {"limit": limit})
+    except requests.RequestException:
+        st.error("Failed to fetch job descriptions")
+        return []
 
 
 def display_delete_job_description_button(job_id: str) -> None:
@@ -47,10 +31,7 @@ def display_delete_job_description_button(job_id: str) -> None:
     :param job_id: The ID of the job description to delete.
     """
     if st.button("Delete job description", key=f"delete_job_{job_id}"):
-        response = requests.delete(
-            f"{API_ENDPOINT}/{job_id}/",
-            timeout=10,
-        )
+        response = api_client.send("DELETE", f"/job-descriptions/{job_id}/")
         if response.status_code == 200:
             st.success("Job description deleted!")
             # Refresh page
@@ -113,8 +94,9 @@ def create_new_job_description_form() -> None:
             submitted = st.form_submit_button("Submit")
             if submitted:
                 with st.spinner("Parsing the job description..."):
-                    response = requests.post(
-                        API_ENDPOINT,
+                    response = api_client.send(
+                        "POST",
+                        "/job-descriptions",
                         json={
                             "title": new_job_title,
                             "description": new_job_description,
@@ -131,8 +113,9 @@ def create_new_job_description_form() -> None:
                         # TODO: we need to think about how to handle this
                         # Maybe it should be a background task of the POST request?
                         # OR maybe we should have a button to trigger it?
-                        response = requests.get(
-                            f"{API_ENDPOINT}/{job_description_data['id']}/process",
+                        response = api_client.send(
+                            "GET",
+                            f"/job-descriptions/{job_description_data['id']}/process",
                             timeout=360,
                         )
                         if response:
@@ -149,7 +132,19 @@ def list_job_descriptions_and_cvs(job_descriptions: List[Dict[str, str]]) -> Non
 
     :param job_descriptions: The job descriptions to list.
     """
-    for job in job_descriptions:
+    # The parsed job description and the CVs of every job description are
+    # independent, so they are all fetched at once.
+    reads = []
+    for job_description in job_descriptions:
+        reads.append((f"/parsed-job-descriptions/{job_description['id']}/", None))
+        reads.append(get_cv_list_read(job_description["id"], limit="10"))
+    results = api_client.get_many(reads)
+
+    for job, parsed_job_description, recent_cvs in zip(
+        job_descriptions,
+        results[::2],
+        results[1::2],
+    ):
         expander_key = f"expander_{job['id']}"
         is_expander_open = st.session_state.get(expander_key, False)
 
@@ -169,8 +164,9 @@ def list_job_descriptions_and_cvs(job_descriptions: List[Dict[str, str]]) -> Non
                     key=f"description_{job['id']}",
                 )
                 if st.button("Save Changes", key=f"save_{job['id']}"):
-                    response = requests.put(
-                        f"{API_ENDPOINT}/{job['id']}/",
+                    response = api_client.send(
+                        "PUT",
+                        f"/job-descriptions/{job['id']}/",
                         json={
                             "title": edited_title,
                             "description": edited_description,
@@ -195,11 +191,12 @@ def list_job_descriptions_and_cvs(job_descriptions: List[Dict[str, str]]) -> Non
                     unsafe_allow_html=True,
                 )
                 # Display parsed job description as table using the ExtractSkills model
-                parsed_job_description = get_parsed_job_description(job["id"])
                 if parsed_job_description:
                     # Convert the SkillsExtract to table data
                     st.subheader("Parsed Skills")
                     display_skills_by_category_and_type(parsed_job_description)
+                else:
+                    st.error("Failed to fetch parsed job description")
                 if st.button("Edit job description", key=f"edit_{job['id']}"):
                     # Enter edit mode and open the expander
                     st.session_state[edit_key] = True
@@ -210,7 +207,10 @@ def list_job_descriptions_and_cvs(job_descriptions: List[Dict[str, str]]) -> Non
             upload_pdf(job["id"])
 
             st.markdown("<br>", unsafe_allow_html=True)
-            display_recent_cvs(job["id"], limit="10")
+            if recent_cvs is None:
+                st.error("Failed to fetch CVs")
+                recent_cvs = []
+            display_recent_cvs(job["id"], recent_cvs)
 
             display_delete_job_description_button(job["id"])
 
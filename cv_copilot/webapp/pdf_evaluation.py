@@ -1,63 +1,62 @@
-from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, List
 
-import requests
 import streamlit as st
 
-API_ENDPOINT = "http://localhost:8000/api/pdfs"
-PARSED_TEXT_API_ENDPOINT = "http://localhost:8000/api/parsed-texts"
-API_SCORE_ENDPOINT = "http://localhost:8000/api/scores"
+from cv_copilot.webapp import api_client
 
 
 def upload_pdf(job_id: str) -> None:
-    """Upload a PDF to the database.
+    """Upload PDFs, or ZIP archives of PDFs, to the database.
 
-    :param job_id: The ID of the job description to upload the PDF to.
+    The files are uploaded as one batch, and evaluated by the workers when
+    asked to.
+
+    :param job_id: The ID of the job description to upload the PDFs to.
     """
-    pdf_file = st.file_uploader(
-        "Drag and drop your CV here",
-        type=["pdf"],
+    pdf_files = st.file_uploader(
+        "Drag and drop your CVs here, or ZIP archives of CVs",
+        type=["pdf", "zip"],
         key=f"file_uploader_{job_id}",
-        # accept_multiple_files=True, TODO: Need to add this functionality
+        accept_multiple_files=True,
     )
+    evaluate = st.checkbox("Evaluate after upload", key=f"evaluate_{job_id}")
     if st.button("Upload", key=f"upload_button_{job_id}"):
-        if pdf_file is not None:
-            files = {
-                "pdf_file": (pdf_file.name, pdf_file.getvalue(), "application/pdf"),
-            }
-            data = {
-                "name": pdf_file.name,
-                "job_id": job_id,
-                "created_date": str(datetime.now()),
-            }
-            response = requests.post(API_ENDPOINT, files=files, data=data, timeout=5)
+        if pdf_files:
+            files = [
+                ("files", (pdf_file.name, pdf_file.getvalue(), pdf_file.type))
+                for pdf_file in pdf_files
+            ]
+            data = {"job_id": job_id, "process_after_upload": evaluate}
+            response = api_client.send(
+                "POST",
+                "/pdfs/batches",
+                timeout=600,
+                files=files,
+                data=data,
+            )
             if 200 <= response.status_code < 300:
-                st.success("CV uploaded")
+                batch = response.json()
+                st.success(f"{len(batch['pdf_ids'])} CVs uploaded")
+                for rejected_file in batch["rejected_files"]:
+                    st.warning(f"{rejected_file['name']}: {rejected_file['reason']}")
             else:
                 st.error(
-                    f"Failed to upload CV: {response.status_code} - {response}",
+                    f"Failed to upload CVs: {response.status_code} - {response}",
                 )
         else:
-            st.error("Error. Please upload a CV in PDF format.")
+            st.error("Error. Please upload CVs in PDF format.")
+
 
+def get_cv_list_read(job_id: str, limit: str) -> api_client.Read:
+    """Get the read of the CVs of a job description, see `display_recent_cvs`.
 
-def get_cv_list(job_id: str, limit: str) -> List[Dict[str, str]]:
-    """Get the list of CVs for a job description.
+    The CVs are listed with their score and evaluation.
 
     :param job_id: The ID of the job description to get the CVs for.
-    :return: List of CVs.
+    :param limit: The number of CVs to get.
+    :return: The path and parameters of the read.
     """
-    params = {"job_id": job_id, "limit": limit}
-    response = requests.get(
-        f"{API_ENDPOINT}",
-        timeout=10,
-        params=params,
-    )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error(f"Failed to fetch CVs: {response.status_code}, {response.text}")
-        return []
+    return f"/job-descriptions/{job_id}/dashboard", {"limit": limit}
 
 
 def display_evaluation_by_category_and_type(
@@ -93,19 +92,37 @@ def display_evaluation_by_category_and_type(
 def process_cv(job_id: str, cv_id: str) -> None:
     """Process a CV.
 
+    The CV is sent to the workers, and its progress followed until it is
+    evaluated.
+
     :param job_id: The ID of the job description to process the CV for.
     :param cv_id: The ID of the CV to process.
     """
-    params = {"job_id": job_id, "pdf_id": cv_id}
-    response = requests.get(
-        f"{API_ENDPOINT}/{cv_id}/process",
-        timeout=600,
-        params=params,
-    )
-    if response.status_code == 200:
+    params = {"job_id": job_id}
+    response = api_client.send("POST", f"/pdfs/{cv_id}/process", params=params)
+    if response.status_code != 200:
+        st.error(f"Failed to evaluate CV - {response.status_code}, {response.text}")
+        return
+
+    progress_bar = st.progress(0.0, text="Queued")
+    converted_pages = 0
+    done = 0.0
+    event: Dict[str, Any] = {}
+    for event in api_client.stream_events(f"/pdfs/{cv_id}/progress", params):
+        text = event["stage"].capitalize()
+        if event["stage"] == "ocr_page":
+            converted_pages += 1
+            done = converted_pages / event["pages"]
+            text = f"Reading pages: {converted_pages} of {event['pages']}"
+        elif event["stage"] == "evaluated":
+            done = 1.0
+        progress_bar.progress(done, text=text)
+    # The evaluation is saved by the workers, read it again.
+    api_client.get_json.clear()
+    if event.get("stage") == "evaluated":
         st.success("CV evaluated!")
     else:
-        st.error(f"Failed to evaluate CV - {response.status_code}, {response.text}")
+        st.error(f"Failed to evaluate CV - {event.get('error')}")
 
 
 def process_cv_score(job_id: str, cv_id: str) -> float | str:
@@ -115,8 +132,9 @@ def process_cv_score(job_id: str, cv_id: str) -> float | str:
     :param cv_id: The ID of the CV to process.
     """
     params = {"job_id": job_id, "pdf_id": cv_id}
-    response = requests.post(
-        f"{API_SCORE_ENDPOINT}/process/{cv_id}/{job_id}",
+    response = api_client.send(
+        "POST",
+        f"/scores/process/{cv_id}/{job_id}",
         timeout=600,
         params=params,
     )
@@ -130,67 +148,38 @@ def process_cv_score(job_id: str, cv_id: str) -> float | str:
         return "Undefined"
 
 
-def get_last_cv_score(job_id: str, cv_id: str) -> float | str:
-    """Get last CV Score.
-
-    :param job_id: The ID of the job description to process the CV for.
-    :param cv_id: The ID of the CV to process.
-    """
-    params = {"job_id": job_id, "pdf_id": cv_id}
-    response = requests.get(
-        f"{API_SCORE_ENDPOINT}/{cv_id}/{job_id}",
-        timeout=600,
-        params=params,
-    )
-    if response.status_code == 200:
-        return round(response.json()["score"], 2)
-    else:
-        return "Undefined"
-
-
 def delete_cv(cv_id: str) -> None:
     """Delete a CV.
 
     :param cv_id: The ID of the CV to delete.
     """
-    response = requests.delete(f"{API_ENDPOINT}/{cv_id}", timeout=5)
+    response = api_client.send("DELETE", f"/pdfs/{cv_id}")
     if response.status_code == 200:
         st.success("CV deleted!")
     else:
         st.error(f"Failed to delete CV - {response.status_code}, {response.text}")
 
 
-def display_recent_cvs(job_id: str, limit: str = "10"):
+def display_recent_cvs(job_id: str, recent_cvs: List[Dict[str, Any]]):
     """Display the most recent CVs.
 
     :param job_id: The ID of the job description to display the CVs for.
-    :param limit: The number of CVs to display.
+    :param recent_cvs: The CVs to display, see `get_cv_list_read`.
     """
-    recent_cvs = get_cv_list(job_id, limit)
-
     for index, cv in enumerate(recent_cvs):
         col1, col2, col3, col4 = st.columns([2, 4, 1, 1])
         col1.text(cv["name"])
 
-        try:
-            score = get_last_cv_score(job_id, cv["id"])
-        except:
-            score = None
+        score = round(cv["score"], 2) if cv["score"] is not None else None
 
         with col2:
             with st.spinner("Fetching evaluation..."):
                 fetch_key = f"fetch_evaluation_{cv['id']}"
                 if st.button("Fetch evaluation", key=fetch_key):
-                    response = requests.get(
-                        f"{PARSED_TEXT_API_ENDPOINT}/{cv['id']}/",
-                        timeout=3,
-                    )
-                    if response.status_code == 200:
-                        display_evaluation_by_category_and_type(response.json())
+                    if cv["evaluation"] is not None:
+                        display_evaluation_by_category_and_type(cv["evaluation"])
                     else:
-                        st.error(
-                            f"Failed to fetch evaluation for CV {cv['id']}: {response.status_code}",
-                        )
+                        st.error(f"CV {cv['id']} is not evaluated yet")
 
         with col3:
             with st.spinner("Evaluating..."):